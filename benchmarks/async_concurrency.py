@@ -0,0 +1,157 @@
+"""
+Sync vs async throughput under concurrent connections.
+
+    python -m benchmarks.async_concurrency --concurrency 50 200 1000 --client-delay-ms 20
+
+Drives the project's ASGI application in-process, the way an ASGI server would, with N concurrent connections
+against a synchronous endpoint and its async counterpart. Each connection sends `--requests` sequential requests and
+reads every response body slowly (`--client-delay-ms`) to model slow clients. Reports requests per second and
+latency percentiles per endpoint and concurrency level. Throttling is disabled so only request handling is measured.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.harness import emit, setup_django, summarize
+
+ENDPOINTS = {
+    'teams': ('/api/teams/', '/api/async/teams/'),
+    'friends': ('/api/profile/friends/', '/api/async/profile/friends/'),
+    'matches': ('/api/matches/', '/api/async/matches/'),
+}
+
+
+def scope_for(path, token):
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'authorization', f'Token {token}'.encode())],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+
+
+async def request(application, path, token, client_delay):
+    done = asyncio.Event()
+    received = False
+    status_code = None
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status_code
+        if message['type'] == 'http.response.start':
+            status_code = message['status']
+        elif message['type'] == 'http.response.body':
+            if client_delay:
+                await asyncio.sleep(client_delay)
+            if not message.get('more_body'):
+                done.set()
+
+    started = time.perf_counter()
+    await application(scope_for(path, token), receive, send)
+    return time.perf_counter() - started, status_code
+
+
+async def run_level(application, path, tokens, concurrency, requests, client_delay):
+    samples, statuses = [], {}
+
+    async def connection(number):
+        token = tokens[number % len(tokens)]
+        for _ in range(requests):
+            duration, status_code = await request(application, path, token, client_delay)
+            samples.append(duration)
+            statuses[status_code] = statuses.get(status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return elapsed, samples, statuses
+
+
+def seed(users, teams):
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+
+    from sidelines_django_app.models import Match, Profile, Team
+
+    password = make_password('benchmark-password')
+    created = User.objects.bulk_create([
+        User(username=f'player{number}', email=f'player{number}@example.com', password=password)
+        for number in range(users)
+    ])
+    profiles = Profile.objects.bulk_create([Profile(user=user, setup_complete=True) for user in created])
+    for number, profile in enumerate(profiles):
+        profile.friends.add(*profiles[number + 1:number + 21])
+    created_teams = Team.objects.bulk_create([Team(team_name=f'Team {number}') for number in range(teams)])
+    for number, team in enumerate(created_teams):
+        squad = profiles[(number * 7) % users:(number * 7) % users + 7]
+        team.members.add(*squad)
+        team.admins.add(*squad[:1])
+    Match.objects.bulk_create([
+        Match(home_team=created_teams[number], away_team=created_teams[(number + 1) % teams],
+              date_time='2024-12-01T15:00:00Z', location='Stadium')
+        for number in range(teams)
+    ])
+    return [Token.objects.create(user=user).key for user in created]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--requests', type=int, default=3, help='sequential requests per connection')
+    parser.add_argument('--client-delay-ms', type=float, default=20.0)
+    parser.add_argument('--endpoints', nargs='+', choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--teams', type=int, default=100)
+    parser.add_argument('--database', help='SQLite file to use instead of a temporary one')
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    from django.core.asgi import get_asgi_application
+
+    from sidelines_django_app import views
+
+    for view in (views.TeamView, views.FriendsView, views.MatchView, views.AsyncTeamView, views.AsyncFriendsView,
+                 views.AsyncMatchView):
+        view.throttle_classes = []
+
+    tokens = seed(args.users, args.teams)
+    application = get_asgi_application()
+    client_delay = args.client_delay_ms / 1000
+
+    for endpoint in args.endpoints:
+        for mode, path in zip(('sync', 'async'), ENDPOINTS[endpoint]):
+            asyncio.run(run_level(application, path, tokens, 1, 1, 0))
+            for concurrency in args.concurrency:
+                elapsed, samples, statuses = asyncio.run(
+                    run_level(application, path, tokens, concurrency, args.requests, client_delay)
+                )
+                emit({
+                    'benchmark': 'async_concurrency',
+                    'endpoint': endpoint,
+                    'mode': mode,
+                    'concurrency': concurrency,
+                    'client_delay_ms': args.client_delay_ms,
+                    'requests_per_second': round(len(samples) / elapsed, 1),
+                    'statuses': statuses,
+                    **summarize(samples),
+                })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Accepting a backlog of pending friend requests: one PUT per request vs one batch PUT.
+
+    python -m benchmarks.batch_accept --requests 500
+
+Creates `--requests` pending friend requests to one profile, accepts them one by one through the single-request
+route, recreates them, and accepts them all through the batch route. Reports wall time and the number of SQL
+queries for each. Throttling is disabled so only the accept path is measured.
+"""
+import argparse
+import time
+
+from benchmarks.harness import emit, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--database', help='SQLite file to use instead of a temporary one')
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.urls import reverse
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from sidelines_django_app.models import FriendRequest, Profile
+    from sidelines_django_app.views import FriendRequestView
+
+    FriendRequestView.throttle_classes = []
+    users = User.objects.bulk_create([
+        User(username=f'player{number}', email=f'player{number}@example.com') for number in range(args.requests + 1)
+    ])
+    recipient, *senders = Profile.objects.bulk_create([Profile(user=user) for user in users])
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=users[0]).key)
+
+    def pending_requests():
+        recipient.friends.clear()
+        return FriendRequest.objects.bulk_create([
+            FriendRequest(from_profile=sender, to_profile=recipient) for sender in senders
+        ])
+
+    def one_by_one(requests):
+        for request in requests:
+            url = reverse('api:friend-request-action', kwargs={'request_id': request.pk, 'action': 'accept'})
+            assert client.put(url).status_code == 200
+
+    def batch(requests):
+        response = client.put(reverse('api:friend-request-batch'),
+                              {'action': 'accept', 'ids': [request.pk for request in requests]}, format='json')
+        assert response.status_code == 200, response.data
+
+    for mode, accept in (('one_by_one', one_by_one), ('batch', batch)):
+        requests = pending_requests()
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+            started = time.perf_counter()
+            accept(requests)
+            elapsed = time.perf_counter() - started
+        assert recipient.friends.count() == args.requests
+        emit({
+            'benchmark': 'batch_accept',
+            'mode': mode,
+            'requests': args.requests,
+            'elapsed_ms': round(elapsed * 1000, 3),
+            'queries': len(queries),
+        })
+
+
+if __name__ == '__main__':
+    main()
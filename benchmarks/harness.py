@@ -0,0 +1,66 @@
+"""
+Shared set-up for the standalone benchmarks in this package.
+
+Each benchmark runs against a throw-away SQLite database so it never touches the development database:
+
+    python -m benchmarks.<name> --help
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(database=None):
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sidelines_django.settings')
+
+    import django
+    from django.conf import settings
+
+    if database is None:
+        handle, database = tempfile.mkstemp(prefix='sidelines-bench-', suffix='.sqlite3')
+        os.close(handle)
+    settings.DATABASES['default']['NAME'] = database
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver', 'localhost', '127.0.0.1']
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    return database
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    return {
+        'count': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def emit(record):
+    print(json.dumps(record, sort_keys=True), flush=True)
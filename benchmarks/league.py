@@ -0,0 +1,161 @@
+"""
+Per-endpoint latency and throughput against a synthetic league.
+
+    python -m benchmarks.league --players 10000 --requests 200 --label v1.4 > v1.4.jsonl
+
+Generates a league with the generate_league management command (or reuses one in `--database` with
+`--skip-generate`), then drives the real URL routes in-process through the test client as a sample of `--viewers`
+players. Every endpoint gets `--warmup` untimed requests followed by `--requests` timed ones, spread over the
+viewers; writes run inside a transaction that is rolled back, so every request sees the same league. Caches stay
+warm between requests, as they would in production. Throttling is disabled so only request handling is measured.
+
+Output is one JSON record per endpoint with p50/p95/p99 latency and requests per second, tagged with `--label`,
+so runs from two releases can be diffed line by line.
+"""
+import argparse
+import random
+import sys
+import time
+from unittest import mock
+
+from benchmarks.harness import emit, setup_django, summarize
+
+
+def viewer_contexts(count, prefix, rng):
+    """Picks `count` players and returns, for each, what the scenarios need to address their own data."""
+    from django.contrib.auth.models import User
+    from django.db.models import Q
+    from rest_framework.authtoken.models import Token
+
+    from sidelines_django_app.models import Match, Profile, Team
+
+    profile_ids = list(Profile.objects.filter(user__username__startswith=prefix).values_list('pk', flat=True))
+    contexts = []
+    for profile_id in rng.sample(profile_ids, min(count, len(profile_ids))):
+        user = User.objects.get(profile__pk=profile_id)
+        team_id = Team.members.through.objects.filter(profile_id=profile_id).values_list('team_id', flat=True)[0]
+        friend_ids = set(Profile.friends.through.objects.filter(from_profile_id=profile_id)
+                         .values_list('to_profile_id', flat=True))
+        stranger_id = rng.choice(profile_ids)
+        while stranger_id == profile_id or stranger_id in friend_ids:
+            stranger_id = rng.choice(profile_ids)
+        contexts.append({
+            'username': user.username,
+            'token': Token.objects.get_or_create(user=user)[0].key,
+            'team_id': team_id,
+            'friend_id': min(friend_ids),
+            'stranger_id': stranger_id,
+            'match_id': Match.objects.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
+            .values_list('pk', flat=True).first(),
+        })
+    return contexts
+
+
+def scenarios(password):
+    """(label, method, path and payload for a viewer) for every endpoint in the mix."""
+    from django.urls import reverse
+
+    def url(name, **kwargs):
+        return reverse(f'api:{name}', kwargs=kwargs)
+
+    return [
+        ('POST sign-in', 'post', lambda v: (url('sign-in'), {'username': v['username'], 'password': password})),
+        ('GET verify-token', 'get', lambda v: (url('verify-token'), None)),
+        ('GET profile', 'get', lambda v: (url('profile'), None)),
+        ('GET profile (other)', 'get', lambda v: (url('profile', pk=v['friend_id']), None)),
+        ('GET profile-friends', 'get', lambda v: (url('profile-friends'), None)),
+        ('GET profile-search', 'get', lambda v: (url('profile-search') + '?query=sam', None)),
+        ('GET friend-request-list (received)', 'get',
+         lambda v: (url('friend-request-list', request_type='received'), None)),
+        ('GET team-invitation-list (received)', 'get',
+         lambda v: (url('team-invitation-list', request_type='received'), None)),
+        ('GET match-invitation-list (received)', 'get',
+         lambda v: (url('match-invitation-list', request_type='received') + f'?team={v["team_id"]}', None)),
+        ('GET inbox', 'get', lambda v: (url('inbox'), None)),
+        ('GET inbox-counts', 'get', lambda v: (url('inbox-counts'), None)),
+        ('GET team-list', 'get', lambda v: (url('team-list'), None)),
+        ('GET team-detail', 'get', lambda v: (url('team-detail', team_id=v['team_id']), None)),
+        ('GET match-list', 'get', lambda v: (url('match-list'), None)),
+        ('GET match-list (team, upcoming)', 'get',
+         lambda v: (url('match-list') + f'?team={v["team_id"]}&when=upcoming', None)),
+        ('GET my-matches', 'get', lambda v: (url('my-matches'), None)),
+        ('GET match-detail', 'get', lambda v: (url('match-detail', match_id=v['match_id']), None)),
+        ('POST create-friend-request', 'post',
+         lambda v: (url('create-friend-request'), {'to_profile': v['stranger_id']})),
+        ('POST vote', 'post', lambda v: (url('vote', match_id=v['match_id']), {'vote': 'accepted'})),
+        ('GET async-profile', 'get', lambda v: (url('async-profile'), None)),
+        ('GET async-team-list', 'get', lambda v: (url('async-team-list'), None)),
+        ('GET async-match-list', 'get', lambda v: (url('async-match-list'), None)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--team-size', type=int, default=10)
+    parser.add_argument('--friends', type=int, default=20)
+    parser.add_argument('--matches', type=int, default=10)
+    parser.add_argument('--viewers', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200, help='timed requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=20, help='untimed requests per endpoint')
+    parser.add_argument('--only', nargs='+', help='run only endpoints whose label contains one of these')
+    parser.add_argument('--label', default='', help='tag for every record, e.g. a release or commit')
+    parser.add_argument('--prefix', default='player')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--database', help='SQLite file to use instead of a temporary one')
+    parser.add_argument('--skip-generate', action='store_true', help='reuse the league already in --database')
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    from django.core.management import call_command
+    from django.db import transaction
+    from rest_framework.test import APIClient
+    from rest_framework.views import APIView
+
+    from sidelines_django_app.models import Profile
+    from sidelines_django_app.views.asynchronous.AsyncAPIView import AsyncAPIView
+
+    password = 'benchmark-password'
+    if not args.skip_generate:
+        call_command('generate_league', players=args.players, team_size=args.team_size, friends=args.friends,
+                     matches=args.matches, prefix=args.prefix, password=password, seed=args.seed, stdout=sys.stderr)
+
+    players = Profile.objects.filter(user__username__startswith=args.prefix).count()
+    rng = random.Random(args.seed)
+    viewers = viewer_contexts(args.viewers, args.prefix, rng)
+    client = APIClient()
+
+    def send(method, viewer, path, data):
+        client.credentials(HTTP_AUTHORIZATION='Token ' + viewer['token'])
+        if method == 'get':
+            return client.get(path)
+        with transaction.atomic():
+            response = getattr(client, method)(path, data, format='json')
+            transaction.set_rollback(True)
+        return response
+
+    with mock.patch.object(APIView, 'check_throttles', lambda self, request: None), \
+            mock.patch.object(AsyncAPIView, 'check_throttles', lambda self, request: []):
+        for label, method, build in scenarios(password):
+            if args.only and not any(part in label for part in args.only):
+                continue
+            for number in range(args.warmup):
+                send(method, viewers[number % len(viewers)], *build(viewers[number % len(viewers)]))
+
+            samples, statuses = [], {}
+            started = time.perf_counter()
+            for number in range(args.requests):
+                viewer = viewers[number % len(viewers)]
+                path, data = build(viewer)
+                request_started = time.perf_counter()
+                response = send(method, viewer, path, data)
+                samples.append(time.perf_counter() - request_started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            elapsed = time.perf_counter() - started
+            emit({'benchmark': 'league', 'label': args.label, 'endpoint': label, 'players': players,
+                  'viewers': len(viewers), 'requests_per_second': round(args.requests / elapsed, 2),
+                  'statuses': statuses, **summarize(samples)})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Profile search latency as the number of profiles grows.
+
+    python -m benchmarks.search --sizes 10000 100000 1000000
+
+For every size the index is grown in place and the same query mix is timed through ProfileSearchIndex.search and
+through the previous icontains filter for comparison. Output is one JSON record per (size, strategy, query kind).
+"""
+import argparse
+import random
+
+from benchmarks.harness import emit, setup_django, summarize, timed
+
+SYLLABLES = [
+    'ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'to', 'vi', 'ze', 'bo', 'da', 'fe', 'gu', 'hi', 'jo', 'ku', 'la', 'ma',
+    'no', 'pe', 'qui', 'ri', 'su', 'te', 'ul', 'va', 'wo', 'xi', 'ya', 'zu', 'an', 'el', 'in', 'or', 'us', 'ber',
+    'cor', 'dan', 'fin', 'gar', 'hol', 'jan', 'kel', 'lin', 'mor', 'nar', 'pol', 'ros', 'sten', 'tor',
+]
+
+
+def make_name(rng, syllables):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(syllables))
+
+
+def populate(start, stop, rng, batch_size=5000):
+    from django.contrib.auth.models import User
+    from django.db import transaction
+
+    from sidelines_django_app.models import Profile, ProfileSearchEntry
+    from sidelines_django_app.search import ProfileSearchIndex
+
+    for offset in range(start, stop, batch_size):
+        end = min(stop, offset + batch_size)
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f'{make_name(rng, 3)}{number}', email=f'bench{number}@example.com', password='!',
+                     first_name=make_name(rng, 2).title(), last_name=make_name(rng, 3).title())
+                for number in range(offset, end)
+            ])
+            profiles = Profile.objects.bulk_create([Profile(user=user) for user in users])
+            entries = []
+            for profile, user in zip(profiles, users):
+                entries.extend(ProfileSearchIndex.build_entries(profile, user=user))
+            ProfileSearchEntry.objects.bulk_create(entries, batch_size=batch_size)
+
+
+def legacy_search(viewer, query):
+    from django.db.models import Q
+
+    from sidelines_django_app.models import Profile
+
+    return list(Profile.objects.filter(
+        Q(user__username__icontains=query) | Q(user__first_name__icontains=query) |
+        Q(user__last_name__icontains=query)
+    ).exclude(id=viewer.id).values_list('id', flat=True))
+
+
+def query_mix(rng, sample_users, count):
+    queries = {'exact': [], 'prefix': [], 'full_name': []}
+    for _ in range(count):
+        user = rng.choice(sample_users)
+        queries['exact'].append(user.last_name)
+        queries['prefix'].append(user.last_name[:4])
+        queries['full_name'].append(f'{user.first_name} {user.last_name[:3]}')
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--skip-legacy', action='store_true', help='do not time the icontains scan')
+    parser.add_argument('--database', help='SQLite file to use instead of a temporary one')
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    from django.contrib.auth.models import User
+
+    from sidelines_django_app.search import ProfileSearchIndex
+
+    rng = random.Random(args.seed)
+    populated = 0
+    for size in sorted(args.sizes):
+        populate(populated, size, rng)
+        populated = size
+
+        viewer = User.objects.select_related('profile').order_by('?').first().profile
+        sample_users = list(User.objects.order_by('?')[:args.queries])
+        for kind, queries in query_mix(rng, sample_users, args.queries).items():
+            samples, matches = [], 0
+            for query in queries:
+                elapsed, (profiles, _, _) = timed(ProfileSearchIndex.search, viewer, query)
+                samples.append(elapsed)
+                matches += len(profiles)
+            emit({'size': size, 'strategy': 'index', 'query': kind, 'avg_results': matches / len(queries),
+                  **summarize(samples)})
+
+            if args.skip_legacy:
+                continue
+            samples, matches = [], 0
+            for query in queries[:max(1, len(queries) // 10)]:
+                elapsed, profile_ids = timed(legacy_search, viewer, query)
+                samples.append(elapsed)
+                matches += len(profile_ids)
+            emit({'size': size, 'strategy': 'icontains', 'query': kind, 'avg_results': matches / len(samples),
+                  **summarize(samples)})
+
+
+if __name__ == '__main__':
+    main()
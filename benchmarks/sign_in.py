@@ -0,0 +1,66 @@
+"""
+Sign-in throughput on a single core.
+
+    python -m benchmarks.sign_in --attempts 50
+
+Drives the sign-in route in-process for successful, wrong-password and unknown-user attempts and reports logins
+per second together with the number of password-hasher runs per attempt. Throttling is disabled so only the
+authentication pipeline is measured.
+"""
+import argparse
+import time
+from unittest import mock
+
+from benchmarks.harness import emit, setup_django, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--attempts', type=int, default=50)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--database', help='SQLite file to use instead of a temporary one')
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    from django.contrib.auth.hashers import get_hasher, make_password
+    from django.contrib.auth.models import User
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from sidelines_django_app.models import Profile
+    from sidelines_django_app.views import SignInView
+
+    password = make_password('benchmark-password')
+    users = User.objects.bulk_create([
+        User(username=f'player{number}', email=f'player{number}@example.com', password=password)
+        for number in range(args.users)
+    ])
+    Profile.objects.bulk_create([Profile(user=user, setup_complete=True) for user in users])
+
+    SignInView.throttle_classes = []
+    client = APIClient()
+    url = reverse('api:sign-in')
+    scenarios = {
+        'username_success': lambda n: {'username': f'player{n}', 'password': 'benchmark-password'},
+        'email_success': lambda n: {'username': f'Player{n}@Example.com', 'password': 'benchmark-password'},
+        'wrong_password': lambda n: {'username': f'player{n}', 'password': 'wrong-password'},
+        'unknown_user': lambda n: {'username': f'nobody{n}', 'password': 'benchmark-password'},
+    }
+
+    hasher_class = type(get_hasher())
+    for scenario, payload in scenarios.items():
+        samples, statuses = [], {}
+        with mock.patch.object(hasher_class, 'encode', autospec=True, side_effect=hasher_class.encode) as encode:
+            started = time.perf_counter()
+            for attempt in range(args.attempts):
+                request_started = time.perf_counter()
+                response = client.post(url, payload(attempt % args.users))
+                samples.append(time.perf_counter() - request_started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            elapsed = time.perf_counter() - started
+        emit({'scenario': scenario, 'logins_per_second': round(args.attempts / elapsed, 2),
+              'hashes_per_attempt': encode.call_count / args.attempts, 'statuses': statuses, **summarize(samples)})
+
+
+if __name__ == '__main__':
+    main()
@@ -76,10 +76,20 @@ WSGI_APPLICATION = 'sidelines_django.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# SQLite has no row locks: a write waits up to `timeout` seconds for the database lock and then fails with
+# OperationalError. The test database is a file too, because SQLite's shared in-memory database reports lock
+# contention at once instead of waiting for it.
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+        },
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
@@ -108,7 +118,6 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTHENTICATION_BACKENDS = [
     'sidelines_django_app.authentication.UsernameOrEmailBackend',
-    'django.contrib.auth.backends.ModelBackend',
 ]
 
 # REST Framework
@@ -116,14 +125,16 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'sidelines_django_app.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'sidelines_django_app.pagination.KeysetPagination',
+    'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'sidelines_django_app.throttles.SlidingWindowAnonRateThrottle',
+        'sidelines_django_app.throttles.SlidingWindowUserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '10/hour',  # Unauthenticated users can make 10 requests per hour
@@ -132,6 +143,71 @@ REST_FRAMEWORK = {
     },
 }
 
+# Throttle costs
+# Units a request in the given scope spends against that scope's rate (default 1). A view can override its cost with
+# a `throttle_cost` attribute. Whatever its cost, each throttle class that applies to a request writes one
+# ThrottleCounter row when the request is allowed, so on SQLite every throttled endpoint takes the write lock.
+
+THROTTLE_COSTS = {
+    'anon': 1,
+    'user': 1,
+    'login': 1,
+}
+
+# Token authentication cache
+# The shared tier uses the named Django cache; point it at a cache every worker can reach (e.g. Redis) in
+# production, otherwise each worker only benefits from its own entries.
+
+AUTH_TOKEN_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'LOCAL_MAX_ENTRIES': 10000,
+    'LOCAL_TTL': 5,  # Seconds a worker trusts its in-process copy before re-reading the shared tier
+    'SHARED_TTL': 300,
+}
+
+# Versioned response cache
+# Team and match reads are cached under per-object version stamps that writes bump, so entries never go stale;
+# TIMEOUT only bounds how long unreachable entries occupy the cache.
+
+RESPONSE_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 3600,
+}
+
+# Team role cache
+# Each profile's {team_id: role} map used by team permission checks; membership changes invalidate it, so TIMEOUT
+# only bounds how long an idle profile's map occupies the cache.
+
+TEAM_ROLE_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 3600,
+}
+
+# Password hashing executor
+# Caps how many password hashes (sign-up, sign-in, password change) run at once and how many may wait; requests
+# beyond that get 503 with Retry-After instead of queueing behind a hashing burst.
+
+PASSWORD_HASHING = {
+    'MAX_WORKERS': 2,
+    'MAX_QUEUE': 32,
+    'QUEUE_TIMEOUT': 0.5,  # Seconds a request waits for room in a full queue before being rejected
+}
+
+# Live match events
+# Server-sent event streams of match votes, details and rosters. BROKER carries events between workers; the default
+# LocalBroker only reaches streams in the publishing process, so deployments with several workers need a broker
+# backed by a shared channel (e.g. Redis pub/sub). Open streams lease per-user slots in the CACHE_ALIAS cache.
+
+MATCH_EVENTS = {
+    'BROKER': 'sidelines_django_app.events.LocalBroker',
+    'CACHE_ALIAS': 'default',
+    'MAX_CONNECTIONS_PER_USER': 3,
+    'MAX_MATCHES_PER_STREAM': 20,
+    'HEARTBEAT_INTERVAL': 15,  # Seconds between keep-alive comments on an idle stream
+    'MAX_DURATION': 300,  # Seconds before a stream is closed and the client has to reconnect
+    'QUEUE_SIZE': 100,  # Undelivered events a stream may hold before it is closed
+}
+
 if 'test' in sys.argv:
     REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {
         'anon': '1000/minute',
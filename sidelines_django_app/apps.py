@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SidelinesDjangoAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sidelines_django_app'
+
+    def ready(self):
+        from sidelines_django_app import signals  # noqa: F401
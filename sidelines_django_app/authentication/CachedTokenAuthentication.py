@@ -0,0 +1,64 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+from sidelines_django_app.authentication.TokenCache import TokenCache
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that loads the token and its user in one joined query and keeps the result in TokenCache,
+    so a warm request authenticates without touching the database. The user's profile is not cached: counters and
+    version stamps move on it through queryset updates that never reach the cache, so `request.user.profile` is
+    loaded fresh, once per request, by the views that use it.
+    """
+
+    def authenticate_credentials(self, key):
+        token_cache = TokenCache.default()
+        token = token_cache.get(key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            token_cache.set(key, token)
+
+        return self.check_user(token)
+
+    async def aauthenticate(self, request):
+        """Async counterpart of `authenticate` for views served natively under ASGI."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain invalid '
+                                                    'characters.'))
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        token_cache = TokenCache.default()
+        token = await token_cache.aget(key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related('user').aget(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            await token_cache.aset(key, token)
+
+        return self.check_user(token)
+
+    @staticmethod
+    def check_user(token):
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return token.user, token
+
+    @staticmethod
+    def metrics():
+        return TokenCache.default().metrics()
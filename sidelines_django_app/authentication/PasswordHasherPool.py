@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+from sidelines_django_app.authentication.PasswordHashingBusy import PasswordHashingBusy
+
+
+class PasswordHasherPool:
+    """
+    Bounded executor for password hashing.
+
+    At most MAX_WORKERS hashes run at once (the PBKDF2 implementation releases the GIL, so they run in parallel with
+    request threads) and at most MAX_QUEUE more wait for a worker. A caller that finds the queue full waits up to
+    QUEUE_TIMEOUT seconds for room and then gets PasswordHashingBusy, which the API reports as 503 with Retry-After,
+    so a burst of sign-ups or sign-ins is shed instead of starving the rest of the API of CPU.
+    """
+    DEFAULTS = {
+        'MAX_WORKERS': 2,
+        'MAX_QUEUE': 32,
+        'QUEUE_TIMEOUT': 0.5,
+    }
+
+    _instance = None
+
+    def __init__(self, max_workers, max_queue, queue_timeout):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hasher')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._stats = {'queue_depth': 0, 'running': 0, 'completed': 0, 'rejected': 0, 'max_queue_depth': 0}
+
+    @classmethod
+    def default(cls):
+        if cls._instance is None:
+            options = {**cls.DEFAULTS, **getattr(settings, 'PASSWORD_HASHING', {})}
+            cls._instance = cls(
+                max_workers=options['MAX_WORKERS'],
+                max_queue=options['MAX_QUEUE'],
+                queue_timeout=options['QUEUE_TIMEOUT'],
+            )
+        return cls._instance
+
+    def run(self, func, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise PasswordHashingBusy()
+        try:
+            with self._lock:
+                self._stats['queue_depth'] += 1
+                self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._stats['queue_depth'])
+            return self._executor.submit(self._call, func, args).result()
+        finally:
+            self._slots.release()
+
+    def _call(self, func, args):
+        with self._lock:
+            self._stats['queue_depth'] -= 1
+            self._stats['running'] += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._stats['running'] -= 1
+                self._stats['completed'] += 1
+
+    def set_password(self, user, raw_password):
+        self.run(user.set_password, raw_password)
+
+    def check_password(self, user, raw_password):
+        """
+        Same contract as User.check_password. A hash that needs upgrading to the current hasher settings is
+        re-hashed through the pool and saved from the calling thread.
+        """
+        needs_upgrade = []
+        valid = self.run(hashers.check_password, raw_password, user.password, needs_upgrade.append)
+        if valid and needs_upgrade:
+            self.set_password(user, raw_password)
+            user.save(update_fields=['password'])
+        return valid
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['max_workers'] = self.max_workers
+        stats['max_queue'] = self.max_queue
+        return stats
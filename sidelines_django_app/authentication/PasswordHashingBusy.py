@@ -0,0 +1,9 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, status
+
+
+class PasswordHashingBusy(exceptions.APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Too many password operations in progress, try again shortly.')
+    default_code = 'password_hashing_busy'
+    wait = 1
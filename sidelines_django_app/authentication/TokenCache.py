@@ -0,0 +1,136 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class TokenCache:
+    """
+    Two-tier cache of authenticated tokens with their user already attached.
+
+    The first tier is a bounded in-process LRU whose entries are trusted for LOCAL_TTL seconds, the second is the
+    shared Django cache named by CACHE_ALIAS. Entries are stored pickled so every request gets its own model
+    instances, and invalidation removes the key from both tiers; other workers drop their local copy within
+    LOCAL_TTL.
+    """
+    KEY_PREFIX = 'auth-token:'
+    DEFAULTS = {
+        'CACHE_ALIAS': 'default',
+        'LOCAL_MAX_ENTRIES': 10000,
+        'LOCAL_TTL': 5,
+        'SHARED_TTL': 300,
+    }
+
+    _instance = None
+
+    def __init__(self, cache_alias, local_max_entries, local_ttl, shared_ttl):
+        self.cache_alias = cache_alias
+        self.local_max_entries = local_max_entries
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0, 'invalidations': 0}
+
+    @classmethod
+    def default(cls):
+        if cls._instance is None:
+            options = {**cls.DEFAULTS, **getattr(settings, 'AUTH_TOKEN_CACHE', {})}
+            cls._instance = cls(
+                cache_alias=options['CACHE_ALIAS'],
+                local_max_entries=options['LOCAL_MAX_ENTRIES'],
+                local_ttl=options['LOCAL_TTL'],
+                shared_ttl=options['SHARED_TTL'],
+            )
+        return cls._instance
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    @classmethod
+    def cache_key(cls, key):
+        return cls.KEY_PREFIX + hashlib.sha256(key.encode()).hexdigest()
+
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def get(self, key):
+        cache_key = self.cache_key(key)
+        token = self._get_local(cache_key)
+        if token is not None:
+            return token
+        return self._from_shared(cache_key, self.shared.get(cache_key))
+
+    async def aget(self, key):
+        cache_key = self.cache_key(key)
+        token = self._get_local(cache_key)
+        if token is not None:
+            return token
+        return self._from_shared(cache_key, await self.shared.aget(cache_key))
+
+    def _get_local(self, cache_key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(cache_key)
+            if entry is None or entry[0] <= now:
+                return None
+            self._local.move_to_end(cache_key)
+            self._stats['local_hits'] += 1
+        return pickle.loads(entry[1])
+
+    def _from_shared(self, cache_key, payload):
+        if payload is None:
+            self._count('misses')
+            return None
+        self._count('shared_hits')
+        self._store_local(cache_key, payload)
+        return pickle.loads(payload)
+
+    def set(self, key, token):
+        cache_key = self.cache_key(key)
+        payload = pickle.dumps(token)
+        self.shared.set(cache_key, payload, self.shared_ttl)
+        self._store_local(cache_key, payload)
+
+    async def aset(self, key, token):
+        cache_key = self.cache_key(key)
+        payload = pickle.dumps(token)
+        await self.shared.aset(cache_key, payload, self.shared_ttl)
+        self._store_local(cache_key, payload)
+
+    def _store_local(self, cache_key, payload):
+        with self._lock:
+            self._local[cache_key] = (time.monotonic() + self.local_ttl, payload)
+            self._local.move_to_end(cache_key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def invalidate(self, *keys):
+        cache_keys = [self.cache_key(key) for key in keys]
+        if not cache_keys:
+            return
+        self.shared.delete_many(cache_keys)
+        with self._lock:
+            for cache_key in cache_keys:
+                self._local.pop(cache_key, None)
+            self._stats['invalidations'] += len(cache_keys)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+            for stat in self._stats:
+                self._stats[stat] = 0
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['local_entries'] = len(self._local)
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['local_hits'] + stats['shared_hits']) / lookups if lookups else 0.0
+        return stats
@@ -1,17 +1,38 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import User
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Lower
+
+from sidelines_django_app.authentication.PasswordHasherPool import PasswordHasherPool
 
 
 class UsernameOrEmailBackend(ModelBackend):
+    """
+    Resolves the identifier as a username or a case-insensitive email in one indexed query and runs the password
+    hasher exactly once per attempt, hashing a dummy password when no user matches so timing stays constant. The
+    hash itself runs on PasswordHasherPool.
+    """
+
     def authenticate(self, request, username=None, password=None, **kwargs):
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            try:
-                user = User.objects.get(email=username)
-            except User.DoesNotExist:
-                return None
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
 
-        if user.check_password(password):
+        hasher_pool = PasswordHasherPool.default()
+        user = self.get_user_by_identifier(username)
+        if user is None:
+            hasher_pool.set_password(User(), password)
+            return None
+
+        if hasher_pool.check_password(user, password) and self.user_can_authenticate(user):
             return user
         return None
+
+    @staticmethod
+    def get_user_by_identifier(identifier):
+        return User.objects.select_related('profile').alias(email_lower=Lower('email')).filter(
+            Q(username=identifier) | (Q(email_lower=identifier.lower()) & ~Q(email=''))
+        ).order_by(
+            Case(When(username=identifier, then=Value(0)), default=Value(1), output_field=IntegerField())
+        ).first()
@@ -1 +1,5 @@
 from .UsernameOrEmailBackend import UsernameOrEmailBackend
+from .TokenCache import TokenCache
+from .CachedTokenAuthentication import CachedTokenAuthentication
+from .PasswordHashingBusy import PasswordHashingBusy
+from .PasswordHasherPool import PasswordHasherPool
@@ -0,0 +1,37 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ResourceValidators:
+    """
+    Strong ETag and Last-Modified for a representation built from one or more VersionedModel rows.
+
+    `stamps` are (label, pk, version, updated_at) tuples for every row the representation depends on, loaded with a
+    narrow `values_list` query so a 304 can be answered before anything is fetched or serialized. `vary` adds inputs
+    that change the representation without touching those rows, such as the viewer.
+    """
+
+    def __init__(self, stamps, vary=()):
+        parts = [f'{label}:{pk}:{version}:{updated_at.isoformat()}' for label, pk, version, updated_at in stamps]
+        parts.extend(str(value) for value in vary)
+        self.etag = quote_etag(hashlib.sha256('|'.join(parts).encode()).hexdigest()[:32])
+        self.last_modified = max(updated_at for _, _, _, updated_at in stamps).timestamp()
+
+    @staticmethod
+    def load(queryset):
+        """The stamps of every row in `queryset`, in primary key order."""
+        label = queryset.model._meta.label_lower
+        return [(label, *row) for row in queryset.order_by('pk').values_list('pk', 'version', 'updated_at')]
+
+    def not_modified(self, request):
+        """The 304 response for a matching If-None-Match / If-Modified-Since, otherwise None."""
+        response = get_conditional_response(request, etag=self.etag, last_modified=int(self.last_modified))
+        return response and self.apply(response)
+
+    def apply(self, response):
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            response['ETag'] = self.etag
+            response['Last-Modified'] = http_date(self.last_modified)
+        return response
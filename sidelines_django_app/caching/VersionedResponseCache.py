@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class VersionedResponseCache:
+    """
+    Caches serialized GET responses under the version stamps of the objects they were built from.
+
+    A stamp is a short name such as 'team' (the team collection) or 'team:5' (one team) whose current version is a
+    random token in the shared cache. Writers bump the stamps they touch, which changes the key every later read
+    computes, so stale entries are never looked up again and simply age out. Stamps are bumped when the write happens
+    and again when its transaction commits, so a read that raced the write cannot leave a pre-commit response under
+    the new version. A stamp evicted from the cache gets a fresh token, which can only cause a miss.
+    """
+    KEY_PREFIX = 'response:'
+    VERSION_PREFIX = 'response-version:'
+    DEFAULTS = {
+        'CACHE_ALIAS': 'default',
+        'TIMEOUT': 3600,
+    }
+
+    _instance = None
+
+    def __init__(self, cache_alias, timeout):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'bumps': 0}
+
+    @classmethod
+    def default(cls):
+        if cls._instance is None:
+            options = {**cls.DEFAULTS, **getattr(settings, 'RESPONSE_CACHE', {})}
+            cls._instance = cls(cache_alias=options['CACHE_ALIAS'], timeout=options['TIMEOUT'])
+        return cls._instance
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    def _count(self, stat, amount=1):
+        with self._lock:
+            self._stats[stat] += amount
+
+    def versions(self, stamps):
+        version_keys = [self.VERSION_PREFIX + stamp for stamp in stamps]
+        versions = self.shared.get_many(version_keys)
+        for version_key in version_keys:
+            if version_key not in versions:
+                self.shared.add(version_key, uuid.uuid4().hex, None)
+                versions[version_key] = self.shared.get(version_key)
+        return [versions[version_key] for version_key in version_keys]
+
+    def bump(self, *stamps):
+        if not stamps:
+            return
+        self._set_versions(stamps)
+        transaction.on_commit(lambda: self._set_versions(stamps))
+
+    def _set_versions(self, stamps):
+        self.shared.set_many({self.VERSION_PREFIX + stamp: uuid.uuid4().hex for stamp in stamps}, None)
+        self._count('bumps', len(stamps))
+
+    def cache_key(self, request, stamps):
+        versions = self.versions(stamps)
+        digest = hashlib.sha256('|'.join([request.get_full_path(), *stamps, *versions]).encode()).hexdigest()
+        return self.KEY_PREFIX + digest
+
+    def get_or_build(self, request, stamps, build):
+        """
+        Returns the cached response for this request and stamps, or calls `build` and caches its response when it is
+        a 200. Responses carry an X-Cache header of HIT or MISS.
+        """
+        cache_key = self.cache_key(request, stamps)
+        data = self.shared.get(cache_key)
+        if data is not None:
+            self._count('hits')
+            response = Response(data, status=status.HTTP_200_OK)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        self._count('misses')
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            self.shared.set(cache_key, response.data, self.timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def clear(self):
+        with self._lock:
+            for stat in self._stats:
+                self._stats[stat] = 0
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
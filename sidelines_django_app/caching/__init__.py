@@ -0,0 +1,2 @@
+from .VersionedResponseCache import VersionedResponseCache
+from .ResourceValidators import ResourceValidators
@@ -0,0 +1,26 @@
+import threading
+
+
+class LocalBroker:
+    """
+    The default match event broker, for a single worker process: every published event is handed straight to the
+    subscribed callbacks in this process.
+
+    A cross-worker broker implements the same two methods over a shared channel (e.g. Redis pub/sub), delivering
+    every event published by any worker to the callbacks subscribed in every worker. Events are JSON-serializable
+    dicts, so they can be sent over the wire as they are.
+    """
+
+    def __init__(self):
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def publish(self, channel, event):
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(channel, event)
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._callbacks.append(callback)
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class MatchEventSubscription:
+    """
+    One event stream's queue of pending events. Events are pushed from any thread and consumed on the stream's event
+    loop; a stream that falls more than `limit` events behind is marked as overflowed instead of buffering without
+    bound, and should close so its client reconnects.
+    """
+
+    def __init__(self, loop, limit):
+        self.loop = loop
+        self.limit = limit
+        self.channels = set()
+        self.queue = asyncio.Queue()
+        self.overflowed = False
+
+    def push(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The stream's loop has closed; it is about to unsubscribe.
+            pass
+
+    def _put(self, event):
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.limit:
+            # Wakes the stream up once it has drained what it already holds.
+            self.overflowed = True
+            self.queue.put_nowait(None)
+        else:
+            self.queue.put_nowait(event)
+
+    async def next(self, timeout):
+        """Returns the next event, or None once the stream overflowed or if nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class MatchEventHub:
+    """
+    Fans live match events out to the event streams open in this worker.
+
+    Writers publish events on a channel (`match:<id>` for votes and details, `team:<id>` for roster changes) through
+    the configured broker, which delivers every event to the hub of every worker. The hub then pushes it to each
+    local subscription on that channel, so the cost of a write does not depend on how many clients are watching.
+    The broker is pluggable (MATCH_EVENTS['BROKER']); the default LocalBroker only reaches this process.
+
+    Each open stream holds one of its user's MAX_CONNECTIONS_PER_USER slots in the shared cache named by CACHE_ALIAS,
+    so the per-user cap holds across workers that share that cache. A slot is a lease of LEASE_HEARTBEATS heartbeat
+    intervals that the stream renews as it runs, so a stream that stops running without releasing its slot (a dead
+    worker, a dropped response) frees it within a few heartbeats.
+    """
+    KEY_PREFIX = 'match-event-streams:'
+    LEASE_HEARTBEATS = 3
+    DEFAULTS = {
+        'BROKER': 'sidelines_django_app.events.LocalBroker',
+        'CACHE_ALIAS': 'default',
+        'MAX_CONNECTIONS_PER_USER': 3,
+        'MAX_MATCHES_PER_STREAM': 20,
+        'HEARTBEAT_INTERVAL': 15,
+        'MAX_DURATION': 300,
+        'QUEUE_SIZE': 100,
+    }
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, broker, options):
+        self.broker = broker
+        self.options = options
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        broker.subscribe(self.deliver)
+
+    @classmethod
+    def default(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                options = {**cls.DEFAULTS, **getattr(settings, 'MATCH_EVENTS', {})}
+                cls._instance = cls(import_string(options['BROKER'])(), options)
+        return cls._instance
+
+    @property
+    def shared(self):
+        return caches[self.options['CACHE_ALIAS']]
+
+    def publish(self, channel, event):
+        self.broker.publish(channel, event)
+
+    def publish_on_commit(self, channel, event):
+        """Publishes once the surrounding transaction commits, so streams never see a change that rolled back."""
+        transaction.on_commit(lambda: self.publish(channel, event))
+
+    def deliver(self, channel, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    def subscribe(self, channels, subscription=None):
+        """Subscribes a new subscription, or adds channels to an existing one. Must run on the stream's loop."""
+        if subscription is None:
+            subscription = MatchEventSubscription(asyncio.get_running_loop(), self.options['QUEUE_SIZE'])
+        with self._lock:
+            for channel in set(channels) - subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+                subscription.channels.add(channel)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+            subscription.channels = set()
+
+    @property
+    def lease(self):
+        return self.LEASE_HEARTBEATS * self.options['HEARTBEAT_INTERVAL']
+
+    def slot_keys(self, user_id):
+        return [f'{self.KEY_PREFIX}{user_id}:{slot}' for slot in range(self.options['MAX_CONNECTIONS_PER_USER'])]
+
+    async def has_free_slot(self, user_id):
+        """Returns whether the user has a stream slot free right now, without claiming it."""
+        keys = self.slot_keys(user_id)
+        return len(await self.shared.aget_many(keys)) < len(keys)
+
+    async def acquire(self, user_id):
+        """Leases one of the user's free stream slots and returns it, or None if they are all taken."""
+        token = uuid.uuid4().hex
+        for key in self.slot_keys(user_id):
+            if await self.shared.aadd(key, token, self.lease):
+                return key, token
+        return None
+
+    async def renew(self, slot):
+        """Extends a slot's lease. Returns False if it already lapsed, in which case the stream should close."""
+        key, token = slot
+        return await self.shared.aget(key) == token and await self.shared.atouch(key, self.lease)
+
+    async def release(self, slot):
+        key, token = slot
+        if await self.shared.aget(key) == token:
+            await self.shared.adelete(key)
@@ -0,0 +1,2 @@
+from .LocalBroker import LocalBroker
+from .MatchEventHub import MatchEventHub, MatchEventSubscription
@@ -0,0 +1,96 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+class MatchFeedFilter:
+    """
+    Parses the match feed's query parameters and applies them to a Match queryset:
+
+        team      matches this team plays in
+        profile   matches of the teams this profile is a member of
+        from, to  kick-off inside [from, to]; ISO dates or datetimes, a date meaning the start or end of that day
+        when      `upcoming` or `past`
+
+    Date filtered feeds are ordered by kick-off (soonest first for `upcoming`, latest first otherwise), which the
+    (team, date_time) indexes serve, and then by id, so matches kicking off together page in a stable order; an
+    unfiltered feed keeps the default newest-first ordering.
+    """
+    WHEN = ('upcoming', 'past')
+
+    def __init__(self, params):
+        self.error = None
+        self.team_id = self._integer(params, 'team')
+        self.profile_id = self._integer(params, 'profile')
+        self.start = self._moment(params, 'from', time.min)
+        self.end = self._moment(params, 'to', time.max)
+        self.when = params.get('when')
+        if self.when is not None and self.when not in self.WHEN:
+            self.error = self.error or f'"when" must be one of: {", ".join(self.WHEN)}.'
+
+    @classmethod
+    def from_request(cls, request):
+        return cls(request.GET)
+
+    @property
+    def ordering(self):
+        if self.when == 'upcoming':
+            return 'date_time', 'id'
+        if self.when or self.start or self.end:
+            return '-date_time', '-id'
+        return None
+
+    @property
+    def cache_stamps(self):
+        """
+        Version stamps a cached page of this feed depends on, or None when the feed must not be cached. `when` is
+        relative to the current time, which no write bumps, and `profile` depends on team memberships, which bump the
+        team stamp rather than the match one.
+        """
+        if self.when is not None:
+            return None
+        if self.profile_id is not None:
+            return ['match', 'team']
+        return ['match']
+
+    def apply(self, matches):
+        if self.team_id is not None:
+            matches = matches.for_teams([self.team_id])
+        if self.profile_id is not None:
+            matches = matches.for_profile(self.profile_id)
+        if self.start is not None:
+            matches = matches.filter(date_time__gte=self.start)
+        if self.end is not None:
+            matches = matches.filter(date_time__lte=self.end)
+        if self.when == 'upcoming':
+            matches = matches.upcoming()
+        elif self.when == 'past':
+            matches = matches.past()
+        return matches
+
+    def _integer(self, params, name):
+        value = params.get(name)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            self.error = self.error or f'"{name}" must be an integer.'
+            return None
+
+    def _moment(self, params, name, time_of_day):
+        value = params.get(name)
+        if value is None:
+            return None
+        try:
+            day = parse_date(value)
+            moment = datetime.combine(day, time_of_day) if day else parse_datetime(value)
+        except ValueError:
+            moment = None
+        if moment is None:
+            self.error = self.error or f'"{name}" must be an ISO date or datetime.'
+            return None
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
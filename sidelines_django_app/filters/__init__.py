@@ -0,0 +1 @@
+from .MatchFeedFilter import MatchFeedFilter
@@ -0,0 +1,142 @@
+import base64
+import json
+
+from django.db.models import BigIntegerField, CharField, DateTimeField, F, IntegerField, Q, Value
+from django.utils.dateparse import parse_datetime
+
+from sidelines_django_app.models import FriendRequest, MatchInvitation, Profile, Team, TeamInvitation
+
+
+def column(value, output_field):
+    if isinstance(value, str):
+        return F(value)
+    return Value(value, output_field=output_field)
+
+
+class Inbox:
+    """
+    Everything waiting for a profile's answer: friend requests and team invitations sent to the profile, and match
+    invitations sent to the teams it administers, newest first.
+
+    A page is one UNION ALL query over the three tables, each branch an index range scan on its (recipient,
+    created_at) index. Pages are keyed on (created_at, type, id), so the cursor stays valid while invitations arrive
+    or are answered, and every branch filters past the cursor before the union.
+    """
+    FRIEND_REQUEST = 'friend_request'
+    TEAM_INVITATION = 'team_invitation'
+    MATCH_INVITATION = 'match_invitation'
+
+    # Every branch selects these columns, in this order; columns a type does not have are NULL. They are selected
+    # as item_<name> so they cannot clash with the models' own fields.
+    COLUMNS = {
+        'id': BigIntegerField(),
+        'sent_at': DateTimeField(),
+        'profile': BigIntegerField(),
+        'username': CharField(),
+        'team': BigIntegerField(),
+        'team_name': CharField(),
+        'to_team': BigIntegerField(),
+        'team_size': IntegerField(),
+        'date_time': DateTimeField(),
+        'location': CharField(),
+    }
+    # Payload key to column, per type.
+    FIELDS = {
+        FRIEND_REQUEST: {'from_profile': 'profile', 'from_username': 'username'},
+        TEAM_INVITATION: {'from_profile': 'profile', 'from_username': 'username', 'team': 'team',
+                          'team_name': 'team_name'},
+        MATCH_INVITATION: {'from_team': 'team', 'from_team_name': 'team_name', 'to_team': 'to_team',
+                           'team_size': 'team_size', 'date_time': 'date_time', 'location': 'location'},
+    }
+
+    def __init__(self, profile_id, admin_team_ids):
+        self.profile_id = profile_id
+        self.admin_team_ids = admin_team_ids
+
+    def branches(self):
+        sender = {'id': 'id', 'sent_at': 'created_at', 'profile': 'from_profile_id',
+                  'username': 'from_profile__user__username'}
+        yield self.FRIEND_REQUEST, FriendRequest.objects.filter(to_profile_id=self.profile_id), sender
+        yield self.TEAM_INVITATION, TeamInvitation.objects.filter(to_profile_id=self.profile_id), {
+            **sender, 'team': 'team_id', 'team_name': 'team__team_name',
+        }
+        if self.admin_team_ids:
+            yield self.MATCH_INVITATION, MatchInvitation.objects.filter(to_team_id__in=self.admin_team_ids), {
+                'id': 'id', 'sent_at': 'created_at', 'team': 'from_team_id', 'team_name': 'from_team__team_name',
+                'to_team': 'to_team_id', 'team_size': 'team_size', 'date_time': 'date_time', 'location': 'location',
+            }
+
+    def page(self, size, cursor=None):
+        """Returns up to `size` items after `cursor` (None for the first page) and the cursor of the next page."""
+        queries = []
+        for kind, queryset, columns in self.branches():
+            if cursor is not None:
+                queryset = queryset.filter(self.after(kind, *cursor))
+            annotations = {'item_type': Value(kind, output_field=CharField()),
+                           **{f'item_{name}': column(columns.get(name), field) for name, field in self.COLUMNS.items()}}
+            queries.append(queryset.annotate(**annotations).values(*annotations))
+
+        rows = list(queries[0].union(*queries[1:], all=True)
+                    .order_by('-item_sent_at', '-item_type', '-item_id')[:size + 1])
+        next_cursor = None
+        if len(rows) > size:
+            rows = rows[:size]
+            next_cursor = (rows[-1]['item_sent_at'], rows[-1]['item_type'], rows[-1]['item_id'])
+        return [self.item(row) for row in rows], next_cursor
+
+    @staticmethod
+    def after(kind, sent_at, cursor_kind, item_id):
+        """Rows of `kind` that come after (sent_at, cursor_kind, item_id) in newest-first order."""
+        if kind < cursor_kind:
+            return Q(created_at__lte=sent_at)
+        if kind > cursor_kind:
+            return Q(created_at__lt=sent_at)
+        return Q(created_at__lt=sent_at) | Q(created_at=sent_at, id__lt=item_id)
+
+    def item(self, row):
+        return {'type': row['item_type'], 'id': row['item_id'], 'created_at': row['item_sent_at'],
+                **{key: row[f'item_{name}'] for key, name in self.FIELDS[row['item_type']].items()}}
+
+    @staticmethod
+    def counts(user_id):
+        """
+        The user's badge counts, read from the pending counters of their profile and of the teams they administer
+        in one UNION ALL query: the profile by its user and the teams through the admins table's profile index.
+        """
+        def row(queryset, row_type, first, second):
+            annotations = {'row_type': Value(row_type, output_field=CharField()), 'row_id': F('pk'),
+                           'first': first, 'second': second}
+            return queryset.annotate(**annotations).values_list(*annotations)
+
+        zero = Value(0, output_field=IntegerField())
+        profiles = row(Profile.objects.filter(user_id=user_id), 'profile', F('pending_friend_requests'),
+                       F('pending_team_invitations'))
+        teams = row(Team.objects.filter(admins__user_id=user_id), 'team', F('pending_match_invitations'), zero)
+
+        counts = {'friend_requests': 0, 'team_invitations': 0, 'match_invitations': 0, 'teams': []}
+        for row_type, row_id, first, second in profiles.union(teams, all=True):
+            if row_type == 'profile':
+                counts['friend_requests'], counts['team_invitations'] = first, second
+            else:
+                counts['teams'].append({'id': row_id, 'match_invitations': first})
+                counts['match_invitations'] += first
+        counts['teams'].sort(key=lambda team: team['id'])
+        counts['total'] = counts['friend_requests'] + counts['team_invitations'] + counts['match_invitations']
+        return counts
+
+    @staticmethod
+    def encode_cursor(cursor):
+        sent_at, kind, item_id = cursor
+        return base64.urlsafe_b64encode(json.dumps([sent_at.isoformat(), kind, item_id]).encode()).decode()
+
+    @classmethod
+    def decode_cursor(cls, encoded):
+        """Returns the (sent_at, type, id) an encoded cursor points at, or None if it is not a valid cursor."""
+        try:
+            sent_at, kind, item_id = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            sent_at = parse_datetime(sent_at)
+        except (TypeError, ValueError):
+            return None
+        if sent_at is None or kind not in cls.FIELDS or not isinstance(item_id, int):
+            return None
+        return sent_at, kind, item_id
@@ -0,0 +1 @@
+from .Inbox import Inbox
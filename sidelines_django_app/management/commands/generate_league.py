@@ -0,0 +1,215 @@
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from sidelines_django_app.models import (FriendRequest, Match, MatchDetails, MatchInvitation, MatchVote, Profile,
+                                         Team, TeamInvitation)
+from sidelines_django_app.search import ProfileSearchIndex
+
+POSITIONS = ['GK', 'CB', 'LB', 'RB', 'CDM', 'CM', 'CAM', 'LW', 'RW', 'ST']
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Chris', 'Robin', 'Taylor', 'Jamie', 'Casey', 'Morgan', 'Riley', 'Deniz',
+               'Emre', 'Kai', 'Noa', 'Ali', 'Sasha']
+LAST_NAMES = ['Yilmaz', 'Smith', 'Garcia', 'Kaya', 'Novak', 'Rossi', 'Muller', 'Silva', 'Demir', 'Jensen', 'Dubois',
+              'Sato', 'Khan', 'Olsen', 'Moreau', 'Costa']
+GROUNDS = ['North Park', 'Riverside', 'Old Mill', 'Harbour Field', 'Town Green', 'Hillside', 'Canal Street']
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-generates a synthetic league: players with completed profiles, a friend graph, teams, pending friend '
+        'requests and team and match invitations, and played matches with details and votes. Every player signs in '
+        'with --password. Rows are written with bulk_create, so no signals are sent; roster, vote and pending '
+        'invitation counters and the search index are rebuilt at the end. Generation is deterministic for a given '
+        '--seed and set of options.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=1000)
+        parser.add_argument('--team-size', type=int, default=10, help='players per team; every player is in one team')
+        parser.add_argument('--friends', type=int, default=20, help='average friends per player, teammates included')
+        parser.add_argument('--friend-requests', type=int, default=2, help='pending friend requests per player')
+        parser.add_argument('--team-invitations', type=int, default=2, help='pending team invitations per team')
+        parser.add_argument('--matches', type=int, default=10, help='played matches per team')
+        parser.add_argument('--match-invitations', type=int, default=2, help='pending match invitations per team')
+        parser.add_argument('--prefix', default='player', help='usernames are <prefix><number>')
+        parser.add_argument('--password', default='password')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        players, team_size = options['players'], options['team_size']
+        if team_size < 2 or players < 2 * team_size:
+            raise CommandError('A league needs at least two teams of at least two players.')
+        if User.objects.filter(username__startswith=options['prefix']).exists():
+            raise CommandError(f'Users named {options["prefix"]}<number> already exist; pick another --prefix.')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        with transaction.atomic():
+            profiles = self.create_players(players, options['prefix'], options['password'])
+            teams = self.create_teams(profiles, team_size)
+            friendships = self.create_friendships(profiles, teams, options['friends'])
+            self.create_friend_requests(profiles, friendships, options['friend_requests'])
+            self.create_team_invitations(teams, friendships, options['team_invitations'])
+            matches = self.create_matches(teams, options['matches'])
+            self.create_match_invitations(teams, options['match_invitations'])
+
+            team_ids = [team.pk for team, _ in teams]
+            for offset in range(0, len(team_ids), self.batch_size):
+                Team.refresh_rosters(team_ids[offset:offset + self.batch_size])
+            match_ids = [match.pk for match in matches]
+            for offset in range(0, len(match_ids), self.batch_size):
+                Match.refresh_vote_counts(match_ids[offset:offset + self.batch_size])
+            profile_ids = [profile.pk for profile in profiles]
+            for offset in range(0, len(profile_ids), self.batch_size):
+                FriendRequest.refresh_pending(profile_ids[offset:offset + self.batch_size])
+                TeamInvitation.refresh_pending(profile_ids[offset:offset + self.batch_size])
+            for offset in range(0, len(team_ids), self.batch_size):
+                MatchInvitation.refresh_pending(team_ids[offset:offset + self.batch_size])
+        ProfileSearchIndex.rebuild(batch_size=self.batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {len(profiles)} players, {len(teams)} teams, {len(friendships)} friendships and '
+            f'{len(matches)} matches.'
+        ))
+
+    def opponent(self, teams, index):
+        """Picks a random team other than `teams[index]`."""
+        return teams[(index + self.rng.randrange(1, len(teams))) % len(teams)]
+
+    def create_players(self, count, prefix, password):
+        password = make_password(password)
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}{number}', email=f'{prefix}{number}@example.com', password=password,
+                 first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES))
+            for number in range(count)
+        ], batch_size=self.batch_size)
+        return Profile.objects.bulk_create([
+            Profile(user=user, setup_complete=True, positions=self.rng.sample(POSITIONS, 2),
+                    kit_number=self.rng.randint(1, 99), overall_rating=round(self.rng.uniform(50, 95), 1),
+                    date_of_birth=date(1980, 1, 1) + timedelta(days=self.rng.randrange(9000)))
+            for user in users
+        ], batch_size=self.batch_size)
+
+    def create_teams(self, profiles, team_size):
+        """Splits the players into teams whose first two members are admins. Returns (team, roster) pairs."""
+        shuffled = list(profiles)
+        self.rng.shuffle(shuffled)
+        rosters = [shuffled[offset:offset + team_size] for offset in range(0, len(shuffled), team_size)]
+        if len(rosters[-1]) < 2:
+            rosters[-2].extend(rosters.pop())
+
+        teams = Team.objects.bulk_create([
+            Team(team_name=f'Team {number}', overall_rating=round(self.rng.uniform(50, 95), 1))
+            for number in range(len(rosters))
+        ], batch_size=self.batch_size)
+        members, admins = Team.members.through, Team.admins.through
+        members.objects.bulk_create([
+            members(team_id=team.pk, profile_id=profile.pk) for team, roster in zip(teams, rosters)
+            for profile in roster
+        ], batch_size=self.batch_size)
+        admins.objects.bulk_create([
+            admins(team_id=team.pk, profile_id=profile.pk) for team, roster in zip(teams, rosters)
+            for profile in roster[:2]
+        ], batch_size=self.batch_size)
+        return list(zip(teams, rosters))
+
+    def create_friendships(self, profiles, teams, average):
+        """Makes teammates friends, then adds random pairs until the average is reached. Returns the pairs."""
+        pairs = set()
+        for _, roster in teams:
+            for i, profile in enumerate(roster):
+                pairs.update((min(profile.pk, other.pk), max(profile.pk, other.pk)) for other in roster[i + 1:])
+
+        target = min(len(profiles) * average // 2, len(profiles) * (len(profiles) - 1) // 2)
+        while len(pairs) < target:
+            first, second = self.rng.sample(profiles, 2)
+            pairs.add((min(first.pk, second.pk), max(first.pk, second.pk)))
+
+        friendships = Profile.friends.through
+        friendships.objects.bulk_create([
+            friendships(from_profile_id=from_id, to_profile_id=to_id)
+            for first, second in pairs for from_id, to_id in ((first, second), (second, first))
+        ], batch_size=self.batch_size)
+        return pairs
+
+    def create_friend_requests(self, profiles, friendships, per_player):
+        """Pending requests between players who are not friends yet, at most one per pair."""
+        pairs = set()
+        requests = []
+        for profile in profiles:
+            for _ in range(per_player):
+                sender = self.rng.choice(profiles)
+                pair = (min(profile.pk, sender.pk), max(profile.pk, sender.pk))
+                if sender.pk == profile.pk or pair in friendships or pair in pairs:
+                    continue
+                pairs.add(pair)
+                requests.append(FriendRequest(from_profile=sender, to_profile=profile))
+        return FriendRequest.objects.bulk_create(requests, batch_size=self.batch_size)
+
+    def create_team_invitations(self, teams, friendships, per_team):
+        """Pending invitations from a team's admin to friends outside the team, at most one per pair of profiles."""
+        friends_by_profile = {}
+        for first, second in friendships:
+            friends_by_profile.setdefault(first, []).append(second)
+            friends_by_profile.setdefault(second, []).append(first)
+
+        pairs = set()
+        invitations = []
+        for team, roster in teams:
+            admin = roster[0]
+            roster_ids = {profile.pk for profile in roster}
+            candidates = [pk for pk in friends_by_profile.get(admin.pk, []) if pk not in roster_ids]
+            for invitee_id in self.rng.sample(candidates, min(per_team, len(candidates))):
+                pair = (min(admin.pk, invitee_id), max(admin.pk, invitee_id))
+                if pair in pairs:
+                    continue
+                pairs.add(pair)
+                invitations.append(TeamInvitation(from_profile=admin, to_profile_id=invitee_id, team=team))
+        return TeamInvitation.objects.bulk_create(invitations, batch_size=self.batch_size)
+
+    def create_matches(self, teams, per_team):
+        """Played matches against random opponents, with details for both sides and votes from both rosters."""
+        now = timezone.now()
+        fixtures = []
+        for index, (team, roster) in enumerate(teams):
+            for number in range(per_team):
+                opponent, opponent_roster = self.opponent(teams, index)
+                fixtures.append((team, roster, opponent, opponent_roster,
+                                 now - timedelta(days=self.rng.randrange(1, 365), hours=number)))
+
+        matches = Match.objects.bulk_create([
+            Match(home_team=team, away_team=opponent, date_time=date_time, location=self.rng.choice(GROUNDS),
+                  team_size=self.rng.choice([5, 7, 11]))
+            for team, _, opponent, _, date_time in fixtures
+        ], batch_size=self.batch_size)
+        MatchDetails.objects.bulk_create([
+            MatchDetails(match=match, team=side, score=self.rng.randint(0, 5), shooting=self.rng.randint(0, 20),
+                         attacks=self.rng.randint(10, 80), possession=self.rng.randint(30, 70),
+                         fouls=self.rng.randint(0, 15), corners=self.rng.randint(0, 10))
+            for match, (team, _, opponent, _, _) in zip(matches, fixtures) for side in (team, opponent)
+        ], batch_size=self.batch_size)
+        responses = [choice for choice, _ in MatchVote.RESPONSE_CHOICES]
+        MatchVote.objects.bulk_create([
+            MatchVote(match=match, profile=profile, response=self.rng.choice(responses))
+            for match, (_, roster, _, opponent_roster, _) in zip(matches, fixtures)
+            for profile in roster + opponent_roster
+        ], batch_size=self.batch_size)
+        return matches
+
+    def create_match_invitations(self, teams, per_team):
+        """Pending invitations to upcoming fixtures against random opponents."""
+        now = timezone.now()
+        invitations = []
+        for index, (team, _) in enumerate(teams):
+            for number in range(per_team):
+                opponent, _ = self.opponent(teams, index)
+                invitations.append(MatchInvitation(
+                    from_team=team, to_team=opponent, location=self.rng.choice(GROUNDS),
+                    date_time=now + timedelta(days=self.rng.randrange(1, 60), hours=number)))
+        return MatchInvitation.objects.bulk_create(invitations, batch_size=self.batch_size)
@@ -0,0 +1,13 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sidelines_django_app.models import ThrottleCounter
+
+
+class Command(BaseCommand):
+    help = 'Deletes throttle counters whose windows have fully expired.'
+
+    def handle(self, *args, **options):
+        deleted, _ = ThrottleCounter.objects.filter(expires_at__lt=int(time.time())).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired throttle counters.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from sidelines_django_app.search import ProfileSearchIndex
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the profile search index from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        indexed = ProfileSearchIndex.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} profiles.'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from sidelines_django_app.models import FriendRequest, MatchInvitation, TeamInvitation
+
+
+class Command(BaseCommand):
+    help = ("Recounts every profile's and team's pending invitation counters from the invitations and repairs the "
+            "ones that drifted.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        repaired = 0
+        for model in (FriendRequest, TeamInvitation, MatchInvitation):
+            recipients = model.recipient_model()
+            _, counter = model.pending_counter
+            last_pk = 0
+            while True:
+                pks = list(recipients.objects.filter(pk__gt=last_pk).order_by('pk')
+                           .values_list('pk', flat=True)[:options['batch_size']])
+                if not pks:
+                    break
+                last_pk = pks[-1]
+
+                with transaction.atomic():
+                    drifted = list(recipients.objects.filter(pk__in=pks).alias(counted=model.pending_count())
+                                   .exclude(**{counter: F('counted')}).values_list('pk', flat=True))
+                    if drifted:
+                        model.refresh_pending(drifted)
+                repaired += len(drifted)
+
+        self.stdout.write(self.style.SUCCESS(f'Repaired {repaired} pending invitation counters.'))
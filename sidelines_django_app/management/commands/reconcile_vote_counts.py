@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+
+from sidelines_django_app.caching import VersionedResponseCache
+from sidelines_django_app.models import Match
+
+
+class Command(BaseCommand):
+    help = "Recounts every match's vote counters from its votes and repairs the ones that drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        counted = {f'counted_{counter}': count for counter, count in Match.vote_counts().items()}
+        in_sync = Q(*(Q(**{counter: F(f'counted_{counter}')}) for counter in Match.VOTE_COUNTERS))
+
+        checked = repaired = 0
+        last_pk = 0
+        while True:
+            pks = list(Match.objects.filter(pk__gt=last_pk).order_by('pk')
+                       .values_list('pk', flat=True)[:options['batch_size']])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            checked += len(pks)
+
+            with transaction.atomic():
+                drifted = list(Match.objects.filter(pk__in=pks).alias(**counted).exclude(in_sync)
+                               .values_list('pk', flat=True))
+                if drifted:
+                    Match.refresh_vote_counts(drifted)
+                    VersionedResponseCache.default().bump('match', *(f'match:{pk}' for pk in drifted))
+            repaired += len(drifted)
+
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} matches and repaired {repaired} vote counters.'))
@@ -0,0 +1,81 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:46
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# A frozen copy of ProfileSearchIndex.build_entries as of this migration, so later changes to the index do not
+# change what this migration writes; `rebuild_search_index` brings the entries up to date with the current code.
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 20
+FIELD_WEIGHTS = {'username': 3, 'first_name': 2, 'last_name': 2}
+TOKEN, PREFIX, TRIGRAM = 't', 'p', 'g'
+KIND_WEIGHTS = {TOKEN: 3, PREFIX: 2, TRIGRAM: 1}
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+    return re.findall(r'[^\W_]+', text)
+
+
+def build_entries(user):
+    weights = {}
+
+    def add(kind, term, field_weight):
+        key = (kind, term)
+        weights[key] = max(weights.get(key, 0), field_weight * KIND_WEIGHTS[kind])
+
+    for field, field_weight in FIELD_WEIGHTS.items():
+        tokens = normalize(getattr(user, field))
+        if field == 'username' and len(tokens) > 1:
+            tokens.append(''.join(tokens))
+        for token in tokens:
+            token = token[:MAX_TERM_LENGTH]
+            if len(token) < MIN_TERM_LENGTH:
+                continue
+            add(TOKEN, token, field_weight)
+            for end in range(MIN_TERM_LENGTH, len(token) + 1):
+                add(PREFIX, token[:end], field_weight)
+            for start in range(len(token) - 2):
+                add(TRIGRAM, token[start:start + 3], field_weight)
+    return weights
+
+
+def build_search_index(apps, schema_editor):
+    Profile = apps.get_model('sidelines_django_app', 'Profile')
+    ProfileSearchEntry = apps.get_model('sidelines_django_app', 'ProfileSearchEntry')
+    entries = []
+    for profile in Profile.objects.select_related('user').iterator(chunk_size=1000):
+        entries.extend(
+            ProfileSearchEntry(profile_id=profile.pk, kind=kind, term=term, weight=weight)
+            for (kind, term), weight in build_entries(profile.user).items()
+        )
+    ProfileSearchEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sidelines_django_app', '0002_profile_profile_picture'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileSearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('t', 'Token'), ('p', 'Prefix'), ('g', 'Trigram')], max_length=1)),
+                ('term', models.CharField(max_length=20)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='sidelines_django_app.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'term', 'weight', 'profile'], name='profile_search_lookup_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sidelines_django_app', '0004_user_email_lower_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('bucket', models.BigIntegerField()),
+                ('current_count', models.PositiveIntegerField(default=0)),
+                ('previous_count', models.PositiveIntegerField(default=0)),
+                ('expires_at', models.BigIntegerField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:41
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_rosters(apps, schema_editor):
+    Team = apps.get_model('sidelines_django_app', 'Team')
+
+    def count(through):
+        return Coalesce(Subquery(
+            through.objects.filter(team_id=OuterRef('pk')).order_by().values('team_id')
+            .annotate(count=Count('pk')).values('count')
+        ), Value(0))
+
+    Team.objects.update(member_count=count(Team.members.through), admin_count=count(Team.admins.through))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sidelines_django_app', '0006_versioned_resources'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='admin_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_rosters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.comparison
+
+
+def check_conflicting_invitations(apps, schema_editor):
+    """
+    Refuses to migrate while self-invitations or duplicates would violate the new constraints, listing their ids.
+    Nothing is deleted here: which of the duplicates to keep is the operator's call, made before migrating.
+    """
+    problems = []
+    for model_name, from_field, to_field, unordered, extra_fields in (
+        ('FriendRequest', 'from_profile_id', 'to_profile_id', True, ()),
+        ('TeamInvitation', 'from_profile_id', 'to_profile_id', True, ()),
+        ('MatchInvitation', 'from_team_id', 'to_team_id', False, ('date_time',)),
+    ):
+        model = apps.get_model('sidelines_django_app', model_name)
+        seen = set()
+        conflicting = []
+        for pk, from_id, to_id, *extra in model.objects.order_by('pk').values_list('pk', from_field, to_field,
+                                                                                   *extra_fields):
+            key = (min(from_id, to_id), max(from_id, to_id)) if unordered else (from_id, to_id)
+            key = (*key, *extra)
+            if from_id == to_id or key in seen:
+                conflicting.append(pk)
+            seen.add(key)
+        if conflicting:
+            problems.append(f'{len(conflicting)} {model._meta.db_table} rows (ids {", ".join(map(str, conflicting))})')
+    if problems:
+        raise RuntimeError(
+            'Cannot add the invitation constraints: these invitations are addressed to their sender or duplicate an '
+            f'older invitation between the same pair: {"; ".join(problems)}. Delete or merge them, then migrate again.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sidelines_django_app', '0007_team_roster_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_conflicting_invitations, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='friendrequest',
+            name='from_profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sent_requests', to='sidelines_django_app.profile'),
+        ),
+        migrations.AlterField(
+            model_name='friendrequest',
+            name='to_profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='received_requests', to='sidelines_django_app.profile'),
+        ),
+        migrations.AlterField(
+            model_name='matchinvitation',
+            name='from_team',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sent_invitations', to='sidelines_django_app.team'),
+        ),
+        migrations.AlterField(
+            model_name='matchinvitation',
+            name='to_team',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='received_invitations', to='sidelines_django_app.team'),
+        ),
+        migrations.AlterField(
+            model_name='teaminvitation',
+            name='from_profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sent_invitations', to='sidelines_django_app.profile'),
+        ),
+        migrations.AlterField(
+            model_name='teaminvitation',
+            name='to_profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='received_invitations', to='sidelines_django_app.profile'),
+        ),
+        migrations.AddIndex(
+            model_name='friendrequest',
+            index=models.Index(fields=['from_profile', 'to_profile'], name='friend_request_from_to_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='friendrequest',
+            index=models.Index(fields=['to_profile', 'from_profile'], name='friend_request_to_from_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchinvitation',
+            index=models.Index(fields=['to_team', 'from_team'], name='match_invitation_to_from_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teaminvitation',
+            index=models.Index(fields=['from_profile', 'to_profile'], name='team_invitation_from_to_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teaminvitation',
+            index=models.Index(fields=['to_profile', 'from_profile'], name='team_invitation_to_from_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='friendrequest',
+            constraint=models.CheckConstraint(check=models.Q(('from_profile', models.F('to_profile')), _negated=True), name='friend_request_not_self'),
+        ),
+        migrations.AddConstraint(
+            model_name='friendrequest',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Least('from_profile', 'to_profile'), django.db.models.functions.comparison.Greatest('from_profile', 'to_profile'), name='friend_request_unique_pair'),
+        ),
+        migrations.AddConstraint(
+            model_name='matchinvitation',
+            constraint=models.CheckConstraint(check=models.Q(('from_team', models.F('to_team')), _negated=True), name='match_invitation_not_self'),
+        ),
+        migrations.AddConstraint(
+            model_name='matchinvitation',
+            constraint=models.UniqueConstraint(fields=('from_team', 'to_team', 'date_time'), name='match_invitation_unique_fixture'),
+        ),
+        migrations.AddConstraint(
+            model_name='teaminvitation',
+            constraint=models.CheckConstraint(check=models.Q(('from_profile', models.F('to_profile')), _negated=True), name='team_invitation_not_self'),
+        ),
+        migrations.AddConstraint(
+            model_name='teaminvitation',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Least('from_profile', 'to_profile'), django.db.models.functions.comparison.Greatest('from_profile', 'to_profile'), name='team_invitation_unique_pair'),
+        ),
+    ]
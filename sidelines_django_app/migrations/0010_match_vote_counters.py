@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:15
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_votes(apps, schema_editor):
+    Match = apps.get_model('sidelines_django_app', 'Match')
+    MatchVote = apps.get_model('sidelines_django_app', 'MatchVote')
+
+    def count(response):
+        return Coalesce(Subquery(
+            MatchVote.objects.filter(match_id=OuterRef('pk'), response=response).order_by().values('match_id')
+            .annotate(count=Count('pk')).values('count')
+        ), Value(0))
+
+    Match.objects.update(accepted_votes=count('accepted'), rejected_votes=count('rejected'),
+                         maybe_votes=count('maybe'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sidelines_django_app', '0009_match_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='accepted_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='maybe_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='rejected_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_votes, migrations.RunPython.noop),
+    ]
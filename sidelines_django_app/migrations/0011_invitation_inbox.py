@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sidelines_django_app', '0010_match_vote_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchinvitation',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='friendrequest',
+            index=models.Index(fields=['to_profile', 'created_at'], name='friend_request_to_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchinvitation',
+            index=models.Index(fields=['to_team', 'created_at'], name='match_invitation_to_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teaminvitation',
+            index=models.Index(fields=['to_profile', 'created_at'], name='team_invitation_to_time_idx'),
+        ),
+    ]
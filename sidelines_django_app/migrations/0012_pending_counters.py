@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_pending(apps, schema_editor):
+    Profile = apps.get_model('sidelines_django_app', 'Profile')
+    Team = apps.get_model('sidelines_django_app', 'Team')
+
+    def count(model_name, field):
+        model = apps.get_model('sidelines_django_app', model_name)
+        return Coalesce(Subquery(
+            model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field)
+            .annotate(count=Count('pk')).values('count')
+        ), Value(0))
+
+    Profile.objects.update(pending_friend_requests=count('FriendRequest', 'to_profile'),
+                           pending_team_invitations=count('TeamInvitation', 'to_profile'))
+    Team.objects.update(pending_match_invitations=count('MatchInvitation', 'to_team'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sidelines_django_app', '0011_invitation_inbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='pending_friend_requests',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='pending_team_invitations',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='pending_match_invitations',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_pending, migrations.RunPython.noop),
+    ]
@@ -1,17 +1,62 @@
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Least
+from django.db.models.signals import m2m_changed
 
-from sidelines_django_app.models import Profile
+from sidelines_django_app.models import Invitation, Profile
 
 
-class FriendRequest(models.Model):
-    from_profile = models.ForeignKey(Profile, related_name='sent_requests', on_delete=models.CASCADE)
-    to_profile = models.ForeignKey(Profile, related_name='received_requests', on_delete=models.CASCADE)
+class FriendRequest(Invitation):
+    from_profile = models.ForeignKey(Profile, related_name='sent_requests', on_delete=models.CASCADE,
+                                     db_index=False)
+    to_profile = models.ForeignKey(Profile, related_name='received_requests', on_delete=models.CASCADE,
+                                   db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def accept(self):
-        self.from_profile.friends.add(self.to_profile)
-        self.to_profile.friends.add(self.from_profile)
-        self.delete()
+    pending_counter = ('to_profile', 'pending_friend_requests')
 
-    def ignore(self):
-        self.delete()
+    class Meta:
+        constraints = [
+            models.CheckConstraint(check=~Q(from_profile=F('to_profile')), name='friend_request_not_self'),
+            # At most one pending request between two profiles, whichever of them sent it.
+            models.UniqueConstraint(Least('from_profile', 'to_profile'), Greatest('from_profile', 'to_profile'),
+                                    name='friend_request_unique_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['from_profile', 'to_profile'], name='friend_request_from_to_idx'),
+            models.Index(fields=['to_profile', 'from_profile'], name='friend_request_to_from_idx'),
+            models.Index(fields=['to_profile', 'created_at'], name='friend_request_to_time_idx'),
+        ]
+
+    @classmethod
+    def send(cls, from_profile, to_profile):
+        """Creates a request with a single insert unless the two are already friends, in which case returns None."""
+        friendship = Profile.friends.through.objects.filter(from_profile_id=from_profile.pk,
+                                                            to_profile_id=to_profile.pk)
+        return cls.insert({'from_profile': from_profile, 'to_profile': to_profile}, exclude=[friendship])
+
+    @classmethod
+    def apply_accepted(cls, requests):
+        """
+        Creates the friendships with one idempotent insert. Side effects that signals would normally trigger are
+        sent once per recipient instead of once per row.
+        """
+        through = Profile.friends.through
+        through.objects.bulk_create([
+            through(from_profile_id=from_id, to_profile_id=to_id)
+            for request in requests
+            for from_id, to_id in ((request.from_profile_id, request.to_profile_id),
+                                   (request.to_profile_id, request.from_profile_id))
+        ], ignore_conflicts=True)
+
+        senders_by_recipient = {}
+        for request in requests:
+            senders_by_recipient.setdefault(request.to_profile, set()).add(request.from_profile_id)
+        for recipient, sender_ids in senders_by_recipient.items():
+            m2m_changed.send(sender=through, instance=recipient, action='post_add', reverse=False, model=Profile,
+                             pk_set=sender_ids, using=cls.objects.db)
+
+    @classmethod
+    def apply_ignored(cls, requests):
+        Profile.touch({profile_id for request in requests
+                       for profile_id in (request.from_profile_id, request.to_profile_id)})
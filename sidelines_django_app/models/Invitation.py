@@ -0,0 +1,195 @@
+from collections import Counter
+
+from django.db import connections, models, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save
+
+
+class Invitation(models.Model):
+    """
+    Base for friend requests and team and match invitations, which are answered at most once.
+
+    Answering first claims the rows with a conditional DELETE ... RETURNING, and only the rows that statement
+    returned are applied, in the same transaction. Concurrent answers to the same invitation (a double tap, or a
+    single answer racing a batch) therefore produce exactly one effect, and an invitation is never consumed without
+    its effect or the other way round. Subclasses implement `apply_accepted` and may implement `apply_ignored`.
+    Claimed rows still send post_delete, with a `Claim` as the origin, so receivers see answers as well as
+    withdrawals and can tell them apart.
+
+    Sending is a single conditional insert (see `insert`); duplicates and self-invitations are rejected by the
+    subclasses' database constraints, which callers map back to messages with `violated_constraint`.
+
+    Every recipient keeps a count of the invitations of each type waiting for it (`pending_counter`), moved in the
+    same transaction as the insert, claim or withdrawal that changes it (see `count_pending`). Like the roster
+    counters, the counts are never written back from a loaded instance, and `refresh_pending` recounts them.
+    """
+    # (recipient field, counter on the recipient's model) counting the invitations waiting for each recipient.
+    pending_counter = None
+
+    class Claim:
+        """
+        Origin of the post_delete signals sent for answered invitations: the model and every invitation removed by
+        the same claim. The claim has already moved the recipients' pending counters for all of them, and the
+        answer's bulk side effects follow in `apply_accepted` or `apply_ignored`.
+        """
+        def __init__(self, model, invitations):
+            self.model = model
+            self.invitations = invitations
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def insert(cls, values, require=(), exclude=()):
+        """
+        Creates an invitation with one INSERT ... SELECT ... RETURNING statement and returns it. The row is only
+        inserted if every queryset in `require` has rows and none in `exclude` does; otherwise returns None.
+        Constraint violations raise IntegrityError from a savepoint, so the surrounding transaction stays usable.
+        """
+        invitation = cls(**values)
+        alias = router.db_for_write(cls)
+        connection = connections[alias]
+        quote = connection.ops.quote_name
+
+        fields = [field for field in cls._meta.concrete_fields if not field.primary_key]
+        params = [field.get_db_prep_save(field.pre_save(invitation, True), connection) for field in fields]
+        if connection.vendor == 'sqlite':
+            placeholders = ['%s'] * len(fields)
+        else:
+            # Parameters in a SELECT list have no type to infer from the target columns.
+            placeholders = [f'CAST(%s AS {field.db_type(connection)})' for field in fields]
+
+        conditions = []
+        for querysets, operator in ((require, 'EXISTS'), (exclude, 'NOT EXISTS')):
+            for queryset in querysets:
+                subquery, subquery_params = queryset.values('pk').query.sql_with_params()
+                conditions.append(f'{operator} ({subquery})')
+                params.extend(subquery_params)
+
+        pk_column = quote(cls._meta.pk.column)
+        sql = (f'INSERT INTO {quote(cls._meta.db_table)} ({", ".join(quote(field.column) for field in fields)}) '
+               f'SELECT {", ".join(placeholders)}'
+               f'{" WHERE " + " AND ".join(conditions) if conditions else ""} RETURNING {pk_column}')
+        with transaction.atomic(using=alias):
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+            if row is None:
+                return None
+
+            invitation.pk = row[0]
+            invitation._state.adding = False
+            invitation._state.db = alias
+            # Inside the transaction, so the recipient's pending counter moves with the insert.
+            post_save.send(sender=cls, instance=invitation, created=True, update_fields=None, raw=False, using=alias)
+        return invitation
+
+    @classmethod
+    def violated_constraint(cls, error):
+        """Returns the name of the model constraint an IntegrityError reports, or None."""
+        message = str(error)
+        for constraint in cls._meta.constraints:
+            if constraint.name in message:
+                return constraint.name
+            # SQLite names the columns rather than the constraint for unique constraints over plain fields.
+            columns = [cls._meta.get_field(name).column for name in getattr(constraint, 'fields', ())]
+            if columns and all(f'{cls._meta.db_table}.{column}' in message for column in columns):
+                return constraint.name
+        return None
+
+    def accept(self):
+        """Returns False if the invitation had already been answered or withdrawn."""
+        return bool(self.accept_many([self]))
+
+    def ignore(self):
+        return bool(self.ignore_many([self]))
+
+    @classmethod
+    def accept_many(cls, invitations):
+        """Accepts the invitations that are still pending and returns them."""
+        with transaction.atomic(using=router.db_for_write(cls)):
+            claimed = cls.claim(invitations)
+            if claimed:
+                cls.apply_accepted(claimed)
+        return claimed
+
+    @classmethod
+    def ignore_many(cls, invitations):
+        """Ignores the invitations that are still pending and returns them."""
+        with transaction.atomic(using=router.db_for_write(cls)):
+            claimed = cls.claim(invitations)
+            if claimed:
+                cls.apply_ignored(claimed)
+        return claimed
+
+    @classmethod
+    def apply_accepted(cls, invitations):
+        raise NotImplementedError
+
+    @classmethod
+    def apply_ignored(cls, invitations):
+        pass
+
+    @classmethod
+    def claim(cls, invitations):
+        """
+        Deletes the given invitations with a single DELETE ... RETURNING and returns the ones this statement removed.
+        The recipients' pending counters are moved here in bulk, then post_delete is sent for every removed row with
+        a `Claim` as its origin; pre_delete is not sent, since which rows are removed is only known afterwards. Must
+        be called inside a transaction.
+        """
+        invitations_by_pk = {invitation.pk: invitation for invitation in invitations}
+        if not invitations_by_pk:
+            return []
+
+        alias = router.db_for_write(cls)
+        connection = connections[alias]
+        quote = connection.ops.quote_name
+        pk_column = quote(cls._meta.pk.column)
+        placeholders = ', '.join(['%s'] * len(invitations_by_pk))
+        sql = (f'DELETE FROM {quote(cls._meta.db_table)} WHERE {pk_column} IN ({placeholders}) '
+               f'RETURNING {pk_column}')
+        with connection.cursor() as cursor:
+            cursor.execute(sql, list(invitations_by_pk))
+            claimed_pks = {pk for pk, in cursor.fetchall()}
+        claimed = [invitation for pk, invitation in invitations_by_pk.items() if pk in claimed_pks]
+        cls.count_pending(claimed, -1)
+        claim = cls.Claim(cls, claimed)
+        for invitation in claimed:
+            post_delete.send(sender=cls, instance=invitation, using=alias, origin=claim)
+        return claimed
+
+    @classmethod
+    def recipient_model(cls):
+        return cls._meta.get_field(cls.pending_counter[0]).related_model
+
+    @classmethod
+    def count_pending(cls, invitations, delta):
+        """
+        Moves each recipient's pending counter by `delta` per invitation, with one UPDATE per distinct amount rather
+        than per recipient. Decrements stop at zero, so rows written around the counters (bulk loads) cannot fail
+        the answer that removes them; `refresh_pending` repairs such drift.
+        """
+        field, counter = cls.pending_counter
+        recipients_by_amount = {}
+        for recipient_id, count in Counter(getattr(invitation, f'{field}_id') for invitation in invitations).items():
+            recipients_by_amount.setdefault(count * delta, []).append(recipient_id)
+        for amount, recipient_ids in recipients_by_amount.items():
+            value = F(counter) + amount if amount > 0 else Greatest(F(counter) + amount, Value(0))
+            cls.recipient_model().objects.filter(pk__in=recipient_ids).update(**{counter: value})
+
+    @classmethod
+    def pending_count(cls):
+        """Expression recounting the outer recipient's pending invitations of this type."""
+        field, _ = cls.pending_counter
+        return Coalesce(Subquery(
+            cls.objects.filter(**{field: OuterRef('pk')}).order_by().values(field)
+            .annotate(count=Count('pk')).values('count')
+        ), Value(0))
+
+    @classmethod
+    def refresh_pending(cls, recipient_ids):
+        """Recounts the given recipients' pending invitations of this type, in one statement."""
+        _, counter = cls.pending_counter
+        cls.recipient_model().objects.filter(pk__in=recipient_ids).update(**{counter: cls.pending_count()})
@@ -1,11 +1,85 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-from sidelines_django_app.models import Team
+from sidelines_django_app.models import Team, VersionedModel
 
 
-class Match(models.Model):
+class MatchQuerySet(models.QuerySet):
+    """
+    Feed filters. Every filter keeps both sides of a fixture on their own (team, date_time) index, so a team's
+    matches in a date range are two index range scans rather than a scan of every match.
+    """
+
+    def for_teams(self, team_ids):
+        return self.filter(Q(home_team_id__in=team_ids) | Q(away_team_id__in=team_ids))
+
+    def for_profile(self, profile_id):
+        """Matches of every team the profile is a member of, resolved in the same query."""
+        return self.for_teams(Team.members.through.objects.filter(profile_id=profile_id).values('team_id'))
+
+    def upcoming(self):
+        return self.filter(date_time__gte=timezone.now())
+
+    def past(self):
+        return self.filter(date_time__lt=timezone.now())
+
+    def for_payload(self):
+        """Everything MatchSerializer reads: the details in one prefetch; the vote counters are columns."""
+        return self.prefetch_related('details')
+
+
+class Match(VersionedModel):
+    """
+    A fixture between two teams. `<response>_votes` count the match's votes per response. Voting moves them with
+    atomic increments (see `MatchVote.cast`) and every other change to the votes recounts them in the database (see
+    `refresh_vote_counts`), so like Team's roster counters they are never written back from a loaded instance.
+    """
+    VOTE_COUNTERS = ('accepted_votes', 'rejected_votes', 'maybe_votes')
+
     date_time = models.DateTimeField()
     location = models.CharField(max_length=255)
-    home_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='home_matches')
-    away_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='away_matches')
+    # Indexed by the composite indexes below, which lead with the team.
+    home_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='home_matches', db_index=False)
+    away_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='away_matches', db_index=False)
     team_size = models.IntegerField(default=7)
+    accepted_votes = models.PositiveIntegerField(default=0)
+    rejected_votes = models.PositiveIntegerField(default=0)
+    maybe_votes = models.PositiveIntegerField(default=0)
+
+    objects = MatchQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['home_team', 'date_time'], name='match_home_team_date_idx'),
+            models.Index(fields=['away_team', 'date_time'], name='match_away_team_date_idx'),
+        ]
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if not self._state.adding and update_fields is None:
+            update_fields = [field.name for field in self._meta.concrete_fields
+                             if not field.primary_key and field.name not in self.VOTE_COUNTERS]
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    @staticmethod
+    def vote_counter(response):
+        return f'{response}_votes'
+
+    @classmethod
+    def vote_counts(cls):
+        """Expressions recounting every vote counter of the outer match from its votes."""
+        from sidelines_django_app.models import MatchVote
+
+        def count(response):
+            return Coalesce(Subquery(
+                MatchVote.objects.filter(match_id=OuterRef('pk'), response=response).order_by().values('match_id')
+                .annotate(count=Count('pk')).values('count')
+            ), Value(0))
+
+        return {cls.vote_counter(response): count(response) for response, _ in MatchVote.RESPONSE_CHOICES}
+
+    @classmethod
+    def refresh_vote_counts(cls, pks):
+        """Recounts the votes of the given matches and marks them as changed, in one statement."""
+        cls.touch(pks, **cls.vote_counts())
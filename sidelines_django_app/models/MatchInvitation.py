@@ -1,24 +1,40 @@
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.signals import post_save
 
-from sidelines_django_app.models import Team, Match
+from sidelines_django_app.models import Invitation, Match, Team
 
 
-class MatchInvitation(models.Model):
-    from_team = models.ForeignKey(Team, related_name='sent_invitations', on_delete=models.CASCADE)
-    to_team = models.ForeignKey(Team, related_name='received_invitations', on_delete=models.CASCADE)
+class MatchInvitation(Invitation):
+    from_team = models.ForeignKey(Team, related_name='sent_invitations', on_delete=models.CASCADE, db_index=False)
+    to_team = models.ForeignKey(Team, related_name='received_invitations', on_delete=models.CASCADE,
+                                db_index=False)
     team_size = models.IntegerField(default=7)
     location = models.CharField(max_length=255)
     date_time = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
 
-    def accept(self):
-        Match.objects.create(
-            home_team=self.from_team,
-            away_team=self.to_team,
-            team_size=self.team_size,
-            location=self.location,
-            date_time=self.date_time
-        )
-        self.delete()
+    pending_counter = ('to_team', 'pending_match_invitations')
 
-    def ignore(self):
-        self.delete()
+    class Meta:
+        constraints = [
+            models.CheckConstraint(check=~Q(from_team=F('to_team')), name='match_invitation_not_self'),
+            models.UniqueConstraint(fields=['from_team', 'to_team', 'date_time'],
+                                    name='match_invitation_unique_fixture'),
+        ]
+        indexes = [
+            models.Index(fields=['to_team', 'from_team'], name='match_invitation_to_from_idx'),
+            models.Index(fields=['to_team', 'created_at'], name='match_invitation_to_time_idx'),
+        ]
+
+    @classmethod
+    def apply_accepted(cls, invitations):
+        """Creates every match with one insert."""
+        matches = Match.objects.bulk_create([
+            Match(home_team_id=invitation.from_team_id, away_team_id=invitation.to_team_id,
+                  team_size=invitation.team_size, location=invitation.location, date_time=invitation.date_time)
+            for invitation in invitations
+        ])
+        for match in matches:
+            post_save.send(sender=Match, instance=match, created=True, update_fields=None, raw=False,
+                           using=cls.objects.db)
@@ -1,9 +1,20 @@
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import F
+from django.dispatch import Signal
 
 from sidelines_django_app.models import Profile, Match
 
+# Sent by MatchVote.cast inside its transaction with `vote` and `previous_response`, the response the vote replaced or
+# None for a first vote. Casting sends no post_save: the counters have already moved with the vote.
+vote_cast = Signal()
+
 
 class MatchVote(models.Model):
+    """
+    A profile's response to a match. Votes are cast with `cast`, which moves the match's vote counters in the same
+    transaction and sends `vote_cast`; plain saves are recounted by a signal, and bulk writes are repaired by
+    `reconcile_vote_counts`.
+    """
     RESPONSE_CHOICES = [
         ('accepted', 'Accepted'),
         ('rejected', 'Rejected'),
@@ -15,3 +26,49 @@ class MatchVote(models.Model):
 
     class Meta:
         unique_together = ('match', 'profile')
+
+    @classmethod
+    def cast(cls, match_id, profile_id, response):
+        """
+        Records the profile's vote on the match, whether or not it has voted before, and moves the match's vote
+        counters by what changed, in one transaction. A first vote is a single INSERT ... ON CONFLICT DO NOTHING; when
+        that insert finds the profile's vote, the vote is locked to read the response it replaces, then updated.
+        Concurrent votes by the same profile queue on the conflicting insert or the lock, so each one sees the
+        response the previous one left and the counters always agree with the votes.
+
+        Returns the vote. Raises Match.DoesNotExist, undoing the vote, if the match is gone.
+        """
+        vote = cls(match_id=match_id, profile_id=profile_id, response=response)
+        alias = router.db_for_write(cls)
+        connection = connections[alias]
+        quote = connection.ops.quote_name
+        match, profile, response_column = (quote(cls._meta.get_field(name).column)
+                                           for name in ('match', 'profile', 'response'))
+        sql = (f'INSERT INTO {quote(cls._meta.db_table)} ({match}, {profile}, {response_column}) VALUES (%s, %s, %s) '
+               f'ON CONFLICT ({match}, {profile}) DO NOTHING RETURNING {quote(cls._meta.pk.column)}')
+
+        with transaction.atomic(using=alias):
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [match_id, profile_id, response])
+                row = cursor.fetchone()
+            if row is not None:
+                vote.pk, previous_response = row[0], None
+            else:
+                votes = cls.objects.using(alias).filter(match_id=match_id, profile_id=profile_id)
+                vote.pk, previous_response = votes.select_for_update().values_list('pk', 'response').get()
+                if previous_response != response:
+                    votes.update(response=response)
+
+            if previous_response != response:
+                counter = Match.vote_counter(response)
+                updates = {counter: F(counter) + 1}
+                if previous_response is not None:
+                    previous_counter = Match.vote_counter(previous_response)
+                    updates[previous_counter] = F(previous_counter) - 1
+                if not Match.touch([match_id], **updates):
+                    raise Match.DoesNotExist('Match matching query does not exist.')
+
+            vote._state.adding = False
+            vote._state.db = alias
+            vote_cast.send(sender=cls, vote=vote, previous_response=previous_response, using=alias)
+        return vote
@@ -2,8 +2,16 @@ from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 
+from sidelines_django_app.models import VersionedModel
+
+
+class Profile(VersionedModel):
+    """
+    A player. The pending counters count the friend requests and team invitations waiting for the profile's answer;
+    they are maintained by the invitation models (see Invitation) and never written back from a loaded instance.
+    """
+    PENDING_COUNTERS = ('pending_friend_requests', 'pending_team_invitations')
 
-class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     overall_rating = models.FloatField(default=0.0)
     positions = models.JSONField(default=list)
@@ -16,6 +24,14 @@ class Profile(models.Model):
     setup_complete = models.BooleanField(default=False)
     date_of_birth = models.DateField(default=None, null=True, blank=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', null=True, blank=True)
+    pending_friend_requests = models.PositiveIntegerField(default=0)
+    pending_team_invitations = models.PositiveIntegerField(default=0)
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if not self._state.adding and update_fields is None:
+            update_fields = [field.name for field in self._meta.concrete_fields
+                             if not field.primary_key and field.name not in self.PENDING_COUNTERS]
+        super().save(*args, update_fields=update_fields, **kwargs)
 
     def unfriend(self, other_profile):
         if self.friends.filter(pk=other_profile.pk).exists():
@@ -0,0 +1,23 @@
+from django.db import models
+
+from sidelines_django_app.models import Profile
+
+
+class ProfileSearchEntry(models.Model):
+    TOKEN = 't'
+    PREFIX = 'p'
+    TRIGRAM = 'g'
+    KIND_CHOICES = [
+        (TOKEN, 'Token'),
+        (PREFIX, 'Prefix'),
+        (TRIGRAM, 'Trigram'),
+    ]
+    profile = models.ForeignKey(Profile, related_name='search_entries', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=1, choices=KIND_CHOICES)
+    term = models.CharField(max_length=20)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'term', 'weight', 'profile'], name='profile_search_lookup_idx'),
+        ]
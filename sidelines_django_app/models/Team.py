@@ -1,22 +1,117 @@
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 
+from sidelines_django_app.models import VersionedModel
+
+
+class Team(VersionedModel):
+    """
+    A team and its roster. `member_count` and `admin_count` are denormalized from the two membership tables and are
+    recomputed in the database whenever a roster changes (see `refresh_rosters`), so they are never written back
+    from a loaded instance. Neither is `pending_match_invitations`, which the match invitations maintain.
+
+    The roster operations below lock the team row before reading the roster, so concurrent operations on the same
+    team run one after another and each decides on the committed state. The lock is taken with a write rather than
+    SELECT ... FOR UPDATE: SQLite has no row locks and ignores FOR UPDATE, and its transactions only ask for the
+    write lock at their first write, so a transaction that read first fails with "database is locked" when another
+    writer got there in between. Writing first makes it wait for the lock instead, up to the database's timeout.
+    """
+    ROSTER_COUNTERS = ('member_count', 'admin_count')
+    PENDING_COUNTERS = ('pending_match_invitations',)
 
-class Team(models.Model):
     team_name = models.CharField(max_length=100)
     overall_rating = models.FloatField(default=0.0)
     members = models.ManyToManyField('Profile', related_name='teams')
     admins = models.ManyToManyField('Profile', related_name='admin_teams')
+    member_count = models.PositiveIntegerField(default=0)
+    admin_count = models.PositiveIntegerField(default=0)
+    pending_match_invitations = models.PositiveIntegerField(default=0)
     created_at = models.DateField(auto_now_add=True)
 
+    def save(self, *args, update_fields=None, **kwargs):
+        if not self._state.adding and update_fields is None:
+            update_fields = [field.name for field in self._meta.concrete_fields
+                             if not field.primary_key
+                             and field.name not in self.ROSTER_COUNTERS + self.PENDING_COUNTERS]
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    @classmethod
+    def refresh_rosters(cls, pks):
+        """Recounts the rosters of the given teams and marks them as changed, in one statement."""
+        def count(through):
+            return Coalesce(Subquery(
+                through.objects.filter(team_id=OuterRef('pk')).order_by().values('team_id')
+                .annotate(count=Count('pk')).values('count')
+            ), Value(0))
+
+        cls.touch(pks, member_count=count(cls.members.through), admin_count=count(cls.admins.through))
+
+    def lock_roster(self, profile):
+        """
+        Locks this team's row with a no-op UPDATE ... RETURNING of its roster counters and returns whether `profile`
+        is a member and whether it is an admin, read after the lock. Must be called inside a transaction.
+        """
+        connection = connections[router.db_for_write(Team)]
+        quote = connection.ops.quote_name
+        member_count, admin_count = (quote(Team._meta.get_field(name).column) for name in self.ROSTER_COUNTERS)
+        with connection.cursor() as cursor:
+            cursor.execute(f'UPDATE {quote(Team._meta.db_table)} SET {member_count} = {member_count} '
+                           f'WHERE {quote(Team._meta.pk.column)} = %s RETURNING {member_count}, {admin_count}',
+                           [self.pk])
+            row = cursor.fetchone()
+        if row is None:
+            raise Team.DoesNotExist
+        self.member_count, self.admin_count = row
+        memberships = Team.members.through.objects.filter(team_id=self.pk, profile_id=profile.pk).values_list(
+            Value('member', output_field=models.CharField()))
+        admin_roles = Team.admins.through.objects.filter(team_id=self.pk, profile_id=profile.pk).values_list(
+            Value('admin', output_field=models.CharField()))
+        roles = {role for role, in memberships.union(admin_roles)}
+        return 'member' in roles, 'admin' in roles
+
+    def add_member(self, member_profile, admin=False):
+        with transaction.atomic():
+            self.members.add(member_profile)
+            if admin:
+                self.admins.add(member_profile)
+
     def promote_member(self, member_profile):
-        self.admins.add(member_profile)
+        """Makes a member an admin. Returns False if they are no longer a member."""
+        with transaction.atomic():
+            is_member, is_admin = self.lock_roster(member_profile)
+            if not is_member:
+                return False
+            if not is_admin:
+                self.admins.add(member_profile)
+            return True
 
     def demote_member(self, member_profile):
-        self.admins.remove(member_profile)
+        """Removes an admin role. Returns False if it is the team's last one."""
+        with transaction.atomic():
+            is_member, is_admin = self.lock_roster(member_profile)
+            if not is_admin:
+                return True
+            if self.admin_count <= 1:
+                return False
+            self.admins.remove(member_profile)
+            return True
 
     def remove_member(self, member_profile):
-        self.members.remove(member_profile)
-        if member_profile in self.admins.all():
-            self.admins.remove(member_profile)
-        if not self.members.exists():
-            self.delete()
+        """
+        Removes a profile from the roster and deletes the team once nobody is left. Returns False if the profile is
+        the last admin of a team that still has other members.
+        """
+        with transaction.atomic():
+            is_member, is_admin = self.lock_roster(member_profile)
+            remaining = self.member_count - is_member
+            if is_admin and self.admin_count <= 1 and remaining > 0:
+                return False
+            if remaining == 0:
+                self.delete()
+                return True
+            if is_member:
+                self.members.remove(member_profile)
+            if is_admin:
+                self.admins.remove(member_profile)
+            return True
@@ -1,17 +1,68 @@
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Least
+from django.db.models.signals import m2m_changed
 
-from sidelines_django_app.models import Profile, Team
+from sidelines_django_app.models import Invitation, Profile, Team
 
 
-class TeamInvitation(models.Model):
-    from_profile = models.ForeignKey(Profile, related_name='sent_invitations', on_delete=models.CASCADE)
-    to_profile = models.ForeignKey(Profile, related_name='received_invitations', on_delete=models.CASCADE)
+class TeamInvitation(Invitation):
+    from_profile = models.ForeignKey(Profile, related_name='sent_invitations', on_delete=models.CASCADE,
+                                     db_index=False)
+    to_profile = models.ForeignKey(Profile, related_name='received_invitations', on_delete=models.CASCADE,
+                                   db_index=False)
     team = models.ForeignKey(Team, related_name='invitations', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def accept(self):
-        self.team.members.add(self.to_profile)
-        self.delete()
+    pending_counter = ('to_profile', 'pending_team_invitations')
 
-    def ignore(self):
-        self.delete()
+    class Meta:
+        constraints = [
+            models.CheckConstraint(check=~Q(from_profile=F('to_profile')), name='team_invitation_not_self'),
+            # At most one pending invitation between two profiles, whichever of them sent it and for whichever team.
+            models.UniqueConstraint(Least('from_profile', 'to_profile'), Greatest('from_profile', 'to_profile'),
+                                    name='team_invitation_unique_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['from_profile', 'to_profile'], name='team_invitation_from_to_idx'),
+            models.Index(fields=['to_profile', 'from_profile'], name='team_invitation_to_from_idx'),
+            models.Index(fields=['to_profile', 'created_at'], name='team_invitation_to_time_idx'),
+        ]
+
+    @classmethod
+    def send(cls, from_profile, to_profile, team):
+        """
+        Creates an invitation with a single insert if the two profiles are friends and the recipient is not in the
+        team yet; otherwise returns None.
+        """
+        friendship = Profile.friends.through.objects.filter(from_profile_id=from_profile.pk,
+                                                            to_profile_id=to_profile.pk)
+        membership = Team.members.through.objects.filter(team_id=team.pk, profile_id=to_profile.pk)
+        return cls.insert({'from_profile': from_profile, 'to_profile': to_profile, 'team': team},
+                          require=[friendship], exclude=[membership])
+
+    @classmethod
+    def apply_accepted(cls, invitations):
+        """
+        Adds every invitee to their team with one idempotent insert. One m2m signal is sent per team or per invitee,
+        whichever there are fewer of, so accepting many invitations to one team or for one profile costs the same
+        as accepting one.
+        """
+        through = Team.members.through
+        through.objects.bulk_create([
+            through(team_id=invitation.team_id, profile_id=invitation.to_profile_id) for invitation in invitations
+        ], ignore_conflicts=True)
+
+        invitees_by_team = {}
+        teams_by_invitee = {}
+        for invitation in invitations:
+            invitees_by_team.setdefault(invitation.team_id, set()).add(invitation.to_profile_id)
+            teams_by_invitee.setdefault(invitation.to_profile_id, set()).add(invitation.team_id)
+        if len(teams_by_invitee) < len(invitees_by_team):
+            for invitee in Profile.objects.filter(pk__in=teams_by_invitee):
+                m2m_changed.send(sender=through, instance=invitee, action='post_add', reverse=True, model=Team,
+                                 pk_set=teams_by_invitee[invitee.pk], using=cls.objects.db)
+        else:
+            for team in Team.objects.filter(pk__in=invitees_by_team):
+                m2m_changed.send(sender=through, instance=team, action='post_add', reverse=False, model=Profile,
+                                 pk_set=invitees_by_team[team.pk], using=cls.objects.db)
@@ -0,0 +1,61 @@
+from django.db import connection, models
+
+
+class ThrottleCounter(models.Model):
+    """
+    Fixed-size sliding-window counter for one throttle key: the request cost spent in the current window `bucket`
+    and in the window before it. Rows are updated in place, so a key costs one row however busy it is.
+    """
+    key = models.CharField(max_length=255, unique=True)
+    bucket = models.BigIntegerField()
+    current_count = models.PositiveIntegerField(default=0)
+    previous_count = models.PositiveIntegerField(default=0)
+    expires_at = models.BigIntegerField(db_index=True)
+
+    @classmethod
+    def hit(cls, key, bucket, cost, expires_at, limit, weight):
+        """
+        Adds `cost` to the key's counter for `bucket`, rolling the window forward when the stored bucket is older,
+        and returns the resulting (current_count, previous_count). Runs as a single atomic upsert.
+
+        The cost is only added while `previous_count * weight + current_count` stays within `limit`; otherwise no row
+        is inserted or changed and None is returned.
+        """
+        quote = connection.ops.quote_name
+        table = quote(cls._meta.db_table)
+        key_column, bucket_column, current_column, previous_column, expires_column = (
+            quote(cls._meta.get_field(name).column)
+            for name in ('key', 'bucket', 'current_count', 'previous_count', 'expires_at')
+        )
+        previous = f'''CASE
+            WHEN {table}.{bucket_column} = excluded.{bucket_column} THEN {table}.{previous_column}
+            WHEN {table}.{bucket_column} = excluded.{bucket_column} - 1 THEN {table}.{current_column}
+            ELSE 0 END'''
+        current = f'''CASE
+            WHEN {table}.{bucket_column} = excluded.{bucket_column}
+            THEN {table}.{current_column} + excluded.{current_column}
+            ELSE excluded.{current_column} END'''
+        # The SELECT's WHERE clause also keeps SQLite from reading ON CONFLICT as a join constraint.
+        sql = f'''
+            INSERT INTO {table} ({key_column}, {bucket_column}, {current_column}, {previous_column}, {expires_column})
+            SELECT %s, %s, %s, 0, %s WHERE %s <= %s
+            ON CONFLICT ({key_column}) DO UPDATE SET
+                {previous_column} = {previous},
+                {current_column} = {current},
+                {bucket_column} = excluded.{bucket_column},
+                {expires_column} = excluded.{expires_column}
+            WHERE {previous} * %s + {current} <= %s
+            RETURNING {current_column}, {previous_column}
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [key, bucket, cost, expires_at, cost, limit, weight, limit])
+            return cursor.fetchone()
+
+    @classmethod
+    def peek(cls, key, bucket):
+        """Returns the key's (current_count, previous_count) as of `bucket` without changing it."""
+        row = cls.objects.filter(key=key).values_list('bucket', 'current_count', 'previous_count').first()
+        if row is None or row[0] < bucket - 1:
+            return 0, 0
+        stored_bucket, current_count, previous_count = row
+        return (current_count, previous_count) if stored_bucket == bucket else (0, current_count)
@@ -0,0 +1,33 @@
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+
+class VersionedModel(models.Model):
+    """
+    Adds `updated_at` and a `version` counter that moves on every save and on every change to related rows that
+    shows up in the model's representation (see `touch`). Together they identify a representation for ETags.
+    """
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if not self._state.adding:
+            # Incremented in the database so concurrent writers never reuse a version; reloaded lazily on access.
+            self.version = F('version') + 1
+            if update_fields is not None:
+                update_fields = {*update_fields, 'version', 'updated_at'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+        if not isinstance(self.version, int):
+            del self.version
+
+    @classmethod
+    def touch(cls, pks, **updates):
+        """
+        Marks rows as changed without loading them, for writes that only touch related tables. Extra `updates` are
+        applied in the same statement. Returns the number of rows changed.
+        """
+        return cls.objects.filter(pk__in=pks).update(version=F('version') + 1, updated_at=timezone.now(), **updates)
@@ -1,8 +1,12 @@
+from .VersionedModel import VersionedModel
 from .Profile import Profile
+from .Invitation import Invitation
 from .FriendRequest import FriendRequest
 from .Team import Team
 from .TeamInvitation import TeamInvitation
 from .Match import Match
 from .MatchDetails import MatchDetails
 from .MatchInvitation import MatchInvitation
-from .MatchVote import MatchVote
+from .MatchVote import MatchVote, vote_cast
+from .ProfileSearchEntry import ProfileSearchEntry
+from .ThrottleCounter import ThrottleCounter
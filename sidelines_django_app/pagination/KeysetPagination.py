@@ -0,0 +1,23 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opaque-cursor pagination over an indexed, unique ordering (the primary key by default), so every page is an
+    index range scan and rows inserted while a client is paging never shift or repeat results.
+
+    The cursor holds the first ordering field's value and steps over rows sharing it by offset. An ordering on a
+    non-unique column must therefore end with the primary key, so rows that tie on it keep one order across pages.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    @classmethod
+    def paginate(cls, request, queryset, serializer_class, ordering=None, **serializer_kwargs):
+        paginator = cls()
+        if ordering is not None:
+            paginator.ordering = ordering
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = serializer_class(page, many=True, **serializer_kwargs)
+        return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1 @@
+from .KeysetPagination import KeysetPagination
@@ -0,0 +1,79 @@
+from django.db.models import CharField, Value
+
+from sidelines_django_app.models import FriendRequest, Profile, Team
+
+
+class RelationshipState:
+    __slots__ = ('is_friend', 'pending_outgoing', 'pending_incoming', 'is_teammate')
+
+    def __init__(self):
+        self.is_friend = False
+        self.pending_outgoing = False
+        self.pending_incoming = False
+        self.is_teammate = False
+
+
+class RelationshipResolver:
+    """
+    Answers friend, pending-invitation and teammate status between a viewer and a set of target profiles.
+
+    Unknown targets are resolved together in a single UNION query and the answers are memoized, so a resolver
+    shared through `for_request` costs at most one query per serialization or validation step.
+    """
+    RELATIONS = {
+        'friend': 'is_friend',
+        'outgoing': 'pending_outgoing',
+        'incoming': 'pending_incoming',
+        'teammate': 'is_teammate',
+    }
+
+    def __init__(self, viewer, invitation_model=FriendRequest):
+        self.viewer = viewer
+        self.invitation_model = invitation_model
+        self.states = {}
+
+    @classmethod
+    def for_request(cls, request, invitation_model=FriendRequest):
+        resolvers = getattr(request, '_relationship_resolvers', None)
+        if resolvers is None:
+            resolvers = request._relationship_resolvers = {}
+        if invitation_model not in resolvers:
+            resolvers[invitation_model] = cls(request.user.profile, invitation_model=invitation_model)
+        return resolvers[invitation_model]
+
+    def prime(self, targets):
+        target_ids = {getattr(target, 'pk', target) for target in targets} - self.states.keys()
+        if not target_ids:
+            return
+        for target_id in target_ids:
+            self.states[target_id] = RelationshipState()
+        for target_id, relation in self._query(target_ids):
+            setattr(self.states[target_id], self.RELATIONS[relation], True)
+
+    def state(self, target):
+        target_id = getattr(target, 'pk', target)
+        self.prime([target_id])
+        return self.states[target_id]
+
+    def _query(self, target_ids):
+        def relation(name):
+            return Value(name, output_field=CharField())
+
+        viewer_id = self.viewer.pk
+        memberships = Team.members.through.objects
+        viewer_teams = memberships.filter(profile_id=viewer_id).values('team_id')
+
+        friends = Profile.friends.through.objects.filter(
+            from_profile_id=viewer_id, to_profile_id__in=target_ids
+        ).annotate(relation=relation('friend')).values_list('to_profile_id', 'relation')
+        outgoing = self.invitation_model.objects.filter(
+            from_profile_id=viewer_id, to_profile_id__in=target_ids
+        ).annotate(relation=relation('outgoing')).values_list('to_profile_id', 'relation')
+        incoming = self.invitation_model.objects.filter(
+            to_profile_id=viewer_id, from_profile_id__in=target_ids
+        ).annotate(relation=relation('incoming')).values_list('from_profile_id', 'relation')
+        teammates = memberships.filter(
+            team_id__in=viewer_teams, profile_id__in=target_ids
+        ).annotate(relation=relation('teammate')).values_list('profile_id', 'relation')
+
+        return friends.union(outgoing, incoming, teammates, all=True)
@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import IntegerField, Value
+
+from sidelines_django_app.models import Team
+
+
+class TeamRoleResolver:
+    """
+    Answers which teams a profile belongs to and administers, from a compact {team_id: role} map.
+
+    A role is a bit set of MEMBER and ADMIN. The map is built with one UNION query over the two membership tables,
+    kept in the shared cache per profile and memoized on the request by `for_request`, so a permission check costs no
+    roster scan and, once the map is cached, no query at all. Membership signals invalidate the affected profiles'
+    maps when the change happens and again when its transaction commits, so a read that raced the change cannot
+    leave a pre-commit map behind.
+    """
+    MEMBER = 1
+    ADMIN = 2
+    KEY_PREFIX = 'team-roles:'
+    DEFAULTS = {
+        'CACHE_ALIAS': 'default',
+        'TIMEOUT': 3600,
+    }
+
+    def __init__(self, profile_id, roles):
+        self.profile_id = profile_id
+        self.roles = roles
+
+    @classmethod
+    def options(cls):
+        return {**cls.DEFAULTS, **getattr(settings, 'TEAM_ROLE_CACHE', {})}
+
+    @classmethod
+    def shared(cls):
+        return caches[cls.options()['CACHE_ALIAS']]
+
+    @classmethod
+    def for_request(cls, request, profile=None):
+        profile_id = getattr(profile, 'pk', profile) if profile is not None else request.user.profile.pk
+        resolvers = getattr(request, '_team_role_resolvers', None)
+        if resolvers is None:
+            resolvers = request._team_role_resolvers = {}
+        if profile_id not in resolvers:
+            resolvers[profile_id] = cls.for_profile(profile_id)
+        return resolvers[profile_id]
+
+    @classmethod
+    def for_profile(cls, profile):
+        profile_id = getattr(profile, 'pk', profile)
+        key = cls.KEY_PREFIX + str(profile_id)
+        roles = cls.shared().get(key)
+        if roles is None:
+            roles = cls._query(profile_id)
+            cls.shared().set(key, roles, cls.options()['TIMEOUT'])
+        return cls(profile_id, roles)
+
+    @classmethod
+    def invalidate(cls, *profile_ids):
+        keys = [cls.KEY_PREFIX + str(profile_id) for profile_id in profile_ids]
+        if not keys:
+            return
+        cls.shared().delete_many(keys)
+        transaction.on_commit(lambda: cls.shared().delete_many(keys))
+
+    def team_ids(self):
+        """Ids of the teams the profile is a member of."""
+        return [team_id for team_id, role in self.roles.items() if role & self.MEMBER]
+
+    def admin_team_ids(self):
+        """Ids of the teams the profile is an admin of."""
+        return [team_id for team_id, role in self.roles.items() if role & self.ADMIN]
+
+    def role(self, team):
+        return self.roles.get(getattr(team, 'pk', team), 0)
+
+    def is_member(self, team):
+        return bool(self.role(team) & self.MEMBER)
+
+    def is_admin(self, team):
+        return bool(self.role(team) & self.ADMIN)
+
+    @classmethod
+    def _query(cls, profile_id):
+        memberships = Team.members.through.objects.filter(profile_id=profile_id).annotate(
+            role=Value(cls.MEMBER, output_field=IntegerField())
+        ).values_list('team_id', 'role')
+        admin_roles = Team.admins.through.objects.filter(profile_id=profile_id).annotate(
+            role=Value(cls.ADMIN, output_field=IntegerField())
+        ).values_list('team_id', 'role')
+
+        roles = {}
+        for team_id, role in memberships.union(admin_roles, all=True):
+            roles[team_id] = roles.get(team_id, 0) | role
+        return roles
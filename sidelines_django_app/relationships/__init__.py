@@ -0,0 +1,2 @@
+from .RelationshipResolver import RelationshipResolver, RelationshipState
+from .TeamRoleResolver import TeamRoleResolver
@@ -0,0 +1,210 @@
+import base64
+import binascii
+import json
+import math
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Case, Count, Exists, F, IntegerField, OuterRef, Q, Sum, Value, When
+
+from sidelines_django_app.models import Profile, ProfileSearchEntry
+
+
+class ProfileSearchIndex:
+    """
+    Maintains normalized token, prefix and trigram entries for every profile and answers ranked searches
+    against them, so a lookup only touches index rows for the query terms instead of scanning auth_user.
+    """
+    MIN_TERM_LENGTH = 2
+    MAX_TERM_LENGTH = 20
+    MAX_QUERY_TOKENS = 5
+    TRIGRAM_SIMILARITY = 0.6
+    MAX_CANDIDATES = 1000
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 50
+
+    FIELD_WEIGHTS = {'username': 3, 'first_name': 2, 'last_name': 2}
+    KIND_WEIGHTS = {ProfileSearchEntry.TOKEN: 3, ProfileSearchEntry.PREFIX: 2, ProfileSearchEntry.TRIGRAM: 1}
+    FRIEND_BONUS = 20
+    FRIEND_OF_FRIEND_BONUS = 5
+
+    @staticmethod
+    def normalize(text):
+        text = unicodedata.normalize('NFKD', text or '')
+        text = ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+        return re.findall(r'[^\W_]+', text)
+
+    @staticmethod
+    def trigrams(token):
+        return [token[start:start + 3] for start in range(len(token) - 2)]
+
+    @classmethod
+    def build_entries(cls, profile, user=None):
+        user = user or profile.user
+        weights = {}
+
+        def add(kind, term, field_weight):
+            key = (kind, term)
+            weights[key] = max(weights.get(key, 0), field_weight * cls.KIND_WEIGHTS[kind])
+
+        for field, field_weight in cls.FIELD_WEIGHTS.items():
+            tokens = cls.normalize(getattr(user, field))
+            if field == 'username' and len(tokens) > 1:
+                tokens.append(''.join(tokens))
+            for token in tokens:
+                token = token[:cls.MAX_TERM_LENGTH]
+                if len(token) < cls.MIN_TERM_LENGTH:
+                    continue
+                add(ProfileSearchEntry.TOKEN, token, field_weight)
+                for end in range(cls.MIN_TERM_LENGTH, len(token) + 1):
+                    add(ProfileSearchEntry.PREFIX, token[:end], field_weight)
+                for trigram in cls.trigrams(token):
+                    add(ProfileSearchEntry.TRIGRAM, trigram, field_weight)
+
+        return [
+            ProfileSearchEntry(profile_id=profile.pk, kind=kind, term=term, weight=weight)
+            for (kind, term), weight in weights.items()
+        ]
+
+    @classmethod
+    def reindex(cls, profile, user=None):
+        with transaction.atomic():
+            ProfileSearchEntry.objects.filter(profile=profile).delete()
+            ProfileSearchEntry.objects.bulk_create(cls.build_entries(profile, user=user))
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        ProfileSearchEntry.objects.all().delete()
+        entries = []
+        indexed = 0
+        for profile in Profile.objects.select_related('user').iterator(chunk_size=batch_size):
+            entries.extend(cls.build_entries(profile))
+            indexed += 1
+            if len(entries) >= batch_size:
+                ProfileSearchEntry.objects.bulk_create(entries, batch_size=batch_size)
+                entries = []
+        ProfileSearchEntry.objects.bulk_create(entries, batch_size=batch_size)
+        return indexed
+
+    @staticmethod
+    def encode_cursor(fallback, rank, profile_id):
+        payload = json.dumps([int(fallback), rank, profile_id]).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            fallback, rank, profile_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return bool(fallback), int(rank), int(profile_id)
+        except (binascii.Error, ValueError, TypeError):
+            raise ValueError('Invalid cursor.')
+
+    @classmethod
+    def clamp_limit(cls, limit):
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            return cls.DEFAULT_LIMIT
+        return max(1, min(limit, cls.MAX_LIMIT))
+
+    @classmethod
+    def search(cls, viewer, query, cursor=None, limit=None):
+        """
+        Returns a page of profiles matching `query` ordered by relevance and friend proximity to `viewer`, the
+        cursor of the next page (None on the last page), and whether the results were truncated.
+
+        Profiles are matched on token prefixes; trigram (substring) matching is only used as a fallback when no
+        profile matches every token. Either way the ranking runs over at most MAX_CANDIDATES index hits of the
+        most selective token plus the viewer's friends, so the cost of a query does not grow with the table.
+        Profiles beyond that window are never ranked, so every page reports truncation when the token has more hits
+        than the window holds: the last page then means the client should refine the query, not that it has seen
+        every match.
+        """
+        limit = cls.clamp_limit(limit)
+        tokens = [token[:cls.MAX_TERM_LENGTH] for token in cls.normalize(query)
+                  if len(token) >= cls.MIN_TERM_LENGTH]
+        tokens = list(dict.fromkeys(tokens))[:cls.MAX_QUERY_TOKENS]
+        if not tokens:
+            return [], None, False
+
+        fallback = False
+        if cursor:
+            fallback, rank, profile_id = cls.decode_cursor(cursor)
+            after = Q(rank__lt=rank) | Q(rank=rank, profile_id__gt=profile_id)
+        else:
+            after = Q()
+
+        if not fallback:
+            driver = (ProfileSearchEntry.PREFIX, max(tokens, key=len))
+            page = cls._rank(viewer, cls._prefix_matches(viewer, tokens, driver), after, limit)
+            if page or cursor:
+                return cls._page(page, limit, fallback=False, driver=driver)
+            after = Q()
+
+        trigrams = cls.trigrams(max(tokens, key=len))
+        if not trigrams:
+            return [], None, False
+        driver = (ProfileSearchEntry.TRIGRAM, trigrams[len(trigrams) // 2])
+        return cls._page(cls._rank(viewer, cls._trigram_matches(viewer, tokens, driver), after, limit), limit,
+                         fallback=True, driver=driver)
+
+    @classmethod
+    def _index_hits(cls, driver):
+        kind, term = driver
+        return ProfileSearchEntry.objects.filter(kind=kind, term=term)
+
+    @classmethod
+    def _candidates(cls, viewer, driver):
+        index_hits = cls._index_hits(driver).order_by('-weight', '-profile_id')
+        friends = Profile.friends.through.objects.filter(from_profile_id=viewer.pk).values('to_profile_id')
+        return Q(profile_id__in=index_hits.values('profile_id')[:cls.MAX_CANDIDATES]) | Q(profile_id__in=friends)
+
+    @classmethod
+    def _prefix_matches(cls, viewer, tokens, driver):
+        return ProfileSearchEntry.objects.filter(
+            cls._candidates(viewer, driver),
+            kind__in=[ProfileSearchEntry.TOKEN, ProfileSearchEntry.PREFIX], term__in=tokens,
+        ).exclude(profile_id=viewer.pk).values('profile_id').annotate(
+            hits=Count('term', distinct=True),
+            score=Sum('weight'),
+        ).filter(hits=len(tokens))
+
+    @classmethod
+    def _trigram_matches(cls, viewer, tokens, driver):
+        trigrams = {trigram for token in tokens for trigram in cls.trigrams(token)}
+        return ProfileSearchEntry.objects.filter(
+            cls._candidates(viewer, driver),
+            kind=ProfileSearchEntry.TRIGRAM, term__in=trigrams,
+        ).exclude(profile_id=viewer.pk).values('profile_id').annotate(
+            hits=Count('term', distinct=True),
+            score=Sum('weight'),
+        ).filter(hits__gte=math.ceil(len(trigrams) * cls.TRIGRAM_SIMILARITY))
+
+    @classmethod
+    def _rank(cls, viewer, matches, after, limit):
+        friendships = Profile.friends.through.objects
+        viewer_friends = friendships.filter(from_profile_id=viewer.pk).values('to_profile_id')
+        is_friend = Exists(friendships.filter(from_profile_id=viewer.pk, to_profile_id=OuterRef('profile_id')))
+        is_friend_of_friend = Exists(friendships.filter(from_profile_id__in=viewer_friends,
+                                                        to_profile_id=OuterRef('profile_id')))
+        matches = matches.annotate(rank=F('score') + Case(
+            When(is_friend, then=Value(cls.FRIEND_BONUS)),
+            When(is_friend_of_friend, then=Value(cls.FRIEND_OF_FRIEND_BONUS)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )).filter(after)
+        return list(matches.order_by('-rank', 'profile_id').values_list('profile_id', 'rank')[:limit + 1])
+
+    @classmethod
+    def _page(cls, page, limit, fallback, driver):
+        next_cursor = None
+        if len(page) > limit:
+            profile_id, rank = page[limit - 1]
+            next_cursor = cls.encode_cursor(fallback, rank, profile_id)
+        page = page[:limit]
+        truncated = cls._index_hits(driver)[cls.MAX_CANDIDATES:].exists()
+
+        profiles = Profile.objects.select_related('user').in_bulk([profile_id for profile_id, _ in page])
+        return [profiles[profile_id] for profile_id, _ in page if profile_id in profiles], next_cursor, truncated
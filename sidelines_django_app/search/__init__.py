@@ -0,0 +1 @@
+from .ProfileSearchIndex import ProfileSearchIndex
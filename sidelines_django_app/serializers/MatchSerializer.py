@@ -1,9 +1,18 @@
 from rest_framework import serializers
 
-from sidelines_django_app.models import Match
+from sidelines_django_app.models import Match, MatchVote
+from sidelines_django_app.serializers.MatchDetailsSerializer import MatchDetailsSerializer
 
 
 class MatchSerializer(serializers.ModelSerializer):
+    """Expects matches loaded with `Match.objects.for_payload()`, which provides the details and vote counts."""
+    details = MatchDetailsSerializer(many=True, read_only=True)
+    vote_counts = serializers.SerializerMethodField()
+
     class Meta:
         model = Match
-        fields = ('id', 'date_time', 'location', 'home_team', 'away_team', 'details',)
+        fields = ('id', 'date_time', 'location', 'home_team', 'away_team', 'details', 'vote_counts',)
+
+    @staticmethod
+    def get_vote_counts(match):
+        return {response: getattr(match, f'{response}_votes') for response, _ in MatchVote.RESPONSE_CHOICES}
@@ -1,12 +1,14 @@
 from rest_framework import serializers
-from sidelines_django_app.models import Profile, Team
+from sidelines_django_app.models import Team
 
 
 class TeamSerializer(serializers.ModelSerializer):
-    members = serializers.PrimaryKeyRelatedField(many=True, queryset=Profile.objects.all(), required=False)
-    admins = serializers.PrimaryKeyRelatedField(many=True, queryset=Profile.objects.all(), required=False)
+    # Rosters change only through Team's roster operations, which lock the roster, keep an admin and move the counters.
+    members = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    admins = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
 
     class Meta:
         model = Team
-        fields = ['id', 'team_name', 'overall_rating', 'members', 'admins', 'created_at',]
-        read_only_fields = ['overall_rating', 'created_at',]
+        fields = ['id', 'team_name', 'overall_rating', 'members', 'admins', 'member_count', 'admin_count',
+                  'created_at',]
+        read_only_fields = ['overall_rating', 'member_count', 'admin_count', 'created_at',]
@@ -3,12 +3,14 @@ from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from django.contrib.auth.password_validation import validate_password
 
+from sidelines_django_app.authentication import PasswordHasherPool
 from sidelines_django_app.models import Profile
 from sidelines_django_app.serializers.profile import ProfileSerializer
 
 
 class UserSerializer(serializers.ModelSerializer):
-    email = serializers.EmailField(required=True, validators=[UniqueValidator(queryset=User.objects.all())])
+    email = serializers.EmailField(required=True,
+                                   validators=[UniqueValidator(queryset=User.objects.all(), lookup='iexact')])
     password = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
     profile = ProfileSerializer(required=False)
 
@@ -21,14 +23,14 @@ class UserSerializer(serializers.ModelSerializer):
             email=validated_data['email'],
             username=validated_data['email']
         )
-        user.set_password(validated_data['password'])
+        PasswordHasherPool.default().set_password(user, validated_data['password'])
         user.save()
         Profile.objects.create(user=user)
         return user
 
     def update(self, instance, validated_data):
         if 'password' in validated_data:
-            instance.set_password(validated_data['password'])
+            PasswordHasherPool.default().set_password(instance, validated_data.pop('password'))
         return super().update(instance, validated_data)
 
     class Meta:
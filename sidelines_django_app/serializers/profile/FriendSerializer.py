@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
-from sidelines_django_app.models import Profile, Team
+from sidelines_django_app.models import Profile
+from sidelines_django_app.relationships import RelationshipResolver
+from sidelines_django_app.serializers.profile.RelationshipListSerializer import RelationshipListSerializer
 
 
 class FriendSerializer(serializers.ModelSerializer):
@@ -14,6 +16,7 @@ class FriendSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Profile
+        list_serializer_class = RelationshipListSerializer
         fields = (
             'id', 'username', 'first_name', 'last_name', 'profile_picture', 'positions', 'is_teammate'
         )
@@ -25,13 +28,7 @@ class FriendSerializer(serializers.ModelSerializer):
         return None
 
     def get_is_teammate(self, obj):
-        user = self.context.get('request').user
-        user_teams = Team.objects.filter(members=user.profile)
-        friend_teams = Team.objects.filter(members=obj)
-
-        common_teams = user_teams & friend_teams
-
-        return common_teams.exists()
+        return RelationshipResolver.for_request(self.context.get('request')).state(obj).is_teammate
 
     def get_fields(self):
         fields = super().get_fields()
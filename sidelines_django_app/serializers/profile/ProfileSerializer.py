@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
-from sidelines_django_app.models import Profile, FriendRequest
+from sidelines_django_app.models import Profile
+from sidelines_django_app.relationships import RelationshipResolver
+from sidelines_django_app.serializers.profile.RelationshipListSerializer import RelationshipListSerializer
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -14,6 +16,7 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Profile
+        list_serializer_class = RelationshipListSerializer
         fields = (
         'first_name', 'last_name', 'username', 'profile_picture', 'overall_rating', 'positions', 'kit_number', 'goals',
         'assists', 'mvp', 'date_of_birth', 'join_date', 'is_friends',
@@ -26,10 +29,10 @@ class ProfileSerializer(serializers.ModelSerializer):
         return None
 
     def get_is_friends(self, obj):
-        request = self.context.get('request')
-        if obj in request.user.profile.friends.all():
+        state = RelationshipResolver.for_request(self.context.get('request')).state(obj)
+        if state.is_friend:
             return 'connected'
-        elif FriendRequest.objects.filter(from_profile=request.user.profile, to_profile=obj).exists():
+        elif state.pending_outgoing:
             return 'pending'
         return 'not connected'
 
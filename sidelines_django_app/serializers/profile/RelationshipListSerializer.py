@@ -0,0 +1,15 @@
+from django.db import models
+from rest_framework import serializers
+
+from sidelines_django_app.relationships import RelationshipResolver
+
+
+class RelationshipListSerializer(serializers.ListSerializer):
+    """Resolves the relationship state of every profile in the list up front with a single query."""
+
+    def to_representation(self, data):
+        profiles = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        request = self.context.get('request')
+        if request is not None and profiles:
+            RelationshipResolver.for_request(request).prime(profiles)
+        return super().to_representation(profiles)
@@ -1,4 +1,3 @@
 from .ProfileSerializer import ProfileSerializer
 from .ProfileSetupSerializer import ProfileSetupSerializer
 from .FriendSerializer import FriendSerializer
-from .FriendListSerializer import FriendListSerializer
@@ -0,0 +1,295 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from sidelines_django_app.authentication import TokenCache
+from sidelines_django_app.caching import VersionedResponseCache
+from sidelines_django_app.events import MatchEventHub
+from sidelines_django_app.models import (FriendRequest, Invitation, Match, MatchDetails, MatchInvitation, MatchVote,
+                                         Profile, Team, TeamInvitation, vote_cast)
+from sidelines_django_app.relationships import TeamRoleResolver
+from sidelines_django_app.search import ProfileSearchIndex
+from sidelines_django_app.serializers import MatchDetailsSerializer
+
+SEARCHABLE_USER_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=Profile)
+def index_new_profile(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ProfileSearchIndex.reindex(instance)
+
+
+@receiver(post_save, sender=User)
+def reindex_user_profile(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw:
+        return
+    if update_fields is not None and not SEARCHABLE_USER_FIELDS.intersection(update_fields):
+        return
+    try:
+        profile = instance.profile
+    except Profile.DoesNotExist:
+        return
+    ProfileSearchIndex.reindex(profile, user=instance)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    TokenCache.default().invalidate(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user_tokens(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    TokenCache.default().invalidate(*Token.objects.filter(user_id=instance.pk).values_list('key', flat=True))
+
+
+def team_stamps(team_ids):
+    return ['team', *(f'team:{team_id}' for team_id in team_ids)]
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def bump_team_version(sender, instance, **kwargs):
+    VersionedResponseCache.default().bump(*team_stamps([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Team.members.through)
+@receiver(m2m_changed, sender=Team.admins.through)
+def bump_team_version_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        team_ids = [instance.pk] if action in ('post_add', 'post_remove', 'post_clear') else []
+    elif action in ('post_add', 'post_remove'):
+        team_ids = pk_set
+    elif action == 'pre_clear':
+        # The rows are gone by post_clear, so remember which teams to recount.
+        instance._cleared_team_ids = list(sender.objects.filter(profile_id=instance.pk).values_list('team_id',
+                                                                                                    flat=True))
+        team_ids = []
+    elif action == 'post_clear':
+        team_ids = instance.__dict__.pop('_cleared_team_ids', [])
+    else:
+        team_ids = []
+    if team_ids:
+        Team.refresh_rosters(team_ids)
+        VersionedResponseCache.default().bump(*team_stamps(team_ids))
+
+
+@receiver(pre_delete, sender=Profile)
+def collect_teams_on_profile_delete(sender, instance, **kwargs):
+    memberships = Team.members.through.objects.filter(profile_id=instance.pk).values_list('team_id', flat=True)
+    admin_roles = Team.admins.through.objects.filter(profile_id=instance.pk).values_list('team_id', flat=True)
+    instance._roster_team_ids = set(memberships.union(admin_roles))
+
+
+@receiver(post_delete, sender=Profile)
+def bump_team_version_on_profile_delete(sender, instance, **kwargs):
+    team_ids = instance.__dict__.pop('_roster_team_ids', None)
+    if team_ids:
+        Team.refresh_rosters(team_ids)
+        VersionedResponseCache.default().bump(*team_stamps(team_ids))
+
+
+@receiver(m2m_changed, sender=Team.members.through)
+@receiver(m2m_changed, sender=Team.admins.through)
+def invalidate_team_roles_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        profile_ids = [instance.pk] if action in ('post_add', 'post_remove', 'post_clear') else []
+    elif action in ('post_add', 'post_remove'):
+        profile_ids = pk_set
+    elif action == 'pre_clear':
+        profile_ids = list(sender.objects.filter(team_id=instance.pk).values_list('profile_id', flat=True))
+    else:
+        profile_ids = []
+    if profile_ids:
+        TeamRoleResolver.invalidate(*profile_ids)
+
+
+@receiver(pre_delete, sender=Team)
+def invalidate_team_roles_on_team_delete(sender, instance, **kwargs):
+    memberships = Team.members.through.objects.filter(team_id=instance.pk).values_list('profile_id', flat=True)
+    admin_roles = Team.admins.through.objects.filter(team_id=instance.pk).values_list('profile_id', flat=True)
+    TeamRoleResolver.invalidate(*set(memberships.union(admin_roles)))
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_team_roles_on_profile_create(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        TeamRoleResolver.invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=Profile)
+def invalidate_team_roles_on_profile_delete(sender, instance, **kwargs):
+    TeamRoleResolver.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Match)
+@receiver(post_delete, sender=Match)
+def bump_match_version(sender, instance, **kwargs):
+    VersionedResponseCache.default().bump('match', f'match:{instance.pk}')
+
+
+@receiver(post_save, sender=MatchDetails)
+@receiver(post_delete, sender=MatchDetails)
+def bump_match_version_on_details_change(sender, instance, origin=None, **kwargs):
+    if origin is not None and getattr(origin, 'model', type(origin)) is not MatchDetails:
+        # Deleted along with its match or team, so there is no match left to touch.
+        return
+    Match.touch([instance.match_id])
+    VersionedResponseCache.default().bump('match', f'match:{instance.match_id}')
+
+
+@receiver(post_save, sender=MatchVote)
+def count_saved_vote(sender, instance, raw=False, **kwargs):
+    # Votes cast with MatchVote.cast move the counters themselves and send vote_cast instead.
+    if not raw:
+        Match.refresh_vote_counts([instance.match_id])
+
+
+@receiver(post_save, sender=MatchVote)
+def bump_match_version_on_vote(sender, instance, **kwargs):
+    VersionedResponseCache.default().bump('match', f'match:{instance.match_id}')
+
+
+@receiver(vote_cast, sender=MatchVote)
+def bump_match_version_on_cast(sender, vote, previous_response, **kwargs):
+    # Repeating a response changes neither the counters nor the match's version.
+    if previous_response != vote.response:
+        VersionedResponseCache.default().bump('match', f'match:{vote.match_id}')
+
+
+# Votes have no delete receiver, so they are still deleted in bulk along with their profile; the counters of the
+# matches the profile voted on are recounted once instead.
+@receiver(pre_delete, sender=Profile)
+def collect_votes_on_profile_delete(sender, instance, **kwargs):
+    instance._voted_match_ids = set(MatchVote.objects.filter(profile_id=instance.pk)
+                                    .values_list('match_id', flat=True))
+
+
+@receiver(post_delete, sender=Profile)
+def bump_match_version_on_profile_delete(sender, instance, **kwargs):
+    match_ids = instance.__dict__.pop('_voted_match_ids', None)
+    if match_ids:
+        Match.refresh_vote_counts(match_ids)
+        VersionedResponseCache.default().bump('match', *(f'match:{match_id}' for match_id in match_ids))
+
+
+@receiver(vote_cast, sender=MatchVote)
+def publish_vote(sender, vote, previous_response, **kwargs):
+    # Only cast votes know the response they replaced, which subscribers need to move their tallies.
+    if previous_response != vote.response:
+        MatchEventHub.default().publish_on_commit(f'match:{vote.match_id}', {'type': 'vote', 'data': {
+            'match': vote.match_id,
+            'profile': vote.profile_id,
+            'response': vote.response,
+            'previous_response': previous_response,
+        }})
+
+
+@receiver(post_save, sender=MatchDetails)
+def publish_match_details(sender, instance, raw=False, **kwargs):
+    if not raw:
+        MatchEventHub.default().publish_on_commit(f'match:{instance.match_id}', {
+            'type': 'details', 'data': MatchDetailsSerializer(instance).data,
+        })
+
+
+ROSTER_ACTIONS = {'post_add': 'added', 'post_remove': 'removed', 'pre_clear': 'cleared'}
+
+
+@receiver(m2m_changed, sender=Team.members.through)
+@receiver(m2m_changed, sender=Team.admins.through)
+def publish_roster_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ROSTER_ACTIONS:
+        return
+    role = 'admin' if sender is Team.admins.through else 'member'
+    if not reverse:
+        changes = {instance.pk: pk_set}
+    elif action == 'pre_clear':
+        changes = {team_id: {instance.pk} for team_id in sender.objects.filter(profile_id=instance.pk)
+                   .values_list('team_id', flat=True)}
+    else:
+        changes = {team_id: {instance.pk} for team_id in pk_set}
+    hub = MatchEventHub.default()
+    for team_id, profile_ids in changes.items():
+        # A forward clear leaves `profiles` empty: the whole role was emptied.
+        hub.publish_on_commit(f'team:{team_id}', {'type': 'roster', 'data': {
+            'team': team_id,
+            'role': role,
+            'action': ROSTER_ACTIONS[action],
+            'profiles': sorted(profile_ids or ()),
+        }})
+
+
+@receiver(post_save, sender=User)
+def touch_profile_on_user_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw:
+        return
+    if update_fields is not None and not SEARCHABLE_USER_FIELDS.intersection(update_fields):
+        return
+    Profile.touch(Profile.objects.filter(user_id=instance.pk).values('pk'))
+
+
+@receiver(m2m_changed, sender=Profile.friends.through)
+def touch_profiles_on_friendship_change(sender, instance, action, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove'):
+        Profile.touch([instance.pk, *pk_set])
+    elif action == 'pre_clear':
+        Profile.touch([instance.pk, *instance.friends.values_list('pk', flat=True)])
+
+
+@receiver(post_save, sender=FriendRequest)
+@receiver(post_delete, sender=FriendRequest)
+def touch_profiles_on_friend_request_change(sender, instance, raw=False, origin=None, **kwargs):
+    # Answered requests touch both profiles once per batch, through the friendships or `apply_ignored`.
+    if not raw and not isinstance(origin, Invitation.Claim):
+        Profile.touch([instance.from_profile_id, instance.to_profile_id])
+
+
+@receiver(post_save, sender=FriendRequest)
+@receiver(post_save, sender=TeamInvitation)
+@receiver(post_save, sender=MatchInvitation)
+def count_new_invitation(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        sender.count_pending([instance], 1)
+
+
+@receiver(post_delete, sender=FriendRequest)
+@receiver(post_delete, sender=TeamInvitation)
+@receiver(post_delete, sender=MatchInvitation)
+def count_withdrawn_invitation(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Invitation.Claim):
+        # Answered; the claim already moved the counters of the whole batch.
+        return
+    if origin is not None and getattr(origin, 'model', type(origin)) is not sender:
+        # Deleted along with a profile or team; the recipients left behind are recounted once instead.
+        return
+    sender.count_pending([instance], -1)
+
+
+@receiver(pre_delete, sender=Profile)
+def collect_invitation_recipients_on_profile_delete(sender, instance, **kwargs):
+    instance._pending_recipients = {
+        model: set(model.objects.filter(from_profile_id=instance.pk).values_list('to_profile_id', flat=True))
+        for model in (FriendRequest, TeamInvitation)
+    }
+
+
+@receiver(pre_delete, sender=Team)
+def collect_invitation_recipients_on_team_delete(sender, instance, **kwargs):
+    instance._pending_recipients = {
+        TeamInvitation: set(TeamInvitation.objects.filter(team_id=instance.pk).values_list('to_profile_id', flat=True)),
+        MatchInvitation: set(MatchInvitation.objects.filter(from_team_id=instance.pk)
+                             .values_list('to_team_id', flat=True)),
+    }
+
+
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=Team)
+def recount_pending_on_delete(sender, instance, **kwargs):
+    for model, recipient_ids in instance.__dict__.pop('_pending_recipients', {}).items():
+        if recipient_ids:
+            model.refresh_pending(recipient_ids)
@@ -1,5 +1,5 @@
-from rest_framework.throttling import UserRateThrottle
+from sidelines_django_app.throttles.SlidingWindowUserRateThrottle import SlidingWindowUserRateThrottle
 
 
-class LoginThrottle(UserRateThrottle):
+class LoginThrottle(SlidingWindowUserRateThrottle):
     scope = 'login'
@@ -0,0 +1,7 @@
+from rest_framework.throttling import AnonRateThrottle
+
+from sidelines_django_app.throttles.SlidingWindowThrottle import SlidingWindowThrottle
+
+
+class SlidingWindowAnonRateThrottle(AnonRateThrottle, SlidingWindowThrottle):
+    pass
@@ -0,0 +1,7 @@
+from rest_framework.throttling import ScopedRateThrottle
+
+from sidelines_django_app.throttles.SlidingWindowThrottle import SlidingWindowThrottle
+
+
+class SlidingWindowScopedRateThrottle(ScopedRateThrottle, SlidingWindowThrottle):
+    pass
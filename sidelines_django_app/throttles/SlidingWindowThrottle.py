@@ -0,0 +1,59 @@
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from sidelines_django_app.models import ThrottleCounter
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Rate throttle backed by ThrottleCounter rows in the database, so every worker enforces the same limit.
+
+    Each check is one atomic upsert that adds the request's cost to a fixed-size counter and returns the current and
+    previous window totals. The request is allowed while the previous window, weighted by how much of it still
+    overlaps the sliding window, plus the current window stays within the rate. A throttled request changes no row;
+    it reads the counter once more to work out how long the client has to wait.
+
+    Every request that a throttle class applies to therefore writes one row, reads included. SQLite serializes those
+    writes behind its database lock, so run shared deployments on a database with row-level locking.
+
+    The cost of a request is the view's `throttle_cost` if set, otherwise THROTTLE_COSTS[scope], otherwise 1.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.cost = self.get_cost(view)
+        bucket, offset = divmod(self.timer(), self.duration)
+        self.elapsed = offset / self.duration
+        counts = ThrottleCounter.hit(
+            self.key, int(bucket), self.cost, expires_at=int((bucket + 2) * self.duration),
+            limit=self.num_requests, weight=1 - self.elapsed,
+        )
+        if counts is None:
+            self.current, self.previous = ThrottleCounter.peek(self.key, int(bucket))
+            return False
+        self.current, self.previous = counts
+        return True
+
+    def get_cost(self, view):
+        cost = getattr(view, 'throttle_cost', None)
+        if cost is None:
+            cost = getattr(settings, 'THROTTLE_COSTS', {}).get(self.scope, 1)
+        return cost
+
+    def wait(self):
+        # The throttled request was not counted, so it needs `cost` units of room on top of the stored totals.
+        room = self.num_requests - self.cost
+        if self.current <= room and self.previous:
+            # Room appears once enough of the previous window has slid out.
+            fraction = 1 - (room - self.current) / self.previous
+            return max(0.0, fraction - self.elapsed) * self.duration
+
+        # The current window alone is over the limit: wait for it to become the previous one and decay.
+        fraction = 1 - room / self.current if self.current else 0.0
+        return (1 - self.elapsed + max(0.0, fraction)) * self.duration
@@ -0,0 +1,7 @@
+from rest_framework.throttling import UserRateThrottle
+
+from sidelines_django_app.throttles.SlidingWindowThrottle import SlidingWindowThrottle
+
+
+class SlidingWindowUserRateThrottle(UserRateThrottle, SlidingWindowThrottle):
+    pass
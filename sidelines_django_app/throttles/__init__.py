@@ -0,0 +1,5 @@
+from .SlidingWindowThrottle import SlidingWindowThrottle
+from .SlidingWindowUserRateThrottle import SlidingWindowUserRateThrottle
+from .SlidingWindowAnonRateThrottle import SlidingWindowAnonRateThrottle
+from .SlidingWindowScopedRateThrottle import SlidingWindowScopedRateThrottle
+from .LoginThrottle import LoginThrottle
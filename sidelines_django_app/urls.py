@@ -15,6 +15,7 @@ urlpatterns = [
     path('profile/search/', ProfileSearchView.as_view(), name='profile-search'),
 
     path('friend-requests/', FriendRequestView.as_view(), name='create-friend-request'),
+    path('friend-requests/batch/', FriendRequestView.as_view(http_method_names=['put']), name='friend-request-batch'),
     path('friend-requests/<int:request_id>/', FriendRequestView.as_view(), name='friend-request-detail'),
     path('friend-requests/<str:request_type>/', FriendRequestView.as_view(), name='friend-request-list'),
     path('friend-requests/<int:request_id>/<str:action>/', FriendRequestView.as_view(), name='friend-request-action'),
@@ -22,25 +23,53 @@ urlpatterns = [
     path('friend-requests/unfriend/<int:profile_id>/', FriendRequestView.unfriend, name='unfriend'),
 
     path('team-invitations/', TeamInvitationView.as_view(), name='create-team-invitation'),
+    path('team-invitations/bulk/', TeamInvitationView.bulk_invite, name='bulk-create-team-invitation'),
+    path('team-invitations/batch/', TeamInvitationView.as_view(http_method_names=['put']),
+         name='team-invitation-batch'),
     path('team-invitations/<int:request_id>/', TeamInvitationView.as_view(), name='team-invitation-detail'),
     path('team-invitations/<str:request_type>/', TeamInvitationView.as_view(), name='team-invitation-list'),
-    path('team-invitations/<int:request_id>/<str:action>/', TeamInvitationView.as_view(), name='team-invitation-action'),
+    path('team-invitations/<int:request_id>/<str:action>/', TeamInvitationView.as_view(),
+         name='team-invitation-action'),
 
     path('teams/', TeamView.as_view(), name='team-list'),
     path('teams/<int:team_id>/', TeamView.as_view(), name='team-detail'),
     path('teams/<int:team_id>/leave/', TeamView.leave, name='leave-team'),
     path('teams/<int:team_id>/remove-member/<int:member_id>/', TeamView.remove_member, name='remove-member'),
-    path('teams/<int:team_id>/member/<int:member_id>/<str:action>/', TeamView.promote_or_demote_member, name='promote-demote-member'),
+    path('teams/<int:team_id>/member/<int:member_id>/<str:action>/', TeamView.promote_or_demote_member,
+         name='promote-demote-member'),
 
     path('match-invitations/', MatchInvitationView.as_view(), name='create-match-invitation'),
+    path('match-invitations/batch/', MatchInvitationView.as_view(http_method_names=['put']),
+         name='match-invitation-batch'),
     path('match-invitations/<int:request_id>/', MatchInvitationView.as_view(), name='match-invitation-detail'),
     path('match-invitations/<str:request_type>/', MatchInvitationView.as_view(), name='match-invitation-list'),
-    path('match-invitations/<int:request_id>/<str:action>/', MatchInvitationView.as_view(), name='match-invitation-action'),
+    path('match-invitations/<int:request_id>/<str:action>/', MatchInvitationView.as_view(),
+         name='match-invitation-action'),
+
+    path('inbox/', InboxView.as_view(), name='inbox'),
+    path('inbox/counts/', InboxView.counts, name='inbox-counts'),
 
     path('matches/', MatchView.as_view(), name='match-list'),
+    path('matches/mine/', MatchView.my_matches, name='my-matches'),
     path('matches/<int:match_id>/', MatchView.as_view(), name='match-detail'),
 
     path('matches/vote/<int:match_id>/', MatchView.vote, name='vote'),
+
+    # Async read endpoints, served on the event loop when running under ASGI.
+    path('async/profile/', AsyncProfileView.as_view(), name='async-profile'),
+    path('async/profile/<int:pk>/', AsyncProfileView.as_view(), name='async-profile'),
+    path('async/profile/friends/', AsyncFriendsView.as_view(), name='async-profile-friends'),
+    path('async/friend-requests/<str:request_type>/', AsyncFriendRequestListView.as_view(),
+         name='async-friend-request-list'),
+    path('async/team-invitations/<str:request_type>/', AsyncTeamInvitationListView.as_view(),
+         name='async-team-invitation-list'),
+    path('async/match-invitations/<str:request_type>/', AsyncMatchInvitationListView.as_view(),
+         name='async-match-invitation-list'),
+    path('async/teams/', AsyncTeamView.as_view(), name='async-team-list'),
+    path('async/teams/<int:team_id>/', AsyncTeamView.as_view(), name='async-team-detail'),
+    path('async/matches/', AsyncMatchView.as_view(), name='async-match-list'),
+    path('async/matches/<int:match_id>/', AsyncMatchView.as_view(), name='async-match-detail'),
+    path('async/matches/events/', AsyncMatchEventsView.as_view(), name='async-match-events'),
 ]
 
 urlpatterns_new = [
@@ -1,20 +1,26 @@
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from sidelines_django_app.authentication import CachedTokenAuthentication
 from sidelines_django_app.models import Profile, Team
+from sidelines_django_app.pagination import KeysetPagination
+from sidelines_django_app.relationships import TeamRoleResolver
 
 
 class BaseInvitationView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     model = None
     serializer_class = None
     effect_class = Profile
     from_field = 'from_profile'
     to_field = 'to_profile'
+    max_batch_size = 500
+    # Constraint name to error message; a (sent, received) pair for constraints over an unordered pair.
+    constraint_messages = {}
 
     def get(self, request, request_type=None, request_id=None):
         if request_id is not None:
@@ -48,13 +54,30 @@ class BaseInvitationView(APIView):
         else:
             return Response({'detail': 'Invalid request type.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = self.serializer_class(requests, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return KeysetPagination.paginate(self.request, requests, self.serializer_class)
 
     def post(self, request):
         return Response(status=status.HTTP_501_NOT_IMPLEMENTED)
 
-    def put(self, request, request_id, action):
+    @classmethod
+    def constraint_error(cls, error, from_obj, to_obj):
+        """
+        Maps an IntegrityError from creating a request to its error message. Must be called while handling the
+        error, which is re-raised when it does not come from one of the model's constraints.
+        """
+        message = cls.constraint_messages.get(cls.model.violated_constraint(error))
+        if message is None:
+            raise error
+        if isinstance(message, tuple):
+            sent, received = message
+            already_sent = cls.model.objects.filter(**{cls.from_field: from_obj, cls.to_field: to_obj}).exists()
+            return sent if already_sent else received
+        return message
+
+    def put(self, request, request_id=None, action=None):
+        if request_id is None:
+            return self.put_batch(request)
+
         profile = request.user.profile
         try:
             request_obj = self.model.objects.get(pk=request_id)
@@ -62,19 +85,73 @@ class BaseInvitationView(APIView):
             if self.effect_class is Profile and getattr(request_obj, self.to_field) != profile:
                 return Response({'detail': 'You can only accept/ignore requests sent to you.'},
                                 status=status.HTTP_403_FORBIDDEN)
-            elif self.effect_class is Team and profile not in getattr(request_obj, self.to_field).admins.all():
+            elif (self.effect_class is Team
+                  and not TeamRoleResolver.for_request(request).is_admin(getattr(request_obj, self.to_field + '_id'))):
                 return Response({'detail': 'You can only accept/ignore requests sent to teams you are an admin of.'},
                                 status=status.HTTP_403_FORBIDDEN)
             if action == 'accept':
-                request_obj.accept()
+                answered = request_obj.accept()
             elif action == 'ignore':
-                request_obj.ignore()
+                answered = request_obj.ignore()
             else:
                 return Response({'detail': 'Invalid action.'}, status=status.HTTP_400_BAD_REQUEST)
+            if not answered:
+                # Another request answered or withdrew it after it was loaded.
+                return Response(status=status.HTTP_404_NOT_FOUND)
             return Response(status=status.HTTP_200_OK)
         except self.model.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
+    def put_batch(self, request):
+        """
+        Accepts or ignores many requests in one transaction. Every request is loaded together with whether the user
+        may act on it in one query, and the model's accept_many/ignore_many apply the batch with bulk statements.
+
+        The requests are loaded before the transaction, whose first statement is then the claim's DELETE, so on
+        SQLite it waits for the write lock rather than failing on it. Requests answered or withdrawn in between are
+        not claimed and are left out of the count.
+        """
+        action = request.data.get('action')
+        if action not in ('accept', 'ignore'):
+            return Response({'detail': 'Invalid action.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        request_ids = request.data.get('ids')
+        if (not isinstance(request_ids, list) or not request_ids
+                or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in request_ids)):
+            return Response({'detail': 'ids must be a non-empty list of request IDs.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        request_ids = list(dict.fromkeys(request_ids))
+        if len(request_ids) > self.max_batch_size:
+            return Response({'detail': f'Cannot {action} more than {self.max_batch_size} requests at once.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        request_objs = list(self.with_authorization(self.model.objects.filter(pk__in=request_ids),
+                                                    request.user.profile))
+        missing_ids = set(request_ids) - {request_obj.pk for request_obj in request_objs}
+        if missing_ids:
+            return Response({'detail': 'Requests not found.', 'ids': sorted(missing_ids)},
+                            status=status.HTTP_404_NOT_FOUND)
+        if not all(request_obj.authorized for request_obj in request_objs):
+            if self.effect_class is Profile:
+                detail = 'You can only accept/ignore requests sent to you.'
+            else:
+                detail = 'You can only accept/ignore requests sent to teams you are an admin of.'
+            return Response({'detail': detail}, status=status.HTTP_403_FORBIDDEN)
+
+        if action == 'accept':
+            answered = self.model.accept_many(request_objs)
+        else:
+            answered = self.model.ignore_many(request_objs)
+        return Response({'action': action, 'count': len(answered)}, status=status.HTTP_200_OK)
+
+    def with_authorization(self, queryset, profile):
+        if self.effect_class is Profile:
+            authorized = ExpressionWrapper(Q(**{f'{self.to_field}_id': profile.pk}), output_field=BooleanField())
+        else:
+            authorized = Exists(Team.admins.through.objects.filter(team_id=OuterRef(f'{self.to_field}_id'),
+                                                                    profile_id=profile.pk))
+        return queryset.select_related(self.to_field).annotate(authorized=authorized)
+
     def delete(self, request, request_id):
         profile = request.user.profile
 
@@ -85,7 +162,8 @@ class BaseInvitationView(APIView):
 
         if self.effect_class is Profile and getattr(request_obj, self.from_field) != profile:
             return Response({'detail': 'You can only withdraw requests sent by you.'}, status=status.HTTP_403_FORBIDDEN)
-        elif self.effect_class is Team and profile not in getattr(request_obj, self.from_field).admins.all():
+        elif (self.effect_class is Team
+              and not TeamRoleResolver.for_request(request).is_admin(getattr(request_obj, self.from_field + '_id'))):
             return Response({'detail': 'You can only withdraw requests sent by your team.'},
                             status=status.HTTP_403_FORBIDDEN)
         request_obj.delete()
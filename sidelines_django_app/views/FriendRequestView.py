@@ -1,8 +1,10 @@
+from django.db import IntegrityError
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from sidelines_django_app.models import FriendRequest, Profile
+from sidelines_django_app.relationships import RelationshipResolver
 from sidelines_django_app.serializers import FriendRequestSerializer
 from sidelines_django_app.views.BaseInvitationView import BaseInvitationView
 
@@ -10,6 +12,11 @@ from sidelines_django_app.views.BaseInvitationView import BaseInvitationView
 class FriendRequestView(BaseInvitationView):
     model = FriendRequest
     serializer_class = FriendRequestSerializer
+    constraint_messages = {
+        'friend_request_not_self': 'Cannot send a friend request to yourself.',
+        'friend_request_unique_pair': ('Friend request already sent.',
+                                       'Friend request already received from this user.'),
+    }
 
     def post(self, request):
         from_profile = request.user.profile
@@ -20,26 +27,22 @@ class FriendRequestView(BaseInvitationView):
         except Profile.DoesNotExist:
             return Response({'detail': 'Recipient profile not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        error = self.validate_request(from_profile, to_profile)
-        if error:
-            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+        if from_profile == to_profile:
+            return Response({'detail': 'Cannot send a friend request to yourself.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Duplicates are rejected by the model's constraints and friendship by the insert's own condition.
+        try:
+            request_obj = self.model.send(from_profile, to_profile)
+        except IntegrityError as e:
+            return Response({'detail': self.constraint_error(e, from_profile, to_profile)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if request_obj is None:
+            return Response({'detail': 'This user is already your friend.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        request_obj = self.model(from_profile=from_profile, to_profile=to_profile)
-        request_obj.save()
         serializer = self.serializer_class(request_obj)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    def validate_request(self, from_profile, to_profile):
-        if from_profile == to_profile:
-            return 'Cannot send a friend request to yourself.'
-        if self.model.objects.filter(from_profile=from_profile, to_profile=to_profile).exists():
-            return 'Friend request already sent.'
-        if self.model.objects.filter(from_profile=to_profile, to_profile=from_profile).exists():
-            return 'Friend request already received from this user.'
-        if to_profile in from_profile.friends.all():
-            return 'This user is already your friend.'
-        return None
-
     @staticmethod
     @api_view(['DELETE'])
     def unfriend(request, profile_id):
@@ -50,7 +53,7 @@ class FriendRequestView(BaseInvitationView):
         except Profile.DoesNotExist:
             return Response({'detail': 'Profile not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        if other_profile not in profile.friends.all():
+        if not RelationshipResolver.for_request(request).state(other_profile).is_friend:
             return Response({'detail': 'This user is not in your friends list.'}, status=status.HTTP_400_BAD_REQUEST)
 
         profile.unfriend(other_profile)
@@ -1,19 +1,16 @@
-from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from sidelines_django_app.serializers import FriendListSerializer
+from sidelines_django_app.authentication import CachedTokenAuthentication
+from sidelines_django_app.pagination import KeysetPagination
+from sidelines_django_app.serializers import FriendSerializer
 
 
 class FriendsView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     @staticmethod
     def get(request):
-        profile = request.user.profile
-        serializer = FriendListSerializer(profile, context={'request': request})
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        friends = request.user.profile.friends.select_related('user')
+        return KeysetPagination.paginate(request, friends, FriendSerializer, context={'request': request})
@@ -0,0 +1,42 @@
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from sidelines_django_app.authentication import CachedTokenAuthentication
+from sidelines_django_app.inbox import Inbox
+from sidelines_django_app.pagination import KeysetPagination
+from sidelines_django_app.relationships import TeamRoleResolver
+
+
+class InboxView(APIView):
+    """
+    The caller's pending friend requests, team invitations and match invitations to the teams they administer,
+    merged newest first in one query. Pages are followed with the opaque `next` link.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @staticmethod
+    def get(request):
+        cursor = None
+        encoded = request.query_params.get('cursor')
+        if encoded is not None:
+            cursor = Inbox.decode_cursor(encoded)
+            if cursor is None:
+                return Response({'detail': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        inbox = Inbox(request.user.profile.pk, TeamRoleResolver.for_request(request).admin_team_ids())
+        items, next_cursor = inbox.page(KeysetPagination().get_page_size(request), cursor)
+        next_link = None
+        if next_cursor is not None:
+            next_link = replace_query_param(request.build_absolute_uri(), 'cursor', Inbox.encode_cursor(next_cursor))
+        return Response({'next': next_link, 'results': items})
+
+    @staticmethod
+    @api_view(['GET'])
+    def counts(request):
+        """Badge counts: pending items per type, per administered team, and in total. Costs a single query."""
+        return Response(Inbox.counts(request.user.pk))
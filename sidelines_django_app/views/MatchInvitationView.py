@@ -1,25 +1,29 @@
+from django.db import IntegrityError
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from sidelines_django_app.authentication import CachedTokenAuthentication
 from sidelines_django_app.models import MatchInvitation, Team
+from sidelines_django_app.relationships import TeamRoleResolver
 from sidelines_django_app.serializers import MatchInvitationSerializer
 from sidelines_django_app.views.BaseInvitationView import BaseInvitationView
 
 
 class MatchInvitationView(BaseInvitationView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     model = MatchInvitation
     serializer_class = MatchInvitationSerializer
     effect_class = Team
     from_field = 'from_team'
     to_field = 'to_team'
+    constraint_messages = {
+        'match_invitation_not_self': 'Cannot send a match invitation to the same team.',
+        'match_invitation_unique_fixture': 'Match invitation already sent.',
+    }
 
     def post(self, request):
-        profile = request.user.profile
-
         from_team_id = request.data.get('from_team')
         to_team_id = request.data.get('to_team')
         team_size = request.data.get('team_size')
@@ -32,22 +36,25 @@ class MatchInvitationView(BaseInvitationView):
         except Team.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        error = self.validate_request(from_team=from_team, to_team=to_team, profile=profile)
+        error = self.validate_request(from_team=from_team, to_team=to_team, roles=TeamRoleResolver.for_request(request))
         if error:
             return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
 
-        invitation = self.model(from_team=from_team, to_team=to_team, team_size=team_size,
-                                location=location, date_time=date_time)
-        invitation.save()
+        try:
+            invitation = self.model.insert({'from_team': from_team, 'to_team': to_team, 'team_size': team_size,
+                                            'location': location, 'date_time': date_time})
+        except IntegrityError as e:
+            return Response({'detail': self.constraint_error(e, from_team, to_team)},
+                            status=status.HTTP_400_BAD_REQUEST)
         serializer = self.serializer_class(invitation)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @staticmethod
-    def validate_request(from_team, to_team, profile):
+    def validate_request(from_team, to_team, roles):
         if from_team == to_team:
             return 'Cannot send a match invitation to the same team.'
-        elif profile not in from_team.members.all():
+        elif not roles.is_member(from_team):
             return 'Cannot send a match invitation from a team you are not a member of.'
-        elif profile not in from_team.admins.all():
+        elif not roles.is_admin(from_team):
             return 'Only admins can send match invitations.'
         return None
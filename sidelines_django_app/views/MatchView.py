@@ -1,39 +1,72 @@
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import api_view
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from sidelines_django_app.authentication import CachedTokenAuthentication
+from sidelines_django_app.caching import ResourceValidators, VersionedResponseCache
+from sidelines_django_app.filters import MatchFeedFilter
 from sidelines_django_app.models import Match, MatchVote
+from sidelines_django_app.pagination import KeysetPagination
+from sidelines_django_app.relationships import TeamRoleResolver
 from sidelines_django_app.serializers import MatchSerializer
 
 
 class MatchView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     @staticmethod
     def get(request, match_id=None):
+        response_cache = VersionedResponseCache.default()
         if match_id:
-            return MatchView.get_single_match(match_id)
+            stamps = ResourceValidators.load(Match.objects.filter(pk=match_id))
+            if not stamps:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            validators = ResourceValidators(stamps)
+            not_modified = validators.not_modified(request)
+            if not_modified is not None:
+                return not_modified
+            return validators.apply(response_cache.get_or_build(request, [f'match:{match_id}'],
+                                                                lambda: MatchView.get_single_match(match_id)))
 
-        return MatchView.get_all_matches()
+        stamps = MatchFeedFilter.from_request(request).cache_stamps
+        if stamps is None:
+            return MatchView.get_all_matches(request)
+        return response_cache.get_or_build(request, stamps, lambda: MatchView.get_all_matches(request))
 
     @staticmethod
     def get_single_match(match_id):
         try:
-            match = Match.objects.get(pk=match_id)
+            match = Match.objects.for_payload().get(pk=match_id)
             serializer = MatchSerializer(match)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Match.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
     @staticmethod
-    def get_all_matches():
-        matches = Match.objects.all()
-        serializer = MatchSerializer(matches, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_all_matches(request):
+        feed = MatchFeedFilter.from_request(request)
+        if feed.error:
+            return Response({'detail': feed.error}, status=status.HTTP_400_BAD_REQUEST)
+        matches = feed.apply(Match.objects.for_payload())
+        return KeysetPagination.paginate(request, matches, MatchSerializer, ordering=feed.ordering)
+
+    @staticmethod
+    @api_view(['GET'])
+    def my_matches(request):
+        """
+        Matches of the caller's teams, taking the same filters as the match list. The teams come from the cached role
+        map, so the feed is a single query over the (team, date_time) indexes.
+        """
+        feed = MatchFeedFilter.from_request(request)
+        if feed.error:
+            return Response({'detail': feed.error}, status=status.HTTP_400_BAD_REQUEST)
+        team_ids = TeamRoleResolver.for_request(request).team_ids()
+        matches = feed.apply(Match.objects.for_teams(team_ids).for_payload())
+        return KeysetPagination.paginate(request, matches, MatchSerializer,
+                                         ordering=feed.ordering or ('-date_time', '-id'))
 
     @staticmethod
     @api_view(['POST'])
@@ -45,16 +78,8 @@ class MatchView(APIView):
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            match = Match.objects.get(pk=match_id)
+            MatchVote.cast(match_id, profile.pk, vote_response)
         except Match.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        try:
-            match_vote = MatchVote.objects.get(match=match, profile=profile)
-        except MatchVote.DoesNotExist:
-            match_vote = MatchVote(match=match, profile=profile)
-
-        match_vote.response = vote_response
-        match_vote.save()
-
         return Response(status=status.HTTP_200_OK)
@@ -1,16 +1,16 @@
-from django.db.models import Q
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
-from sidelines_django_app.models import Profile
+from sidelines_django_app.authentication import CachedTokenAuthentication
+from sidelines_django_app.search import ProfileSearchIndex
 from sidelines_django_app.serializers import FriendSerializer
 
 
 class ProfileSearchView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     @staticmethod
@@ -19,13 +19,18 @@ class ProfileSearchView(APIView):
         if not query:
             return Response({'detail': 'Query parameter is required.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        current_user_profile = Profile.objects.filter(user=request.user).first()
-
-        profiles = Profile.objects.filter(
-            (Q(user__username__icontains=query) |
-            Q(user__first_name__icontains=query) |
-            Q(user__last_name__icontains=query))
-        ).exclude(id=current_user_profile.id)
+        try:
+            profiles, next_cursor, truncated = ProfileSearchIndex.search(
+                request.user.profile, query,
+                cursor=request.GET.get('cursor'),
+                limit=request.GET.get('page_size'),
+            )
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = FriendSerializer(profiles, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+        return Response({'next': next_url, 'truncated': truncated, 'results': serializer.data},
+                        status=status.HTTP_200_OK)
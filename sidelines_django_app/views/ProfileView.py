@@ -1,9 +1,10 @@
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from sidelines_django_app.authentication import CachedTokenAuthentication
+from sidelines_django_app.caching import ResourceValidators
 from sidelines_django_app.models import Profile
 from sidelines_django_app.serializers import UserSerializer
 from sidelines_django_app.serializers.profile import ProfileSerializer, ProfileSetupSerializer
@@ -11,19 +12,27 @@ from sidelines_django_app.serializers.profile.ProfilePictureSerializer import Pr
 
 
 class ProfileView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     @staticmethod
     def get(request, pk=None):
         profile = request.user.profile
-        if pk is None:
-            serializer = ProfileSerializer(profile, context={'request': request})
-        else:
-            other_profile = Profile.objects.get(pk=pk)
-            serializer = ProfileSerializer(other_profile, context={'request': request})
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        target_id = profile.pk if pk is None else pk
+        stamps = ResourceValidators.load(Profile.objects.filter(pk__in={profile.pk, target_id}))
+        if target_id not in {stamp[1] for stamp in stamps}:
+            return Response({'detail': 'Profile not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        # The representation includes the viewer's relationship to the profile, so the viewer is part of the ETag.
+        validators = ResourceValidators(stamps, vary=[profile.pk])
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+
+        if pk is not None:
+            profile = Profile.objects.select_related('user').get(pk=pk)
+        serializer = ProfileSerializer(profile, context={'request': request})
+        return validators.apply(Response(serializer.data, status=status.HTTP_200_OK))
 
     @staticmethod
     def patch(request):
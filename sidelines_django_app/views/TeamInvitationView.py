@@ -1,7 +1,10 @@
+from django.db import IntegrityError, transaction
 from rest_framework import status
+from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from sidelines_django_app.models import TeamInvitation, Profile, Team
+from sidelines_django_app.relationships import RelationshipResolver, TeamRoleResolver
 from sidelines_django_app.serializers import TeamInvitationSerializer
 from sidelines_django_app.views.BaseInvitationView import BaseInvitationView
 
@@ -9,6 +12,12 @@ from sidelines_django_app.views.BaseInvitationView import BaseInvitationView
 class TeamInvitationView(BaseInvitationView):
     model = TeamInvitation
     serializer_class = TeamInvitationSerializer
+    max_bulk_recipients = 50
+    constraint_messages = {
+        'team_invitation_not_self': 'Cannot send a team invitation to yourself.',
+        'team_invitation_unique_pair': ('Team invitation already sent.',
+                                        'Team invitation already received from this user.'),
+    }
 
     def post(self, request):
         from_profile = request.user.profile
@@ -25,22 +34,113 @@ class TeamInvitationView(BaseInvitationView):
         if error:
             return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
 
-        request_obj = self.model(from_profile=from_profile, to_profile=to_profile, team=team)
-        request_obj.save()
+        # Duplicates are rejected by the model's constraints, friendship and membership by the insert's conditions.
+        try:
+            request_obj = self.model.send(from_profile, to_profile, team)
+        except IntegrityError as e:
+            return Response({'detail': self.constraint_error(e, from_profile, to_profile)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if request_obj is None:
+            relationship = RelationshipResolver.for_request(request, invitation_model=self.model).state(to_profile)
+            error = self.validate_recipient(from_profile, to_profile.pk, relationship, lambda: True)
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+
         serializer = self.serializer_class(request_obj)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def validate_request(self, from_profile, to_profile, team):
-        if from_profile not in team.admins.all():
+        if not TeamRoleResolver.for_request(self.request, from_profile).is_admin(team):
             return 'Only admins can send team invitations.'
         if from_profile == to_profile:
             return 'Cannot send a team invitation to yourself.'
-        if self.model.objects.filter(from_profile=from_profile, to_profile=to_profile).exists():
+        return None
+
+    @staticmethod
+    def validate_recipient(from_profile, to_profile_id, relationship, is_member):
+        if from_profile.pk == to_profile_id:
+            return 'Cannot send a team invitation to yourself.'
+        if relationship.pending_outgoing:
             return 'Team invitation already sent.'
-        if self.model.objects.filter(from_profile=to_profile, to_profile=from_profile).exists():
+        if relationship.pending_incoming:
             return 'Team invitation already received from this user.'
-        if to_profile not in from_profile.friends.all():
+        if not relationship.is_friend:
             return 'Can only send team invitations to friends.'
-        if to_profile in team.members.all():
+        if is_member():
             return 'This user is already in the team.'
         return None
+
+    @staticmethod
+    @api_view(['POST'])
+    def bulk_invite(request):
+        """
+        Invites a list of profiles to a team. The admin check, the recipients' relationships and their team
+        membership are each resolved with one set-based query, valid invitations are inserted with one bulk insert,
+        and the response reports a result for every requested profile.
+
+        An invitation sent concurrently between the checks and the insert fails the bulk insert on the model's
+        constraints. The batch is then inserted one invitation at a time, so only the conflicting recipients are
+        rejected.
+        """
+        from_profile = request.user.profile
+        to_profile_ids = request.data.get('to_profiles')
+        if (not isinstance(to_profile_ids, list) or not to_profile_ids
+                or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in to_profile_ids)):
+            return Response({'detail': 'to_profiles must be a non-empty list of profile IDs.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        to_profile_ids = list(dict.fromkeys(to_profile_ids))
+        if len(to_profile_ids) > TeamInvitationView.max_bulk_recipients:
+            return Response({'detail': f'Cannot invite more than {TeamInvitationView.max_bulk_recipients} '
+                                       f'profiles at once.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            team = Team.objects.get(pk=request.data.get('team'))
+        except (Team.DoesNotExist, ValueError, TypeError):
+            return Response({'detail': 'Team not found.'}, status=status.HTTP_404_NOT_FOUND)
+        if not TeamRoleResolver.for_request(request).is_admin(team):
+            return Response({'detail': 'Only admins can send team invitations.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        existing_ids = set(Profile.objects.filter(pk__in=to_profile_ids).values_list('pk', flat=True))
+        resolver = RelationshipResolver.for_request(request, invitation_model=TeamInvitation)
+        resolver.prime(existing_ids)
+        member_ids = set(Team.members.through.objects.filter(
+            team_id=team.pk, profile_id__in=existing_ids
+        ).values_list('profile_id', flat=True))
+
+        errors = {}
+        invitations = []
+        for to_profile_id in to_profile_ids:
+            if to_profile_id not in existing_ids:
+                errors[to_profile_id] = 'Profile not found.'
+                continue
+            error = TeamInvitationView.validate_recipient(from_profile, to_profile_id, resolver.state(to_profile_id),
+                                                          lambda: to_profile_id in member_ids)
+            if error:
+                errors[to_profile_id] = error
+            else:
+                invitations.append(TeamInvitation(from_profile=from_profile, to_profile_id=to_profile_id, team=team))
+
+        try:
+            with transaction.atomic():
+                created = {invitation.to_profile_id: invitation
+                           for invitation in TeamInvitation.objects.bulk_create(invitations)}
+                # bulk_create sends no post_save, so the recipients' counters are moved here.
+                TeamInvitation.count_pending(created.values(), 1)
+        except IntegrityError:
+            created = {}
+            for invitation in invitations:
+                to_profile_id = invitation.to_profile_id
+                try:
+                    created[to_profile_id] = TeamInvitation.insert({'from_profile': from_profile,
+                                                                    'to_profile_id': to_profile_id, 'team': team})
+                except IntegrityError as e:
+                    errors[to_profile_id] = TeamInvitationView.constraint_error(e, from_profile, to_profile_id)
+        results = []
+        for to_profile_id in to_profile_ids:
+            if to_profile_id in created:
+                results.append({'to_profile': to_profile_id, 'status': 'created',
+                                'invitation': TeamInvitationSerializer(created[to_profile_id]).data})
+            else:
+                results.append({'to_profile': to_profile_id, 'status': 'rejected', 'detail': errors[to_profile_id]})
+
+        response_status = status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        return Response({'results': results}, status=response_status)
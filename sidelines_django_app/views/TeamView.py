@@ -1,49 +1,57 @@
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import api_view
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from sidelines_django_app.authentication import CachedTokenAuthentication
+from sidelines_django_app.caching import ResourceValidators, VersionedResponseCache
 from sidelines_django_app.models import Team, Profile
+from sidelines_django_app.pagination import KeysetPagination
+from sidelines_django_app.relationships import TeamRoleResolver
 from sidelines_django_app.serializers import TeamSerializer
 
 
 class TeamView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     @staticmethod
     def get(request, team_id=None):
+        response_cache = VersionedResponseCache.default()
         if team_id:
-            return TeamView.get_single_team(team_id)
-
-        return TeamView.get_all_teams()
+            stamps = ResourceValidators.load(Team.objects.filter(pk=team_id))
+            if not stamps:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            validators = ResourceValidators(stamps)
+            not_modified = validators.not_modified(request)
+            if not_modified is not None:
+                return not_modified
+            return validators.apply(response_cache.get_or_build(request, [f'team:{team_id}'],
+                                                                lambda: TeamView.get_single_team(team_id)))
+
+        return response_cache.get_or_build(request, ['team'], lambda: TeamView.get_all_teams(request))
 
     @staticmethod
     def get_single_team(team_id):
         try:
-            team = Team.objects.get(pk=team_id)
+            team = Team.objects.prefetch_related('members', 'admins').get(pk=team_id)
             serializer = TeamSerializer(team)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Team.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
     @staticmethod
-    def get_all_teams():
-        teams = Team.objects.all()
-        serializer = TeamSerializer(teams, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_all_teams(request):
+        teams = Team.objects.prefetch_related('members', 'admins')
+        return KeysetPagination.paginate(request, teams, TeamSerializer)
 
     @staticmethod
     def post(request):
         serializer = TeamSerializer(data=request.data)
         if serializer.is_valid():
             team = serializer.save()
-            profile = request.user.profile
-            team.members.add(profile)
-            team.admins.add(profile)
-            team.save()
+            team.add_member(request.user.profile, admin=True)
             return Response(status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -51,8 +59,7 @@ class TeamView(APIView):
     def put(request, team_id):
         try:
             team = Team.objects.get(pk=team_id)
-            profile = request.user.profile
-            if profile not in team.admins.all():
+            if not TeamRoleResolver.for_request(request).is_admin(team):
                 return Response({'detail': 'You do not have permission to update this team.'},
                                 status=status.HTTP_403_FORBIDDEN)
             serializer = TeamSerializer(team, data=request.data, partial=True)
@@ -67,8 +74,7 @@ class TeamView(APIView):
     def delete(request, team_id):
         try:
             team = Team.objects.get(pk=team_id)
-            profile = request.user.profile
-            if profile not in team.admins.all():
+            if not TeamRoleResolver.for_request(request).is_admin(team):
                 return Response({'detail': 'You do not have permission to delete this team.'},
                                 status=status.HTTP_403_FORBIDDEN)
             team.delete()
@@ -84,12 +90,14 @@ class TeamView(APIView):
             return error_response
 
         if action == 'promote':
-            team.promote_member(member)
+            if not team.promote_member(member):
+                return Response(status=status.HTTP_400_BAD_REQUEST)
             return Response(status=status.HTTP_200_OK)
         elif action == 'demote':
-            if member not in team.admins.all():
+            if not TeamRoleResolver.for_request(request, member).is_admin(team):
                 return Response(status=status.HTTP_400_BAD_REQUEST)
-            team.demote_member(member)
+            if not team.demote_member(member):
+                return Response({'detail': 'You cannot demote the last admin.'}, status=status.HTTP_403_FORBIDDEN)
             return Response(status=status.HTTP_200_OK)
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
@@ -100,7 +108,8 @@ class TeamView(APIView):
         if error_response:
             return error_response
 
-        team.remove_member(member)
+        if not team.remove_member(member):
+            return Response({'detail': 'You cannot remove the last admin.'}, status=status.HTTP_403_FORBIDDEN)
 
         return Response(status=status.HTTP_200_OK)
 
@@ -116,10 +125,10 @@ class TeamView(APIView):
         if profile == member:
             return None, None, Response(status=status.HTTP_403_FORBIDDEN)
 
-        if profile not in team.admins.all():
+        if not TeamRoleResolver.for_request(request).is_admin(team):
             return None, None, Response(status=status.HTTP_403_FORBIDDEN)
 
-        if member not in team.members.all():
+        if not TeamRoleResolver.for_request(request, member).is_member(team):
             return None, None, Response(status=status.HTTP_400_BAD_REQUEST)
 
         return team, member, None
@@ -134,13 +143,11 @@ class TeamView(APIView):
         except Team.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        if profile not in team.members.all():
+        if not TeamRoleResolver.for_request(request).is_member(team):
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        if profile in team.admins.all() and team.admins.count() == 1 and team.members.count() > 1:
+        if not team.remove_member(profile):
             return Response({'detail': 'You cannot leave the team as the last admin.'},
                             status=status.HTTP_403_FORBIDDEN)
 
-        team.remove_member(profile)
-
         return Response(status=status.HTTP_200_OK)
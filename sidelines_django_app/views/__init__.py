@@ -7,5 +7,7 @@ from .MatchInvitationView import MatchInvitationView
 from .ProfileView import ProfileView
 from .FriendsView import FriendsView
 from .ProfileSearchView import ProfileSearchView
+from .InboxView import InboxView
 
 from .authentication import *
+from .asynchronous import *
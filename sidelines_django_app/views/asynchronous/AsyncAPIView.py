@@ -0,0 +1,87 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from sidelines_django_app.authentication import CachedTokenAuthentication
+from sidelines_django_app.models import Profile
+from sidelines_django_app.pagination import KeysetPagination
+
+
+class AsyncAPIView(View):
+    """
+    Base class for read-only views that run natively on the ASGI event loop.
+
+    Authentication goes through CachedTokenAuthentication's async path, so a warm request reaches the handler
+    without leaving the loop. Handlers load everything a serializer needs (select/prefetch related rows, relationship
+    state) with the async ORM before serializing, and return plain JSON responses.
+    """
+    http_method_names = ['get']
+    authentication = CachedTokenAuthentication()
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method.lower() not in self.http_method_names:
+            return JsonResponse({'detail': f'Method "{request.method}" not allowed.'},
+                                status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        try:
+            credentials = await self.authentication.aauthenticate(request)
+        except exceptions.AuthenticationFailed as e:
+            return self.unauthorized(e.detail)
+        if credentials is None:
+            return self.unauthorized(exceptions.NotAuthenticated.default_detail)
+        request.user, request.auth = credentials
+
+        self.api_request = Request(request, authenticators=())
+        self.api_request.user, self.api_request.auth = credentials
+        waits = await sync_to_async(self.check_throttles)(self.api_request)
+        if waits:
+            throttled = exceptions.Throttled(max((wait for wait in waits if wait is not None), default=None))
+            return JsonResponse({'detail': throttled.detail}, status=throttled.status_code)
+
+        handler = getattr(self, request.method.lower())
+        return await handler(request, *args, **kwargs)
+
+    def check_throttles(self, request):
+        """Runs the (synchronous, cache-backed) DRF throttles and returns the wait of every one that refused."""
+        return [throttle.wait() for throttle in (throttle_class() for throttle_class in self.throttle_classes)
+                if not throttle.allow_request(request, self)]
+
+    def unauthorized(self, detail):
+        response = JsonResponse({'detail': detail}, status=status.HTTP_401_UNAUTHORIZED)
+        response['WWW-Authenticate'] = self.authentication.keyword
+        return response
+
+    @staticmethod
+    async def load_profile(request):
+        """
+        Loads the caller's profile onto `request.user` and returns it. Cached tokens do not carry the profile, and
+        handlers on the event loop cannot let `request.user.profile` load it lazily.
+        """
+        request.user.profile = await Profile.objects.aget(user_id=request.user.pk)
+        return request.user.profile
+
+    async def paginate(self, queryset, serializer_class, prepare=None, ordering=None, **serializer_kwargs):
+        """
+        Async counterpart of KeysetPagination.paginate. `prepare` is called with the page in a worker thread to
+        warm anything the serializer would otherwise query lazily.
+        """
+        paginator = KeysetPagination()
+        if ordering is not None:
+            paginator.ordering = ordering
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, self.api_request)
+        if prepare is not None:
+            await sync_to_async(prepare)(page)
+        serializer = serializer_class(page, many=True, **serializer_kwargs)
+        return JsonResponse({
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': serializer.data,
+        })
+
+    @staticmethod
+    def not_found(detail='Not found.'):
+        return JsonResponse({'detail': detail}, status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,8 @@
+from sidelines_django_app.models import FriendRequest
+from sidelines_django_app.serializers import FriendRequestSerializer
+from sidelines_django_app.views.asynchronous.AsyncInvitationListView import AsyncInvitationListView
+
+
+class AsyncFriendRequestListView(AsyncInvitationListView):
+    model = FriendRequest
+    serializer_class = FriendRequestSerializer
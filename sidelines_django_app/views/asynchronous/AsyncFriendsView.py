@@ -0,0 +1,11 @@
+from sidelines_django_app.relationships import RelationshipResolver
+from sidelines_django_app.serializers import FriendSerializer
+from sidelines_django_app.views.asynchronous.AsyncAPIView import AsyncAPIView
+
+
+class AsyncFriendsView(AsyncAPIView):
+    async def get(self, request):
+        friends = (await self.load_profile(request)).friends.select_related('user')
+        return await self.paginate(friends, FriendSerializer,
+                                   prepare=RelationshipResolver.for_request(request).prime,
+                                   context={'request': request})
@@ -0,0 +1,32 @@
+from django.http import JsonResponse
+from rest_framework import status
+
+from sidelines_django_app.models import Profile, Team
+from sidelines_django_app.views.asynchronous.AsyncAPIView import AsyncAPIView
+
+
+class AsyncInvitationListView(AsyncAPIView):
+    """Async counterpart of BaseInvitationView's list endpoints, configured the same way."""
+    model = None
+    serializer_class = None
+    effect_class = Profile
+    from_field = 'from_profile'
+    to_field = 'to_profile'
+
+    async def get(self, request, request_type):
+        if self.effect_class is Profile:
+            target = await self.load_profile(request)
+        else:
+            try:
+                target = await Team.objects.aget(pk=request.GET.get('team'))
+            except (Team.DoesNotExist, ValueError):
+                return self.not_found()
+
+        if request_type == 'sent':
+            requests = self.model.objects.filter(**{self.from_field: target})
+        elif request_type == 'received':
+            requests = self.model.objects.filter(**{self.to_field: target})
+        else:
+            return JsonResponse({'detail': 'Invalid request type.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return await self.paginate(requests, self.serializer_class)
@@ -0,0 +1,96 @@
+import json
+import time
+
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import status
+
+from sidelines_django_app.events import MatchEventHub
+from sidelines_django_app.models import Match, MatchVote
+from sidelines_django_app.views.asynchronous.AsyncAPIView import AsyncAPIView
+
+
+class AsyncMatchEventsView(AsyncAPIView):
+    """
+    Streams live updates for up to MAX_MATCHES_PER_STREAM matches (`?matches=1,2,3`) as server-sent events.
+
+    The stream opens with a `ready` event carrying each match's version and vote counts, so a client that
+    reconnects starts from a fresh snapshot instead of replaying what it missed. After that it receives `vote`,
+    `details` and `roster` events as they are committed, and a comment line every HEARTBEAT_INTERVAL seconds so
+    proxies keep the connection open. Streams end after MAX_DURATION, or as soon as the client falls QUEUE_SIZE
+    events behind; clients are expected to reconnect.
+
+    The stream takes its slot and subscribes once the response starts streaming, and gives both up when it ends, so
+    a response that is never sent holds neither. Django does not notice a client that disconnects mid-stream, so a
+    dropped stream keeps its slot until MAX_DURATION, which is why that is kept to minutes.
+    """
+
+    async def get(self, request):
+        hub = MatchEventHub.default()
+        try:
+            match_ids = sorted({int(match_id) for match_id in request.GET.get('matches', '').split(',')})
+        except ValueError:
+            return JsonResponse({'detail': 'matches must be a comma-separated list of match ids.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+        if len(match_ids) > hub.options['MAX_MATCHES_PER_STREAM']:
+            return JsonResponse({'detail': f'A stream can follow at most {hub.options["MAX_MATCHES_PER_STREAM"]} '
+                                           f'matches.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        snapshot = [match async for match in Match.objects.filter(pk__in=match_ids).order_by('pk')
+                    .values('pk', 'home_team_id', 'away_team_id', 'version', *Match.VOTE_COUNTERS)]
+        if len(snapshot) != len(match_ids):
+            return self.not_found()
+
+        # The stream leases its slot when it starts; one taken in between is reported as an `error` event.
+        if not await hub.has_free_slot(request.user.pk):
+            return JsonResponse({'detail': 'Too many open event streams.'},
+                                status=status.HTTP_429_TOO_MANY_REQUESTS)
+
+        channels = {f'match:{match["pk"]}' for match in snapshot}
+        channels.update(f'team:{match[side]}' for match in snapshot for side in ('home_team_id', 'away_team_id'))
+        ready = {'matches': [{
+            'id': match['pk'],
+            'home_team': match['home_team_id'],
+            'away_team': match['away_team_id'],
+            'version': match['version'],
+            'vote_counts': {response: match[Match.vote_counter(response)]
+                            for response, _ in MatchVote.RESPONSE_CHOICES},
+        } for match in snapshot]}
+
+        response = StreamingHttpResponse(self.stream(hub, request.user.pk, channels, ready),
+                                         content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    def encode(event_type, data):
+        return f'event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n'
+
+    async def stream(self, hub, user_id, channels, ready):
+        slot = await hub.acquire(user_id)
+        if slot is None:
+            yield self.encode('error', {'detail': 'Too many open event streams.'})
+            return
+        # Subscribed before `ready` is sent, so nothing published after it is lost. A change committed between the
+        # snapshot query and this line is missed; the snapshot's version shows it.
+        subscription = hub.subscribe(channels)
+        try:
+            yield self.encode('ready', ready)
+            heartbeat = hub.options['HEARTBEAT_INTERVAL']
+            deadline = time.monotonic() + hub.options['MAX_DURATION']
+            renew_at = time.monotonic() + heartbeat
+            while (remaining := deadline - time.monotonic()) > 0:
+                if time.monotonic() >= renew_at:
+                    if not await hub.renew(slot):
+                        break
+                    renew_at = time.monotonic() + heartbeat
+                event = await subscription.next(min(heartbeat, remaining))
+                if event is not None:
+                    yield self.encode(event['type'], event['data'])
+                elif subscription.overflowed:
+                    break
+                else:
+                    yield ': heartbeat\n\n'
+        finally:
+            hub.unsubscribe(subscription)
+            await hub.release(slot)
@@ -0,0 +1,11 @@
+from sidelines_django_app.models import MatchInvitation, Team
+from sidelines_django_app.serializers import MatchInvitationSerializer
+from sidelines_django_app.views.asynchronous.AsyncInvitationListView import AsyncInvitationListView
+
+
+class AsyncMatchInvitationListView(AsyncInvitationListView):
+    model = MatchInvitation
+    serializer_class = MatchInvitationSerializer
+    effect_class = Team
+    from_field = 'from_team'
+    to_field = 'to_team'
@@ -0,0 +1,23 @@
+from django.http import JsonResponse
+from rest_framework import status
+
+from sidelines_django_app.filters import MatchFeedFilter
+from sidelines_django_app.models import Match
+from sidelines_django_app.serializers import MatchSerializer
+from sidelines_django_app.views.asynchronous.AsyncAPIView import AsyncAPIView
+
+
+class AsyncMatchView(AsyncAPIView):
+    async def get(self, request, match_id=None):
+        matches = Match.objects.for_payload()
+        if match_id is None:
+            feed = MatchFeedFilter.from_request(request)
+            if feed.error:
+                return JsonResponse({'detail': feed.error}, status=status.HTTP_400_BAD_REQUEST)
+            return await self.paginate(feed.apply(matches), MatchSerializer, ordering=feed.ordering)
+
+        try:
+            match = await matches.aget(pk=match_id)
+        except Match.DoesNotExist:
+            return self.not_found()
+        return JsonResponse(MatchSerializer(match).data)
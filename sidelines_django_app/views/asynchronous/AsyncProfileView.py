@@ -0,0 +1,21 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+
+from sidelines_django_app.models import Profile
+from sidelines_django_app.relationships import RelationshipResolver
+from sidelines_django_app.serializers.profile import ProfileSerializer
+from sidelines_django_app.views.asynchronous.AsyncAPIView import AsyncAPIView
+
+
+class AsyncProfileView(AsyncAPIView):
+    async def get(self, request, pk=None):
+        profile = await self.load_profile(request)
+        if pk is not None:
+            try:
+                profile = await Profile.objects.select_related('user').aget(pk=pk)
+            except Profile.DoesNotExist:
+                return self.not_found()
+
+        await sync_to_async(RelationshipResolver.for_request(request).prime)([profile])
+        serializer = ProfileSerializer(profile, context={'request': request})
+        return JsonResponse(serializer.data)
@@ -0,0 +1,8 @@
+from sidelines_django_app.models import TeamInvitation
+from sidelines_django_app.serializers import TeamInvitationSerializer
+from sidelines_django_app.views.asynchronous.AsyncInvitationListView import AsyncInvitationListView
+
+
+class AsyncTeamInvitationListView(AsyncInvitationListView):
+    model = TeamInvitation
+    serializer_class = TeamInvitationSerializer
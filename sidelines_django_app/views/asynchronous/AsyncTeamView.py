@@ -0,0 +1,18 @@
+from django.http import JsonResponse
+
+from sidelines_django_app.models import Team
+from sidelines_django_app.serializers import TeamSerializer
+from sidelines_django_app.views.asynchronous.AsyncAPIView import AsyncAPIView
+
+
+class AsyncTeamView(AsyncAPIView):
+    async def get(self, request, team_id=None):
+        teams = Team.objects.prefetch_related('members', 'admins')
+        if team_id is None:
+            return await self.paginate(teams, TeamSerializer)
+
+        try:
+            team = await teams.aget(pk=team_id)
+        except Team.DoesNotExist:
+            return self.not_found()
+        return JsonResponse(TeamSerializer(team).data)
@@ -0,0 +1,9 @@
+from .AsyncAPIView import AsyncAPIView
+from .AsyncProfileView import AsyncProfileView
+from .AsyncFriendsView import AsyncFriendsView
+from .AsyncTeamView import AsyncTeamView
+from .AsyncMatchView import AsyncMatchView
+from .AsyncFriendRequestListView import AsyncFriendRequestListView
+from .AsyncTeamInvitationListView import AsyncTeamInvitationListView
+from .AsyncMatchInvitationListView import AsyncMatchInvitationListView
+from .AsyncMatchEventsView import AsyncMatchEventsView
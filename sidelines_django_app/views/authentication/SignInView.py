@@ -1,31 +1,23 @@
 from django.contrib.auth import authenticate
-from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView
 
 from sidelines_django_app.serializers.profile.ProfilePictureSerializer import ProfilePictureSerializer
+from sidelines_django_app.throttles import SlidingWindowScopedRateThrottle
 
 
 class SignInView(APIView):
     permission_classes = [AllowAny]
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowScopedRateThrottle]
     throttle_scope = 'login'
 
     def post(self, request):
         identifier = request.data.get('username')
         password = request.data.get('password')
-        user = authenticate(username=identifier, password=password)
-
-        if user is None:
-            try:
-                user_obj = User.objects.get(email=identifier)
-                user = authenticate(username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                pass
+        user = authenticate(request, username=identifier, password=password)
 
         if user is not None:
             token, created = Token.objects.get_or_create(user=user)
@@ -1,11 +1,11 @@
 from django.contrib.auth.models import User
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from sidelines_django_app.authentication import CachedTokenAuthentication, PasswordHashingBusy
 from sidelines_django_app.serializers import UserSerializer
 
 
@@ -19,13 +19,15 @@ class SignUpView(APIView):
                 user = serializer.save()
                 token, created = Token.objects.get_or_create(user=user)
                 return Response({'token': token.key}, status=status.HTTP_201_CREATED)
+            except PasswordHashingBusy:
+                raise
             except Exception as e:
                 return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def username_unique_check(request):
     username = request.data.get('username')
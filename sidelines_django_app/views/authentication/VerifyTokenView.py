@@ -3,14 +3,14 @@ import time
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from sidelines_django_app.authentication import CachedTokenAuthentication
 from sidelines_django_app.serializers.profile.ProfilePictureSerializer import ProfilePictureSerializer
 
 
 class VerifyTokenView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -0,0 +1,129 @@
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from sidelines_django_app.models import FriendRequest, Match, MatchInvitation, Profile, Team, TeamInvitation
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpassword')
+        self.user3 = User.objects.create_user(username='user3', email='user3@example.com', password='testpassword')
+
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.profile2 = Profile.objects.create(user=self.user2)
+        self.profile3 = Profile.objects.create(user=self.user3)
+        self.profile1.friends.add(self.profile2)
+
+        self.team1 = Team.objects.create(team_name='Team 1')
+        self.team1.members.add(self.profile1, self.profile2)
+        self.team1.admins.add(self.profile1)
+        self.team2 = Team.objects.create(team_name='Team 2')
+        self.team2.members.add(self.profile3)
+        self.team2.admins.add(self.profile3)
+
+        self.match = Match.objects.create(home_team=self.team1, away_team=self.team2,
+                                          date_time='2024-12-01T15:00:00Z', location='Test Stadium')
+        FriendRequest.objects.create(from_profile=self.profile1, to_profile=self.profile3)
+        TeamInvitation.objects.create(from_profile=self.profile1, to_profile=self.profile3, team=self.team1)
+        MatchInvitation.objects.create(from_team=self.team1, to_team=self.team2, location='Test Stadium',
+                                       date_time='2024-12-08T15:00:00Z')
+
+        self.token1 = Token.objects.create(user=self.user1)
+        self.headers = {'Authorization': 'Token ' + self.token1.key}
+        self.client.credentials(HTTP_AUTHORIZATION=self.headers['Authorization'])
+
+        logger.info('Setup complete')
+
+    async def compare(self, name, async_name, kwargs=None, query=None):
+        sync_response = await sync_to_async(self.client.get)(reverse(f'api:{name}', kwargs=kwargs), query)
+        async_response = await self.async_client.get(reverse(f'api:{async_name}', kwargs=kwargs), query,
+                                                      headers=self.headers)
+        logger.debug('Response: %s', async_response.json())
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+
+        sync_data, async_data = sync_response.json(), async_response.json()
+        if 'results' in sync_data:
+            self.assertEqual(async_data['results'], sync_data['results'])
+            self.assertTrue(async_data['results'])
+        else:
+            self.assertEqual(async_data, sync_data)
+
+    async def test_async_endpoints_match_sync_responses(self):
+        logger.info('Testing async_endpoints_match_sync_responses')
+
+        await self.compare('profile', 'async-profile')
+        await self.compare('profile', 'async-profile', {'pk': self.profile3.pk})
+        await self.compare('profile-friends', 'async-profile-friends')
+        await self.compare('team-list', 'async-team-list')
+        await self.compare('team-detail', 'async-team-detail', {'team_id': self.team1.pk})
+        await self.compare('match-list', 'async-match-list')
+        await self.compare('match-detail', 'async-match-detail', {'match_id': self.match.pk})
+        await self.compare('friend-request-list', 'async-friend-request-list', {'request_type': 'sent'})
+        await self.compare('team-invitation-list', 'async-team-invitation-list', {'request_type': 'sent'})
+        await self.compare('match-invitation-list', 'async-match-invitation-list', {'request_type': 'received'},
+                           {'team': self.team2.pk})
+
+        logger.info('Test async_endpoints_match_sync_responses passed')
+
+    async def test_async_pagination_follows_next_link(self):
+        logger.info('Testing async_pagination_follows_next_link')
+
+        response = await self.async_client.get(reverse('api:async-team-list'), {'page_size': 1}, headers=self.headers)
+        logger.debug('Response: %s', response.json())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([team['id'] for team in response.json()['results']], [self.team2.pk])
+
+        response = await self.async_client.get(response.json()['next'], headers=self.headers)
+        logger.debug('Response: %s', response.json())
+        self.assertEqual([team['id'] for team in response.json()['results']], [self.team1.pk])
+        self.assertIsNone(response.json()['next'])
+
+        logger.info('Test async_pagination_follows_next_link passed')
+
+    async def test_async_requires_valid_token(self):
+        logger.info('Testing async_requires_valid_token')
+
+        response = await self.async_client.get(reverse('api:async-profile'))
+        logger.debug('Response: %s', response.json())
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = await self.async_client.get(reverse('api:async-profile'), headers={'Authorization': 'Token invalid'})
+        logger.debug('Response: %s', response.json())
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()['detail'], 'Invalid token.')
+
+        logger.info('Test async_requires_valid_token passed')
+
+    async def test_async_not_found_and_invalid_type(self):
+        logger.info('Testing async_not_found_and_invalid_type')
+
+        response = await self.async_client.get(reverse('api:async-team-detail', kwargs={'team_id': 999}),
+                                               headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = await self.async_client.get(reverse('api:async-profile', kwargs={'pk': 999}), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = await self.async_client.get(
+            reverse('api:async-friend-request-list', kwargs={'request_type': 'unknown'}), headers=self.headers)
+        logger.debug('Response: %s', response.json())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = await self.async_client.post(reverse('api:async-team-list'), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        logger.info('Test async_not_found_and_invalid_type passed')
@@ -0,0 +1,94 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+
+from sidelines_django_app.authentication import CachedTokenAuthentication, TokenCache
+from sidelines_django_app.models import Profile
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        TokenCache.default().clear()
+
+        self.client = APIClient()
+        self.factory = APIRequestFactory()
+        self.authentication = CachedTokenAuthentication()
+
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.token1 = Token.objects.create(user=self.user1)
+
+        logger.info('Setup complete')
+
+    def authenticate_request(self, key):
+        request = self.factory.get('/', HTTP_AUTHORIZATION='Token ' + key)
+        return self.authentication.authenticate(request)
+
+    def test_cold_cache_uses_one_joined_query(self):
+        logger.info('Testing cold_cache_uses_one_joined_query')
+
+        with self.assertNumQueries(1):
+            user, token = self.authenticate_request(self.token1.key)
+            self.assertEqual(user.pk, self.user1.pk)
+        logger.info('test_cold_cache_uses_one_joined_query passed')
+
+    def test_warm_cache_uses_no_queries(self):
+        logger.info('Testing warm_cache_uses_no_queries')
+
+        self.authenticate_request(self.token1.key)
+        with self.assertNumQueries(0):
+            user, token = self.authenticate_request(self.token1.key)
+            self.assertEqual(user.pk, self.user1.pk)
+
+        metrics = CachedTokenAuthentication.metrics()
+        self.assertEqual(metrics['misses'], 1)
+        self.assertEqual(metrics['local_hits'], 1)
+        logger.info('test_warm_cache_uses_no_queries passed')
+
+    def test_shared_tier_serves_other_workers(self):
+        logger.info('Testing shared_tier_serves_other_workers')
+
+        self.authenticate_request(self.token1.key)
+        TokenCache.default()._local.clear()
+
+        with self.assertNumQueries(0):
+            self.authenticate_request(self.token1.key)
+        self.assertEqual(CachedTokenAuthentication.metrics()['shared_hits'], 1)
+        logger.info('test_shared_tier_serves_other_workers passed')
+
+    def test_deleted_token_is_rejected(self):
+        logger.info('Testing deleted_token_is_rejected')
+
+        key = self.token1.key
+        self.authenticate_request(key)
+        self.token1.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate_request(key)
+        logger.info('test_deleted_token_is_rejected passed')
+
+    def test_profile_is_loaded_fresh(self):
+        logger.info('Testing profile_is_loaded_fresh')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token1.key)
+        response = self.client.get(reverse('api:verify-token'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Counters and version stamps move through queryset updates, which no cache invalidation sees.
+        Profile.touch([self.profile1.pk], pending_friend_requests=2)
+
+        user, _ = self.authenticate_request(self.token1.key)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.profile.pending_friend_requests, 2)
+        self.assertEqual(user.profile.version, Profile.objects.get(pk=self.profile1.pk).version)
+        logger.info('test_profile_is_loaded_fresh passed')
@@ -0,0 +1,139 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app.authentication import TokenCache
+from sidelines_django_app.models import FriendRequest, Match, MatchDetails, Profile, Team
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        TokenCache.default().clear()
+
+        self.client = APIClient()
+
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpassword')
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.profile2 = Profile.objects.create(user=self.user2)
+
+        self.team1 = Team.objects.create(team_name='Team 1')
+        self.team1.members.add(self.profile1)
+        self.team1.admins.add(self.profile1)
+        self.team2 = Team.objects.create(team_name='Team 2')
+        self.match = Match.objects.create(home_team=self.team1, away_team=self.team2,
+                                          date_time='2024-12-01T15:00:00Z', location='Test Stadium')
+
+        self.token1 = Token.objects.create(user=self.user1)
+        self.token2 = Token.objects.create(user=self.user2)
+
+        self.team_url = reverse('api:team-detail', kwargs={'team_id': self.team1.pk})
+        self.match_url = reverse('api:match-detail', kwargs={'match_id': self.match.pk})
+        self.profile_url = reverse('api:profile', kwargs={'pk': self.profile2.pk})
+
+        logger.info('Setup complete')
+
+    def authenticate(self, token):
+        logger.info('Authenticating user with token: %s', token)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+
+    def get(self, url, expected_status=status.HTTP_200_OK, **headers):
+        response = self.client.get(url, **headers)
+        logger.debug('Response: %s %s', response.status_code, getattr(response, 'data', None))
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def test_not_modified_costs_one_narrow_query(self):
+        logger.info('Testing not_modified_costs_one_narrow_query')
+        self.authenticate(self.token1.key)
+
+        # One query for the validators plus the throttle counter; nothing is fetched or serialized. The profile
+        # endpoint also loads the caller's profile, which is never cached with the token.
+        for url, queries in ((self.team_url, 2), (self.match_url, 2), (self.profile_url, 3)):
+            etag = self.get(url)['ETag']
+            with self.assertNumQueries(queries):
+                response = self.get(url, status.HTTP_304_NOT_MODIFIED, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(response.content, b'')
+
+        logger.info('Test not_modified_costs_one_narrow_query passed')
+
+    def test_if_modified_since(self):
+        logger.info('Testing if_modified_since')
+        self.authenticate(self.token1.key)
+
+        last_modified = self.get(self.team_url)['Last-Modified']
+        self.get(self.team_url, status.HTTP_304_NOT_MODIFIED, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.get(self.team_url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT')
+
+        logger.info('Test if_modified_since passed')
+
+    def test_team_etag_changes_on_write(self):
+        logger.info('Testing team_etag_changes_on_write')
+        self.authenticate(self.token1.key)
+
+        etag = self.get(self.team_url)['ETag']
+        self.team1.members.add(self.profile2)
+        response = self.get(self.team_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertCountEqual(response.data['members'], [self.profile1.pk, self.profile2.pk])
+
+        etag = response['ETag']
+        response = self.client.put(self.team_url, {'team_name': 'Renamed'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.get(self.team_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.data['team_name'], 'Renamed')
+        self.assertNotEqual(response['ETag'], etag)
+
+        logger.info('Test team_etag_changes_on_write passed')
+
+    def test_match_etag_changes_with_details(self):
+        logger.info('Testing match_etag_changes_with_details')
+        self.authenticate(self.token1.key)
+
+        etag = self.get(self.match_url)['ETag']
+        details = MatchDetails.objects.create(match=self.match, team=self.team1, score=1)
+        response = self.get(self.match_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual([item['id'] for item in response.data['details']], [details.pk])
+
+        logger.info('Test match_etag_changes_with_details passed')
+
+    def test_profile_etag_tracks_viewer_and_relationship(self):
+        logger.info('Testing profile_etag_tracks_viewer_and_relationship')
+        self.authenticate(self.token1.key)
+
+        etag = self.get(self.profile_url)['ETag']
+        FriendRequest.objects.create(from_profile=self.profile1, to_profile=self.profile2)
+        response = self.get(self.profile_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.data['is_friends'], 'pending')
+
+        etag = response['ETag']
+        self.user2.first_name = 'Second'
+        self.user2.save()
+        response = self.get(self.profile_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.data['first_name'], 'Second')
+
+        own_url = reverse('api:profile', kwargs={'pk': self.profile1.pk})
+        self.assertNotEqual(self.get(own_url)['ETag'], response['ETag'])
+
+        self.authenticate(self.token2.key)
+        self.get(self.profile_url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        logger.info('Test profile_etag_tracks_viewer_and_relationship passed')
+
+    def test_missing_resources_are_not_found(self):
+        logger.info('Testing missing_resources_are_not_found')
+        self.authenticate(self.token1.key)
+
+        self.get(reverse('api:team-detail', kwargs={'team_id': 999}), status.HTTP_404_NOT_FOUND)
+        self.get(reverse('api:profile', kwargs={'pk': 999}), status.HTTP_404_NOT_FOUND)
+
+        logger.info('Test missing_resources_are_not_found passed')
@@ -1,6 +1,8 @@
 import logging
 
 from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.authtoken.models import Token
@@ -62,7 +64,7 @@ class FriendRequestViewTests(APITestCase):
         response = self.client.get(url)
         logger.debug('Response: %s', response.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), self.profile1.sent_requests.count())
+        self.assertEqual(len(response.data['results']), self.profile1.sent_requests.count())
         logger.info('test_get_sent_friend_requests passed')
 
     def test_get_received_friend_requests(self):
@@ -77,7 +79,7 @@ class FriendRequestViewTests(APITestCase):
         response = self.client.get(url)
         logger.debug('Response: %s', response.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), self.profile1.received_requests.count())
+        self.assertEqual(len(response.data['results']), self.profile1.received_requests.count())
         logger.info('test_get_received_friend_requests passed')
 
     def test_send_friend_request(self):
@@ -118,6 +120,34 @@ class FriendRequestViewTests(APITestCase):
         self.assertIn('Cannot send a friend request to yourself.', response.data['detail'])
         logger.info('test_send_friend_request_to_self passed')
 
+    def test_send_friend_request_when_already_received(self):
+        logger.info('Testing send_friend_request_when_already_received')
+        self.authenticate(self.token1.key)
+
+        FriendRequest.objects.create(from_profile=self.profile2, to_profile=self.profile1)
+
+        data = {'to_profile': self.profile2.pk}
+        response = self.client.post(self.create_friend_request_url, data)
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Friend request already received from this user.', response.data['detail'])
+        logger.info('test_send_friend_request_when_already_received passed')
+
+    def test_send_friend_request_to_friend(self):
+        logger.info('Testing send_friend_request_to_friend')
+        self.authenticate(self.token1.key)
+
+        self.profile1.friends.add(self.profile2)
+
+        data = {'to_profile': self.profile2.pk}
+        response = self.client.post(self.create_friend_request_url, data)
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('This user is already your friend.', response.data['detail'])
+        logger.info('test_send_friend_request_to_friend passed')
+
     def test_accept_friend_request(self):
         logger.info('Testing accept_friend_request')
         self.authenticate(self.token2.key)
@@ -189,3 +219,82 @@ class FriendRequestViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('This user is not in your friends list.', response.data['detail'])
         logger.info('test_unfriend_non_friend passed')
+
+    def test_batch_accept_friend_requests(self):
+        logger.info('Testing batch_accept_friend_requests')
+        self.authenticate(self.token1.key)
+
+        requests = [FriendRequest.objects.create(from_profile=profile, to_profile=self.profile1)
+                    for profile in (self.profile2, self.profile3)]
+        url = reverse('api:friend-request-batch')
+
+        response = self.client.put(url, {'action': 'accept', 'ids': [request.pk for request in requests]},
+                                   format='json')
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertCountEqual(self.profile1.friends.all(), [self.profile2, self.profile3])
+        self.assertIn(self.profile1, self.profile3.friends.all())
+        self.assertFalse(FriendRequest.objects.exists())
+        logger.info('test_batch_accept_friend_requests passed')
+
+    def test_batch_action_is_all_or_nothing(self):
+        logger.info('Testing batch_action_is_all_or_nothing')
+        self.authenticate(self.token1.key)
+
+        received = FriendRequest.objects.create(from_profile=self.profile2, to_profile=self.profile1)
+        sent = FriendRequest.objects.create(from_profile=self.profile1, to_profile=self.profile3)
+        url = reverse('api:friend-request-batch')
+
+        response = self.client.put(url, {'action': 'ignore', 'ids': [received.pk, sent.pk]}, format='json')
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.put(url, {'action': 'ignore', 'ids': [received.pk, 999]}, format='json')
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['ids'], [999])
+
+        response = self.client.put(url, {'action': 'promote', 'ids': [received.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(FriendRequest.objects.count(), 2)
+
+        response = self.client.put(url, {'action': 'ignore', 'ids': [received.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(FriendRequest.objects.all()), [sent])
+        self.assertFalse(self.profile1.friends.exists())
+
+        response = self.client.post(url, {'to_profile': self.profile2.pk})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        logger.info('test_batch_action_is_all_or_nothing passed')
+
+    def test_friend_request_constraints(self):
+        logger.info('Testing friend_request_constraints')
+        FriendRequest.objects.create(from_profile=self.profile1, to_profile=self.profile2)
+
+        for from_profile, to_profile in ((self.profile2, self.profile1), (self.profile1, self.profile2),
+                                         (self.profile3, self.profile3)):
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                FriendRequest.objects.create(from_profile=from_profile, to_profile=to_profile)
+        logger.info('test_friend_request_constraints passed')
+
+    def test_send_friend_request_is_a_single_insert(self):
+        logger.info('Testing send_friend_request_is_a_single_insert')
+        self.authenticate(self.token1.key)
+        self.client.get(reverse('api:profile'))  # Warm the token cache.
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.create_friend_request_url, {'to_profile': self.profile2.pk})
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        friend_request_queries = [query['sql'] for query in queries.captured_queries
+                                  if FriendRequest._meta.db_table in query['sql']]
+        self.assertEqual(len(friend_request_queries), 1)
+        self.assertTrue(friend_request_queries[0].startswith('INSERT'))
+
+        response = self.client.post(self.create_friend_request_url, {'to_profile': self.profile2.pk})
+        self.assertEqual(response.data['detail'], 'Friend request already sent.')
+        self.assertEqual(FriendRequest.objects.count(), 1)
+        logger.info('test_send_friend_request_is_a_single_insert passed')
@@ -0,0 +1,78 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app.models import Profile, Team
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class FriendsViewTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.token1 = Token.objects.create(user=self.user1)
+
+        self.team = Team.objects.create(team_name='Test Team')
+        self.team.members.add(self.profile1)
+
+        self.friends_url = reverse('api:profile-friends')
+
+        logger.info('Setup complete')
+
+    def authenticate(self, token):
+        logger.info('Authenticating user with token: %s', token)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+
+    def add_friends(self, count, start=0):
+        friends = []
+        for number in range(start, start + count):
+            user = User.objects.create(username=f'friend{number}', email=f'friend{number}@example.com')
+            friend = Profile.objects.create(user=user)
+            self.profile1.friends.add(friend)
+            if number % 2 == 0:
+                self.team.members.add(friend)
+            friends.append(friend)
+        return friends
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.friends_url)
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    def test_get_friends_marks_teammates(self):
+        logger.info('Testing get_friends_marks_teammates')
+        self.authenticate(self.token1.key)
+
+        teammate, stranger = self.add_friends(2)
+
+        _, response = self.count_queries()
+        is_teammate = {friend['id']: friend['is_teammate'] for friend in response.data['results']}
+        self.assertEqual(is_teammate, {teammate.pk: True, stranger.pk: False})
+        logger.info('test_get_friends_marks_teammates passed')
+
+    def test_get_friends_query_count_is_constant(self):
+        logger.info('Testing get_friends_query_count_is_constant')
+        self.authenticate(self.token1.key)
+
+        self.add_friends(2)
+        self.count_queries()
+        small_count, _ = self.count_queries()
+
+        self.add_friends(10, start=2)
+        large_count, response = self.count_queries()
+
+        self.assertEqual(len(response.data['results']), 12)
+        self.assertEqual(small_count, large_count)
+        logger.info('test_get_friends_query_count_is_constant passed')
@@ -0,0 +1,75 @@
+import logging
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import F, Sum
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from sidelines_django_app.models import (FriendRequest, Match, MatchDetails, MatchInvitation, MatchVote, Profile,
+                                         Team, TeamInvitation)
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class GenerateLeagueTests(APITestCase):
+    def generate(self, **options):
+        call_command('generate_league', players=40, team_size=5, friends=8, matches=3, password='leaguepassword',
+                     stdout=StringIO(), **options)
+
+    def test_generates_consistent_league(self):
+        logger.info('Testing generates_consistent_league')
+        self.generate()
+
+        self.assertEqual(Profile.objects.filter(setup_complete=True).count(), 40)
+        self.assertEqual(Team.objects.count(), 8)
+        self.assertFalse(Team.objects.exclude(member_count=5).exists())
+        self.assertFalse(Team.objects.exclude(admin_count=2).exists())
+        self.assertEqual(Profile.friends.through.objects.count(), 40 * 8)
+        self.assertEqual(Match.objects.count(), 8 * 3)
+        self.assertEqual(MatchDetails.objects.count(), 2 * Match.objects.count())
+        self.assertEqual(MatchVote.objects.count(), 10 * Match.objects.count())
+        totals = Match.objects.aggregate(*(Sum(counter) for counter in Match.VOTE_COUNTERS))
+        self.assertEqual(sum(totals.values()), MatchVote.objects.count())
+        self.assertEqual(MatchInvitation.objects.count(), 8 * 2)
+        self.assertEqual(Team.objects.aggregate(total=Sum('pending_match_invitations'))['total'], 8 * 2)
+        self.assertEqual(Profile.objects.aggregate(total=Sum('pending_friend_requests'))['total'],
+                         FriendRequest.objects.count())
+        self.assertTrue(FriendRequest.objects.exists())
+        self.assertTrue(TeamInvitation.objects.exists())
+
+        # Pending requests are between strangers, and team invitations go to friends outside the team.
+        self.assertFalse(FriendRequest.objects.filter(from_profile__friends=F('to_profile')).exists())
+        self.assertFalse(TeamInvitation.objects.filter(team__members=F('to_profile')).exists())
+        self.assertEqual(TeamInvitation.objects.filter(from_profile__friends=F('to_profile')).count(),
+                         TeamInvitation.objects.count())
+        logger.info('test_generates_consistent_league passed')
+
+    def test_players_can_sign_in(self):
+        logger.info('Testing players_can_sign_in')
+        self.generate()
+
+        response = self.client.post(reverse('api:sign-in'), {'username': 'player7', 'password': 'leaguepassword'})
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        logger.info('test_players_can_sign_in passed')
+
+    def test_generation_is_deterministic(self):
+        logger.info('Testing generation_is_deterministic')
+        self.generate(seed=3)
+        first = list(Match.objects.order_by('pk').values_list('home_team__team_name', 'away_team__team_name'))
+
+        self.generate(seed=3, prefix='again')
+        second = list(Match.objects.order_by('pk').values_list('home_team__team_name', 'away_team__team_name'))
+        self.assertEqual(second[len(first):], first)
+        logger.info('test_generation_is_deterministic passed')
+
+    def test_refuses_existing_prefix(self):
+        logger.info('Testing refuses_existing_prefix')
+        self.generate()
+
+        with self.assertRaises(CommandError):
+            self.generate()
+        logger.info('test_refuses_existing_prefix passed')
@@ -0,0 +1,146 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app.models import FriendRequest, MatchInvitation, Profile, Team, TeamInvitation
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class InboxViewTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.users = [User.objects.create_user(username=f'user{number}', email=f'user{number}@example.com',
+                                               password='testpassword') for number in range(1, 6)]
+        self.profile1, self.profile2, self.profile3, self.profile4, self.profile5 = [
+            Profile.objects.create(user=user) for user in self.users
+        ]
+
+        self.team1 = Team.objects.create(team_name='Team 1')
+        self.team1.members.add(self.profile1)
+        self.team1.admins.add(self.profile1)
+        self.team2 = Team.objects.create(team_name='Team 2')
+        self.team2.members.add(self.profile3)
+        self.team2.admins.add(self.profile3)
+        # profile1 plays for Team 3 but does not administer it.
+        self.team3 = Team.objects.create(team_name='Team 3')
+        self.team3.members.add(self.profile1, self.profile4)
+        self.team3.admins.add(self.profile4)
+
+        start = datetime(2024, 12, 1, 12, tzinfo=timezone.utc)
+        self.friend_request = FriendRequest.objects.create(from_profile=self.profile2, to_profile=self.profile1)
+        self.team_invitation = TeamInvitation.objects.create(from_profile=self.profile3, to_profile=self.profile1,
+                                                             team=self.team2)
+        self.match_invitation = MatchInvitation.objects.create(from_team=self.team2, to_team=self.team1,
+                                                               location='Test Stadium',
+                                                               date_time='2024-12-20T15:00:00Z')
+        for offset, invitation in enumerate((self.friend_request, self.team_invitation, self.match_invitation)):
+            type(invitation).objects.filter(pk=invitation.pk).update(created_at=start + timedelta(hours=offset))
+
+        # Not for profile1: sent by them, or to a team they do not administer.
+        FriendRequest.objects.create(from_profile=self.profile1, to_profile=self.profile5)
+        MatchInvitation.objects.create(from_team=self.team2, to_team=self.team3, location='Test Stadium',
+                                       date_time='2024-12-21T15:00:00Z')
+
+        self.token1 = Token.objects.create(user=self.users[0])
+        self.inbox_url = reverse('api:inbox')
+
+        logger.info('Setup complete')
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def read_all(self, page_size):
+        items, url, pages = [], f'{self.inbox_url}?page_size={page_size}', 0
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            items.extend(response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return items, pages
+
+    def test_inbox_merges_pending_invitations(self):
+        logger.info('Testing inbox_merges_pending_invitations')
+        self.authenticate(self.token1)
+
+        response = self.client.get(self.inbox_url)
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['next'])
+
+        results = response.json()['results']
+        self.assertEqual([(item['type'], item['id']) for item in results], [
+            ('match_invitation', self.match_invitation.pk),
+            ('team_invitation', self.team_invitation.pk),
+            ('friend_request', self.friend_request.pk),
+        ])
+        self.assertEqual(results[0], {
+            'type': 'match_invitation', 'id': self.match_invitation.pk, 'created_at': '2024-12-01T14:00:00Z',
+            'from_team': self.team2.pk, 'from_team_name': 'Team 2', 'to_team': self.team1.pk, 'team_size': 7,
+            'date_time': '2024-12-20T15:00:00Z', 'location': 'Test Stadium',
+        })
+        self.assertEqual(results[1], {
+            'type': 'team_invitation', 'id': self.team_invitation.pk, 'created_at': '2024-12-01T13:00:00Z',
+            'from_profile': self.profile3.pk, 'from_username': 'user3', 'team': self.team2.pk, 'team_name': 'Team 2',
+        })
+        self.assertEqual(results[2], {
+            'type': 'friend_request', 'id': self.friend_request.pk, 'created_at': '2024-12-01T12:00:00Z',
+            'from_profile': self.profile2.pk, 'from_username': 'user2',
+        })
+        logger.info('test_inbox_merges_pending_invitations passed')
+
+    def test_inbox_pages_through_ties(self):
+        logger.info('Testing inbox_pages_through_ties')
+        sent_at = datetime(2024, 12, 2, tzinfo=timezone.utc)
+        for profile in (self.profile3, self.profile4):
+            FriendRequest.objects.create(from_profile=profile, to_profile=self.profile1)
+        MatchInvitation.objects.create(from_team=self.team3, to_team=self.team1, location='Test Stadium',
+                                       date_time='2024-12-22T15:00:00Z')
+        # Every invitation sent at the same instant, so only the type and id order them.
+        for model in (FriendRequest, TeamInvitation, MatchInvitation):
+            model.objects.update(created_at=sent_at)
+        self.authenticate(self.token1)
+
+        expected, _ = self.read_all(100)
+        self.assertEqual(len(expected), 6)
+        for page_size in (1, 2, 4):
+            items, pages = self.read_all(page_size)
+            self.assertEqual(items, expected, page_size)
+            self.assertEqual(pages, -(-len(expected) // page_size), page_size)
+        logger.info('test_inbox_pages_through_ties passed')
+
+    def test_answered_invitations_leave_the_inbox(self):
+        logger.info('Testing answered_invitations_leave_the_inbox')
+        self.authenticate(self.token1)
+        response = self.client.get(f'{self.inbox_url}?page_size=1')
+        next_url = response.data['next']
+
+        self.friend_request.accept()
+        self.match_invitation.ignore()
+        response = self.client.get(next_url)
+        self.assertEqual([(item['type'], item['id']) for item in response.data['results']],
+                         [('team_invitation', self.team_invitation.pk)])
+        logger.info('test_answered_invitations_leave_the_inbox passed')
+
+    def test_invalid_cursor(self):
+        logger.info('Testing invalid_cursor')
+        self.authenticate(self.token1)
+        for cursor in ('garbage', 'WyJ4IiwgImZyaWVuZF9yZXF1ZXN0IiwgMV0='):
+            response = self.client.get(f'{self.inbox_url}?cursor={cursor}')
+            logger.debug('Response: %s', response.data)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        logger.info('test_invalid_cursor passed')
+
+    def test_inbox_requires_authentication(self):
+        logger.info('Testing inbox_requires_authentication')
+        response = self.client.get(self.inbox_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        logger.info('test_inbox_requires_authentication passed')
@@ -0,0 +1,201 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from sidelines_django_app.models import FriendRequest, Match, MatchInvitation, Profile, Team, TeamInvitation
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class InvitationAcceptanceTests(TransactionTestCase):
+    """Fires concurrent accepts at one invitation from separate threads and connections."""
+    attempts = 8
+
+    def setUp(self):
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpassword')
+
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.profile2 = Profile.objects.create(user=self.user2)
+
+        self.team1 = Team.objects.create(team_name='Team 1')
+        self.team1.add_member(self.profile1, admin=True)
+        self.team2 = Team.objects.create(team_name='Team 2')
+        self.team2.add_member(self.profile2, admin=True)
+
+        logger.info('Setup complete')
+
+    def accept_concurrently(self, model, pk):
+        """Loads the invitation in every thread, then has them all accept it at once. Returns their answers."""
+        barrier = threading.Barrier(self.attempts)
+        answers = []
+        errors = []
+
+        def accept():
+            try:
+                invitation = model.objects.get(pk=pk)
+                barrier.wait()
+                # The claim writes first, so SQLite waits for the lock; "database is locked" fails the test.
+                answers.append(invitation.accept())
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=accept) for _ in range(self.attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        return answers
+
+    def test_concurrent_match_invitation_accepts(self):
+        logger.info('Testing concurrent_match_invitation_accepts')
+        invitation = MatchInvitation.objects.create(from_team=self.team1, to_team=self.team2, location='Test Field',
+                                                    date_time=timezone.now() + timedelta(days=1))
+
+        answers = self.accept_concurrently(MatchInvitation, invitation.pk)
+
+        self.assertEqual(sorted(answers), [False] * (self.attempts - 1) + [True])
+        self.assertEqual(Match.objects.count(), 1)
+        self.assertFalse(MatchInvitation.objects.exists())
+        logger.info('test_concurrent_match_invitation_accepts passed')
+
+    def test_concurrent_friend_request_accepts(self):
+        logger.info('Testing concurrent_friend_request_accepts')
+        friend_request = FriendRequest.objects.create(from_profile=self.profile1, to_profile=self.profile2)
+
+        answers = self.accept_concurrently(FriendRequest, friend_request.pk)
+
+        self.assertEqual(sorted(answers), [False] * (self.attempts - 1) + [True])
+        self.assertEqual(list(self.profile1.friends.all()), [self.profile2])
+        self.assertEqual(Profile.friends.through.objects.count(), 2)
+        self.assertFalse(FriendRequest.objects.exists())
+        logger.info('test_concurrent_friend_request_accepts passed')
+
+    def test_concurrent_team_invitation_accepts(self):
+        logger.info('Testing concurrent_team_invitation_accepts')
+        invitation = TeamInvitation.objects.create(from_profile=self.profile1, to_profile=self.profile2,
+                                                   team=self.team1)
+
+        answers = self.accept_concurrently(TeamInvitation, invitation.pk)
+
+        self.assertEqual(sorted(answers), [False] * (self.attempts - 1) + [True])
+        self.team1.refresh_from_db()
+        self.assertEqual(set(self.team1.members.all()), {self.profile1, self.profile2})
+        self.assertEqual(self.team1.member_count, 2)
+        self.assertFalse(TeamInvitation.objects.exists())
+        logger.info('test_concurrent_team_invitation_accepts passed')
+
+    def put_concurrently(self, url, data=None):
+        """Sends the same PUT as the recipient from every thread at once. Returns the responses."""
+        token = Token.objects.create(user=self.user2)
+        barrier = threading.Barrier(self.attempts)
+        responses = []
+        errors = []
+
+        def put():
+            try:
+                client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+                barrier.wait()
+                responses.append(client.put(url, data, format='json'))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=put) for _ in range(self.attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        return responses
+
+    def test_concurrent_accepts_through_the_view(self):
+        logger.info('Testing concurrent_accepts_through_the_view')
+        friend_request = FriendRequest.objects.create(from_profile=self.profile1, to_profile=self.profile2)
+        url = reverse('api:friend-request-action', kwargs={'request_id': friend_request.pk, 'action': 'accept'})
+
+        statuses = [response.status_code for response in self.put_concurrently(url)]
+
+        # Every loser sees the request already answered; none fails on the database lock.
+        self.assertEqual(sorted(statuses), [status.HTTP_200_OK] + [status.HTTP_404_NOT_FOUND] * (self.attempts - 1))
+        self.assertEqual(list(self.profile1.friends.all()), [self.profile2])
+        self.assertEqual(Profile.objects.get(pk=self.profile2.pk).pending_friend_requests, 0)
+        logger.info('test_concurrent_accepts_through_the_view passed')
+
+    def test_concurrent_batch_accepts_through_the_view(self):
+        logger.info('Testing concurrent_batch_accepts_through_the_view')
+        invitation = TeamInvitation.objects.create(from_profile=self.profile1, to_profile=self.profile2,
+                                                   team=self.team1)
+
+        responses = self.put_concurrently(reverse('api:team-invitation-batch'),
+                                          {'action': 'accept', 'ids': [invitation.pk]})
+
+        # A batch that loads the invitation after the claim finds it missing; one that loads it before but loses the
+        # claim answers with a count of zero. Exactly one batch claims it.
+        answered = [response.data['count'] for response in responses if response.status_code == status.HTTP_200_OK]
+        self.assertEqual(sum(answered), 1)
+        self.assertEqual(len(answered) + [response.status_code for response in responses].count(
+            status.HTTP_404_NOT_FOUND), self.attempts)
+        self.team1.refresh_from_db()
+        self.assertEqual(set(self.team1.members.all()), {self.profile1, self.profile2})
+        self.assertEqual(self.team1.member_count, 2)
+        self.assertFalse(TeamInvitation.objects.exists())
+        logger.info('test_concurrent_batch_accepts_through_the_view passed')
+
+    def test_answers_send_post_delete_from_the_claim(self):
+        logger.info('Testing answers_send_post_delete_from_the_claim')
+        profile3, profile4 = [Profile.objects.create(user=User.objects.create_user(
+            username=f'user{number}', email=f'user{number}@example.com', password='testpassword')) for number in (3, 4)]
+        FriendRequest.objects.create(from_profile=profile4, to_profile=self.profile2)
+        accepted = FriendRequest.objects.create(from_profile=self.profile1, to_profile=self.profile2)
+        ignored = FriendRequest.objects.create(from_profile=profile3, to_profile=self.profile2)
+        withdrawn = FriendRequest.objects.create(from_profile=profile3, to_profile=self.profile1)
+        withdrawn_pk = withdrawn.pk
+        received = []
+
+        def receiver(sender, instance, origin=None, **kwargs):
+            received.append((instance.pk, type(origin).__name__, getattr(origin, 'invitations', None)))
+
+        post_delete.connect(receiver, sender=FriendRequest)
+        try:
+            self.assertTrue(accepted.accept())
+            self.assertTrue(ignored.ignore())
+            withdrawn.delete()
+        finally:
+            post_delete.disconnect(receiver, sender=FriendRequest)
+
+        self.assertEqual(received, [(accepted.pk, 'Claim', [accepted]), (ignored.pk, 'Claim', [ignored]),
+                                    (withdrawn_pk, 'FriendRequest', None)])
+        # The claim's rows are counted once, not again by the withdrawal receiver.
+        self.assertEqual(Profile.objects.get(pk=self.profile2.pk).pending_friend_requests, 1)
+        self.assertEqual(Profile.objects.get(pk=self.profile1.pk).pending_friend_requests, 0)
+        logger.info('test_answers_send_post_delete_from_the_claim passed')
+
+    def test_accept_after_answer_is_a_no_op(self):
+        logger.info('Testing accept_after_answer_is_a_no_op')
+        invitation = MatchInvitation.objects.create(from_team=self.team1, to_team=self.team2, location='Test Field',
+                                                    date_time=timezone.now() + timedelta(days=1))
+        stale = MatchInvitation.objects.get(pk=invitation.pk)
+
+        self.assertTrue(invitation.ignore())
+        self.assertFalse(stale.accept())
+        self.assertFalse(Match.objects.exists())
+        logger.info('test_accept_after_answer_is_a_no_op passed')
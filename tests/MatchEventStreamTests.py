@@ -0,0 +1,226 @@
+import asyncio
+import json
+import logging
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from sidelines_django_app.events import LocalBroker, MatchEventHub
+from sidelines_django_app.models import Match, MatchDetails, MatchVote, Profile, Team
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class MatchEventStreamTests(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpassword')
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.profile2 = Profile.objects.create(user=self.user2)
+
+        self.team1 = Team.objects.create(team_name='Team 1')
+        self.team1.members.add(self.profile1)
+        self.team1.admins.add(self.profile1)
+        self.team2 = Team.objects.create(team_name='Team 2')
+        self.match = Match.objects.create(home_team=self.team1, away_team=self.team2, location='Test Stadium',
+                                          date_time='2024-12-01T15:00:00Z')
+        MatchVote.cast(self.match.pk, self.profile1.pk, 'maybe')
+
+        self.headers = {'Authorization': 'Token ' + Token.objects.create(user=self.user1).key}
+        self.hub = self.use_hub()
+
+        logger.info('Setup complete')
+
+    def use_hub(self, **options):
+        hub = MatchEventHub(LocalBroker(), {**MatchEventHub.DEFAULTS, 'HEARTBEAT_INTERVAL': 0.05,
+                                            'MAX_DURATION': 0.5, **options})
+        patcher = mock.patch.object(MatchEventHub, '_instance', hub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return hub
+
+    async def open(self, matches):
+        return await self.async_client.get(reverse('api:async-match-events'), {'matches': matches},
+                                           headers=self.headers)
+
+    @staticmethod
+    def parse(chunk):
+        """Returns (event type, data) for an event, or None for a heartbeat."""
+        chunk = chunk.decode()
+        if chunk.startswith(':'):
+            return None
+        lines = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+        return lines['event'], json.loads(lines['data'])
+
+    def commit(self, change):
+        """Makes a change as a request would, running the on-commit callbacks that publish its events."""
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+
+    async def test_stream_opens_with_snapshot(self):
+        logger.info('Testing stream_opens_with_snapshot')
+        response = await self.open(str(self.match.pk))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+        chunks = [chunk async for chunk in response.streaming_content]
+        logger.debug('Stream: %s', chunks)
+        event_type, data = self.parse(chunks[0])
+        self.assertEqual(event_type, 'ready')
+        self.assertEqual(data['matches'][0]['id'], self.match.pk)
+        self.assertEqual(data['matches'][0]['vote_counts'], {'accepted': 0, 'rejected': 0, 'maybe': 1})
+        # Nothing happened, so the rest of the stream is heartbeats until MAX_DURATION closes it.
+        self.assertTrue(chunks[1:])
+        self.assertEqual([self.parse(chunk) for chunk in chunks[1:]], [None] * (len(chunks) - 1))
+        logger.info('test_stream_opens_with_snapshot passed')
+
+    async def test_stream_delivers_committed_changes(self):
+        logger.info('Testing stream_delivers_committed_changes')
+        response = await self.open(str(self.match.pk))
+        stream = response.streaming_content
+        self.assertEqual(self.parse(await stream.__anext__())[0], 'ready')
+
+        def change():
+            MatchVote.cast(self.match.pk, self.profile2.pk, 'accepted')
+            MatchVote.cast(self.match.pk, self.profile1.pk, 'maybe')
+            MatchDetails.objects.create(match=self.match, team=self.team1, score=2)
+            self.team1.members.add(self.profile2)
+
+        await sync_to_async(self.commit)(change)
+        events = [self.parse(chunk) async for chunk in stream]
+        events = [event for event in events if event is not None]
+        logger.debug('Events: %s', events)
+
+        # The repeated vote changed nothing, so it is not streamed.
+        self.assertEqual([event_type for event_type, _ in events], ['vote', 'details', 'roster'])
+        self.assertEqual(events[0][1], {'match': self.match.pk, 'profile': self.profile2.pk, 'response': 'accepted',
+                                        'previous_response': None})
+        self.assertEqual(events[1][1]['score'], 2)
+        self.assertEqual(events[2][1], {'team': self.team1.pk, 'role': 'member', 'action': 'added',
+                                        'profiles': [self.profile2.pk]})
+        self.assertEqual(self.hub._subscriptions, {})
+        logger.info('test_stream_delivers_committed_changes passed')
+
+    async def test_rolled_back_changes_are_not_streamed(self):
+        logger.info('Testing rolled_back_changes_are_not_streamed')
+        response = await self.open(str(self.match.pk))
+        stream = response.streaming_content
+        await stream.__anext__()
+
+        # The test transaction is never committed, so the vote's on-commit publish never runs.
+        await sync_to_async(MatchVote.cast)(self.match.pk, self.profile2.pk, 'accepted')
+        events = [self.parse(chunk) async for chunk in stream]
+        self.assertEqual([event for event in events if event is not None], [])
+        logger.info('test_rolled_back_changes_are_not_streamed passed')
+
+    async def test_slow_stream_is_closed(self):
+        logger.info('Testing slow_stream_is_closed')
+        self.hub = self.use_hub(QUEUE_SIZE=2, MAX_DURATION=5)
+        response = await self.open(str(self.match.pk))
+        stream = response.streaming_content
+        await stream.__anext__()
+
+        for number in range(5):
+            self.hub.publish(f'match:{self.match.pk}', {'type': 'vote', 'data': {'number': number}})
+        events = [self.parse(chunk) async for chunk in stream]
+        # Two events fit in the queue; the stream then ends instead of running to MAX_DURATION.
+        self.assertEqual(events, [('vote', {'number': 0}), ('vote', {'number': 1})])
+        logger.info('test_slow_stream_is_closed passed')
+
+    async def test_connections_per_user_are_capped(self):
+        logger.info('Testing connections_per_user_are_capped')
+        self.use_hub(MAX_CONNECTIONS_PER_USER=1)
+        first = await self.open(str(self.match.pk))
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        first_stream = first.streaming_content
+        # The slot is taken once the stream starts.
+        self.assertEqual(self.parse(await first_stream.__anext__())[0], 'ready')
+
+        second = await self.open(str(self.match.pk))
+        logger.debug('Response: %s', second.json())
+        self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        # Ending the first stream frees its slot.
+        [chunk async for chunk in first_stream]
+        third = await self.open(str(self.match.pk))
+        self.assertEqual(third.status_code, status.HTTP_200_OK)
+        [chunk async for chunk in third.streaming_content]
+        logger.info('test_connections_per_user_are_capped passed')
+
+    async def test_unsent_stream_holds_no_slot(self):
+        logger.info('Testing unsent_stream_holds_no_slot')
+        self.use_hub(MAX_CONNECTIONS_PER_USER=1)
+        unsent = await self.open(str(self.match.pk))
+        self.assertEqual(unsent.status_code, status.HTTP_200_OK)
+
+        second = await self.open(str(self.match.pk))
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        stream = second.streaming_content
+        self.assertEqual(self.parse(await stream.__anext__())[0], 'ready')
+
+        # Started after the slot was taken, the first stream reports it and ends at once.
+        self.assertEqual([self.parse(chunk) async for chunk in unsent.streaming_content],
+                         [('error', {'detail': 'Too many open event streams.'})])
+        [chunk async for chunk in stream]
+        logger.info('test_unsent_stream_holds_no_slot passed')
+
+    async def test_reconnect_after_closing_a_stream(self):
+        logger.info('Testing reconnect_after_closing_a_stream')
+        self.use_hub(MAX_CONNECTIONS_PER_USER=1, MAX_DURATION=60)
+        first = await self.open(str(self.match.pk))
+        stream = first.streaming_content
+        self.assertEqual(self.parse(await stream.__anext__())[0], 'ready')
+
+        # The client goes away and the server abandons the response. Once it is collected, asyncio closes the view's
+        # stream generator, as done here, and the stream releases its slot.
+        await first._iterator.aclose()
+        self.assertTrue(await self.hub.has_free_slot(self.user1.pk))
+
+        second = await self.open(str(self.match.pk))
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        second_stream = second.streaming_content
+        self.assertEqual(self.parse(await second_stream.__anext__())[0], 'ready')
+        await second._iterator.aclose()
+        self.assertEqual(self.hub._subscriptions, {})
+        logger.info('test_reconnect_after_closing_a_stream passed')
+
+    async def test_unrenewed_slots_lapse(self):
+        logger.info('Testing unrenewed_slots_lapse')
+        hub = self.use_hub(MAX_CONNECTIONS_PER_USER=1)
+        slot = await hub.acquire(self.user1.pk)
+        self.assertIsNotNone(slot)
+        self.assertIsNone(await hub.acquire(self.user1.pk))
+        self.assertTrue(await hub.renew(slot))
+
+        # A stream that stopped running without releasing its slot, e.g. on a worker that died.
+        await asyncio.sleep(hub.lease + 0.05)
+        self.assertFalse(await hub.renew(slot))
+        other = await hub.acquire(self.user1.pk)
+        self.assertIsNotNone(other)
+        await hub.release(slot)
+        self.assertFalse(await hub.has_free_slot(self.user1.pk))
+        await hub.release(other)
+        self.assertTrue(await hub.has_free_slot(self.user1.pk))
+        logger.info('test_unrenewed_slots_lapse passed')
+
+    async def test_invalid_subscriptions_are_rejected(self):
+        logger.info('Testing invalid_subscriptions_are_rejected')
+        self.use_hub(MAX_MATCHES_PER_STREAM=2)
+        for matches, expected_status in (('', status.HTTP_400_BAD_REQUEST),
+                                         ('1,x', status.HTTP_400_BAD_REQUEST),
+                                         ('1,2,3', status.HTTP_400_BAD_REQUEST),
+                                         (f'{self.match.pk},{self.match.pk + 100}', status.HTTP_404_NOT_FOUND)):
+            response = await self.open(matches)
+            logger.debug('Response: %s', response.json())
+            self.assertEqual(response.status_code, expected_status, matches)
+
+        response = await self.async_client.get(reverse('api:async-match-events'), {'matches': self.match.pk})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        logger.info('test_invalid_subscriptions_are_rejected passed')
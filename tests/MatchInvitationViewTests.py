@@ -73,7 +73,7 @@ class MatchInvitationViewTests(APITestCase):
         response = self.client.get(url, data)
         logger.debug('Response: %s', response.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), self.team1.sent_invitations.count())
+        self.assertEqual(len(response.data['results']), self.team1.sent_invitations.count())
         logger.info('test_get_sent_match_invitations passed')
 
     def test_get_received_match_invitations(self):
@@ -88,7 +88,7 @@ class MatchInvitationViewTests(APITestCase):
         response = self.client.get(url, data)
         logger.debug('Response: %s', response.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), self.team2.received_invitations.count())
+        self.assertEqual(len(response.data['results']), self.team2.received_invitations.count())
         logger.info('test_get_received_match_invitations passed')
 
     def test_send_match_invitation(self):
@@ -117,6 +117,21 @@ class MatchInvitationViewTests(APITestCase):
         self.assertIn('Cannot send a match invitation to the same team.', response.data['detail'])
         logger.info('test_send_match_invitation_to_same_team passed')
 
+    def test_send_duplicate_match_invitation(self):
+        logger.info('Testing send_duplicate_match_invitation')
+        self.authenticate(self.token1.key)
+
+        data = {'from_team': self.team1.pk, 'to_team': self.team2.pk, 'team_size': 11,
+                'location': 'Test Location', 'date_time': '2024-08-10T15:00:00Z'}
+        self.client.post(self.create_match_invitation_url, data)
+        response = self.client.post(self.create_match_invitation_url, data)
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Match invitation already sent.', response.data['detail'])
+        self.assertEqual(MatchInvitation.objects.count(), 1)
+        logger.info('test_send_duplicate_match_invitation passed')
+
     def test_send_match_invitation_as_non_admin(self):
         logger.info('Testing send_match_invitation_as_non_admin')
         self.authenticate(self.token2.key)
@@ -181,3 +196,28 @@ class MatchInvitationViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertFalse(MatchInvitation.objects.filter(pk=match_invitation.pk).exists())
         logger.info('test_withdraw_match_invitation passed')
+
+    def test_batch_accept_match_invitations(self):
+        logger.info('Testing batch_accept_match_invitations')
+
+        invitations = [MatchInvitation.objects.create(from_team=self.team1, to_team=self.team2, location='Pitch',
+                                                      date_time=f'2024-12-0{day}T15:00:00Z') for day in (1, 2)]
+        url = reverse('api:match-invitation-batch')
+
+        self.authenticate(self.token1.key)
+        response = self.client.put(url, {'action': 'accept', 'ids': [invitation.pk for invitation in invitations]},
+                                   format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.authenticate(self.token2.key)
+        response = self.client.put(url, {'action': 'accept', 'ids': [invitation.pk for invitation in invitations]},
+                                   format='json')
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Match.objects.filter(home_team=self.team1, away_team=self.team2).count(), 2)
+        self.assertFalse(MatchInvitation.objects.exists())
+
+        response = self.client.get(reverse('api:match-list'))
+        self.assertEqual(len(response.data['results']), 2)
+        logger.info('test_batch_accept_match_invitations passed')
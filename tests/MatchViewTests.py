@@ -1,10 +1,16 @@
 import logging
+from datetime import timedelta
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient, APITestCase
-from sidelines_django_app.models import Profile, Match, MatchVote, Team
+from sidelines_django_app.models import Profile, Match, MatchDetails, MatchVote, Team
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -64,9 +70,184 @@ class MatchViewTests(APITestCase):
         logger.debug('Response: %s', response.data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), Match.objects.count())
+        self.assertEqual(len(response.data['results']), Match.objects.count())
         logger.info('test_get_all_matches passed')
 
+    def test_get_all_matches_paginated(self):
+        logger.info('Testing get_all_matches_paginated')
+        self.authenticate(self.token1.key)
+
+        for day in range(2, 5):
+            Match.objects.create(home_team=self.team1, away_team=self.team2,
+                                 date_time=f'2024-12-0{day}T15:00:00Z', location='Test Stadium')
+
+        url = reverse('api:match-list')
+        first_page = self.client.get(url, {'page_size': 2})
+        logger.debug('Response: %s', first_page.data)
+        self.assertEqual(first_page.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first_page.data['results']), 2)
+
+        Match.objects.create(home_team=self.team1, away_team=self.team2,
+                             date_time='2024-12-10T15:00:00Z', location='Late Insert')
+
+        second_page = self.client.get(first_page.data['next'])
+        logger.debug('Response: %s', second_page.data)
+        self.assertEqual(len(second_page.data['results']), 2)
+        self.assertIsNone(second_page.data['next'])
+
+        seen = [match['id'] for match in first_page.data['results'] + second_page.data['results']]
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), set(Match.objects.exclude(location='Late Insert').values_list('id', flat=True)))
+        logger.info('test_get_all_matches_paginated passed')
+
+    def create_fixtures(self):
+        """A past and an upcoming match between team1 and team2, and an upcoming one team1 is not part of."""
+        now = timezone.now()
+        self.team3 = Team.objects.create(team_name='Team 3')
+        self.past_match = Match.objects.create(home_team=self.team2, away_team=self.team1, location='Away Ground',
+                                               date_time=now - timedelta(days=3))
+        self.next_match = Match.objects.create(home_team=self.team1, away_team=self.team2, location='Home Ground',
+                                               date_time=now + timedelta(days=3))
+        self.later_match = Match.objects.create(home_team=self.team1, away_team=self.team2, location='Home Ground',
+                                                date_time=now + timedelta(days=10))
+        self.other_match = Match.objects.create(home_team=self.team2, away_team=self.team3, location='Elsewhere',
+                                                date_time=now + timedelta(days=5))
+
+    def match_ids(self, url, params=None):
+        response = self.client.get(url, params)
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [match['id'] for match in response.data['results']]
+
+    def test_filter_matches(self):
+        logger.info('Testing filter_matches')
+        self.authenticate(self.token1.key)
+        self.create_fixtures()
+        self.team1.members.add(self.profile1)
+        url = reverse('api:match-list')
+
+        self.assertEqual(set(self.match_ids(url, {'team': self.team3.pk})), {self.other_match.pk})
+        self.assertEqual(self.match_ids(url, {'team': self.team1.pk, 'when': 'upcoming'}),
+                         [self.next_match.pk, self.later_match.pk])
+        self.assertEqual(self.match_ids(url, {'team': self.team1.pk, 'when': 'past'}),
+                         [self.past_match.pk, self.match.pk])
+        self.assertEqual(set(self.match_ids(url, {'profile': self.profile1.pk})),
+                         {self.match.pk, self.past_match.pk, self.next_match.pk, self.later_match.pk})
+
+        start = (timezone.now() + timedelta(days=4)).date().isoformat()
+        end = (timezone.now() + timedelta(days=10)).date().isoformat()
+        self.assertEqual(self.match_ids(url, {'from': start, 'to': end}), [self.later_match.pk, self.other_match.pk])
+        logger.info('test_filter_matches passed')
+
+    def test_filter_matches_with_invalid_parameters(self):
+        logger.info('Testing filter_matches_with_invalid_parameters')
+        self.authenticate(self.token1.key)
+        url = reverse('api:match-list')
+
+        for params in ({'team': 'abc'}, {'from': 'yesterday'}, {'when': 'soon'}):
+            response = self.client.get(url, params)
+            logger.debug('Response: %s', response.data)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        logger.info('test_filter_matches_with_invalid_parameters passed')
+
+    def test_my_matches(self):
+        logger.info('Testing my_matches')
+        self.authenticate(self.token1.key)
+        self.create_fixtures()
+        url = reverse('api:my-matches')
+
+        self.assertEqual(self.match_ids(url), [])
+
+        self.team1.members.add(self.profile1)
+        self.assertEqual(self.match_ids(url),
+                         [self.later_match.pk, self.next_match.pk, self.past_match.pk, self.match.pk])
+        self.assertEqual(self.match_ids(url, {'when': 'upcoming'}), [self.next_match.pk, self.later_match.pk])
+        logger.info('test_my_matches passed')
+
+    def read_feed(self, url, params):
+        ids, response = [], self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(match['id'] for match in response.data['results'])
+            if response.data['next'] is None:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_feeds_page_through_tied_kick_offs(self):
+        logger.info('Testing feeds_page_through_tied_kick_offs')
+        self.authenticate(self.token1.key)
+        self.team1.members.add(self.profile1)
+        kick_off = timezone.now() + timedelta(days=1)
+        tied = [Match.objects.create(home_team=self.team1, away_team=self.team2, location='Test Stadium',
+                                     date_time=kick_off).pk for _ in range(4)]
+
+        # Matches kicking off together are ordered by id, so no page repeats or skips one of them.
+        self.assertEqual(self.read_feed(reverse('api:match-list'), {'when': 'upcoming', 'page_size': 1}), tied)
+        self.assertEqual(self.read_feed(reverse('api:my-matches'), {'page_size': 2}),
+                         [*reversed(tied), self.match.pk])
+        logger.info('test_feeds_page_through_tied_kick_offs passed')
+
+    def test_my_matches_is_one_match_query(self):
+        logger.info('Testing my_matches_is_one_match_query')
+        self.authenticate(self.token1.key)
+        self.create_fixtures()
+        self.team1.members.add(self.profile1)
+        url = reverse('api:my-matches')
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'when': 'upcoming'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        match_queries = [query['sql'] for query in queries if 'FROM "sidelines_django_app_match"' in query['sql']]
+        self.assertEqual(len(match_queries), 1)
+        self.assertNotIn('team_members', match_queries[0])
+        logger.info('test_my_matches_is_one_match_query passed')
+
+    def test_match_payload_embeds_details_and_vote_counts(self):
+        logger.info('Testing match_payload_embeds_details_and_vote_counts')
+        self.authenticate(self.token1.key)
+        MatchDetails.objects.create(match=self.match, team=self.team1, score=3)
+        MatchVote.objects.create(match=self.match, profile=self.profile1, response='accepted')
+        MatchVote.objects.create(match=self.match, profile=self.profile2, response='maybe')
+
+        for url in (reverse('api:match-detail', kwargs={'match_id': self.match.pk}),
+                    reverse('api:async-match-detail', kwargs={'match_id': self.match.pk})):
+            response = self.client.get(url)
+            logger.debug('Response: %s', response.json())
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()['details'][0]['score'], 3)
+            self.assertEqual(response.json()['vote_counts'], {'accepted': 1, 'rejected': 0, 'maybe': 1})
+
+        url = reverse('api:vote', kwargs={'match_id': self.match.pk})
+        self.client.post(url, {'vote': 'rejected'})
+        response = self.client.get(reverse('api:match-list'))
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.data['results'][0]['vote_counts'], {'accepted': 0, 'rejected': 1, 'maybe': 1})
+        logger.info('test_match_payload_embeds_details_and_vote_counts passed')
+
+    def test_match_list_query_count_is_constant(self):
+        logger.info('Testing match_list_query_count_is_constant')
+        self.authenticate(self.token1.key)
+        url = reverse('api:match-list')
+        self.client.get(reverse('api:profile'))
+
+        def count_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries)
+
+        single = count_queries()
+        for day in range(2, 12):
+            match = Match.objects.create(home_team=self.team1, away_team=self.team2, location='Test Stadium',
+                                         date_time=f'2024-12-{day:02}T15:00:00Z')
+            MatchDetails.objects.create(match=match, team=self.team1)
+            MatchVote.objects.create(match=match, profile=self.profile1, response='accepted')
+        self.client.get(reverse('api:profile'))
+        self.assertEqual(count_queries(), single)
+        logger.info('test_match_list_query_count_is_constant passed')
+
     def test_vote_on_match(self):
         logger.info('Testing vote_on_match')
         self.authenticate(self.token1.key)
@@ -119,4 +300,7 @@ class MatchViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         match_vote = MatchVote.objects.get(match=self.match, profile=self.profile1)
         self.assertEqual(match_vote.response, 'accepted')
+        # The plain save above was recounted, and the revote moved its vote from one counter to the other.
+        match = Match.objects.get(pk=self.match.pk)
+        self.assertEqual((match.accepted_votes, match.rejected_votes, match.maybe_votes), (1, 0, 0))
         logger.info('test_revote_on_match passed')
@@ -0,0 +1,136 @@
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TransactionTestCase
+
+from sidelines_django_app.models import Match, MatchVote, Profile, Team, vote_cast
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class MatchVoteConcurrencyTests(TransactionTestCase):
+    """Votes on one match from hundreds of profiles at once and checks the counters against the votes."""
+    voters = 300
+    workers = 32
+
+    def setUp(self):
+        users = User.objects.bulk_create([
+            User(username=f'voter{number}', email=f'voter{number}@example.com') for number in range(self.voters)
+        ])
+        self.profiles = Profile.objects.bulk_create([Profile(user=user) for user in users])
+
+        self.team1 = Team.objects.create(team_name='Team 1')
+        self.team2 = Team.objects.create(team_name='Team 2')
+        self.match = Match.objects.create(home_team=self.team1, away_team=self.team2, location='Test Stadium',
+                                          date_time='2024-12-01T15:00:00Z')
+
+        logger.info('Setup complete')
+
+    @staticmethod
+    def vote(profile_id, match_id, response):
+        # The vote's insert is its first statement, so SQLite waits for the lock; "database is locked" fails the test.
+        MatchVote.cast(match_id, profile_id, response)
+
+    def run_concurrently(self, tasks):
+        errors = []
+
+        def run(task):
+            try:
+                self.vote(*task)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(run, tasks))
+        self.assertEqual(errors, [])
+
+    def counters(self):
+        match = Match.objects.get(pk=self.match.pk)
+        return {response: getattr(match, Match.vote_counter(response)) for response, _ in MatchVote.RESPONSE_CHOICES}
+
+    def test_concurrent_voters(self):
+        logger.info('Testing concurrent_voters')
+        rng = random.Random(1)
+        responses = [response for response, _ in MatchVote.RESPONSE_CHOICES]
+        first = [(profile.pk, self.match.pk, rng.choice(responses)) for profile in self.profiles]
+        second = [(profile.pk, self.match.pk, rng.choice(responses)) for profile in self.profiles[::2]]
+
+        self.run_concurrently(first)
+        self.run_concurrently(second)
+
+        final = {profile_id: response for profile_id, _, response in first + second}
+        expected = {response: list(final.values()).count(response) for response in responses}
+        self.assertEqual(self.counters(), expected)
+        self.assertEqual(MatchVote.objects.filter(match=self.match).count(), self.voters)
+        logger.info('test_concurrent_voters passed')
+
+    def test_concurrent_votes_by_one_profile(self):
+        logger.info('Testing concurrent_votes_by_one_profile')
+        responses = [response for response, _ in MatchVote.RESPONSE_CHOICES]
+        barrier = threading.Barrier(self.workers)
+
+        def vote(number):
+            try:
+                barrier.wait()
+                self.vote(self.profiles[0].pk, self.match.pk, responses[number % len(responses)])
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(vote, range(self.workers)))
+
+        final = MatchVote.objects.get(match=self.match, profile=self.profiles[0]).response
+        self.assertEqual(self.counters(), {response: int(response == final) for response in responses})
+        logger.info('test_concurrent_votes_by_one_profile passed')
+
+    def test_cast_sends_vote_cast_and_saves_are_recounted(self):
+        logger.info('Testing cast_sends_vote_cast_and_saves_are_recounted')
+        cast, saved = [], []
+
+        def on_cast(sender, vote, previous_response, **kwargs):
+            cast.append((vote.profile_id, vote.response, previous_response))
+
+        def on_save(sender, instance, **kwargs):
+            saved.append(instance.pk)
+
+        vote_cast.connect(on_cast, sender=MatchVote)
+        post_save.connect(on_save, sender=MatchVote)
+        try:
+            self.vote(self.profiles[0].pk, self.match.pk, 'accepted')
+            self.vote(self.profiles[0].pk, self.match.pk, 'maybe')
+            vote = MatchVote.objects.create(match=self.match, profile=self.profiles[1], response='rejected')
+        finally:
+            vote_cast.disconnect(on_cast, sender=MatchVote)
+            post_save.disconnect(on_save, sender=MatchVote)
+
+        profile_id = self.profiles[0].pk
+        self.assertEqual(cast, [(profile_id, 'accepted', None), (profile_id, 'maybe', 'accepted')])
+        self.assertEqual(saved, [vote.pk])
+        self.assertEqual(self.counters(), {'accepted': 0, 'rejected': 1, 'maybe': 1})
+        logger.info('test_cast_sends_vote_cast_and_saves_are_recounted passed')
+
+    def test_reconcile_repairs_drifted_counters(self):
+        logger.info('Testing reconcile_repairs_drifted_counters')
+        self.vote(self.profiles[0].pk, self.match.pk, 'accepted')
+        other = Match.objects.create(home_team=self.team2, away_team=self.team1, location='Test Stadium',
+                                     date_time='2024-12-08T15:00:00Z')
+        # Written around the counters, as bulk loads and raw SQL do.
+        MatchVote.objects.bulk_create([MatchVote(match=other, profile=profile, response='maybe')
+                                       for profile in self.profiles[:5]])
+
+        out = StringIO()
+        call_command('reconcile_vote_counts', batch_size=1, stdout=out)
+        self.assertIn('Checked 2 matches and repaired 1 vote counters.', out.getvalue())
+        self.assertEqual(self.counters(), {'accepted': 1, 'rejected': 0, 'maybe': 0})
+        self.assertEqual(Match.objects.get(pk=other.pk).maybe_votes, 5)
+        logger.info('test_reconcile_repairs_drifted_counters passed')
@@ -0,0 +1,162 @@
+import logging
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app.authentication import TokenCache
+from sidelines_django_app.models import FriendRequest, MatchInvitation, Profile, Team, TeamInvitation
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class PendingCounterTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.users = [User.objects.create_user(username=f'user{number}', email=f'user{number}@example.com',
+                                               password='testpassword') for number in range(1, 5)]
+        self.profile1, self.profile2, self.profile3, self.profile4 = [
+            Profile.objects.create(user=user) for user in self.users
+        ]
+        self.profile1.friends.add(self.profile2, self.profile3)
+
+        self.team1 = Team.objects.create(team_name='Team 1')
+        self.team1.members.add(self.profile1)
+        self.team1.admins.add(self.profile1)
+        self.team2 = Team.objects.create(team_name='Team 2')
+        self.team2.members.add(self.profile2)
+        self.team2.admins.add(self.profile2)
+
+        self.tokens = [Token.objects.create(user=user) for user in self.users]
+
+        logger.info('Setup complete')
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def profile_counters(self, profile):
+        return tuple(Profile.objects.filter(pk=profile.pk).values_list(*Profile.PENDING_COUNTERS).get())
+
+    def team_counter(self, team):
+        return Team.objects.get(pk=team.pk).pending_match_invitations
+
+    def test_counters_follow_sent_and_answered_invitations(self):
+        logger.info('Testing counters_follow_sent_and_answered_invitations')
+        self.authenticate(self.tokens[3])
+        response = self.client.post(reverse('api:create-friend-request'), {'to_profile': self.profile2.pk})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.authenticate(self.tokens[0])
+        response = self.client.post(reverse('api:create-team-invitation'),
+                                    {'to_profile': self.profile2.pk, 'team': self.team1.pk})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(reverse('api:bulk-create-team-invitation'),
+                                    {'to_profiles': [self.profile3.pk], 'team': self.team1.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(reverse('api:create-match-invitation'), {
+            'from_team': self.team1.pk, 'to_team': self.team2.pk, 'team_size': 7, 'location': 'Test Stadium',
+            'date_time': '2024-12-01T15:00:00Z',
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.profile_counters(self.profile2), (1, 1))
+        self.assertEqual(self.profile_counters(self.profile3), (0, 1))
+        self.assertEqual(self.team_counter(self.team2), 1)
+
+        self.authenticate(self.tokens[1])
+        friend_request = FriendRequest.objects.get(to_profile=self.profile2)
+        response = self.client.put(reverse('api:friend-request-action', kwargs={'request_id': friend_request.pk,
+                                                                               'action': 'ignore'}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.put(reverse('api:team-invitation-batch'), {
+            'action': 'accept', 'ids': [TeamInvitation.objects.get(to_profile=self.profile2).pk],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.put(reverse('api:match-invitation-action', kwargs={
+            'request_id': MatchInvitation.objects.get().pk, 'action': 'accept',
+        }))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.profile_counters(self.profile2), (0, 0))
+        self.assertEqual(self.team_counter(self.team2), 0)
+        logger.info('test_counters_follow_sent_and_answered_invitations passed')
+
+    def test_withdrawn_and_cascaded_invitations(self):
+        logger.info('Testing withdrawn_and_cascaded_invitations')
+        friend_request = FriendRequest.objects.create(from_profile=self.profile4, to_profile=self.profile1)
+        TeamInvitation.objects.create(from_profile=self.profile1, to_profile=self.profile2, team=self.team1)
+        MatchInvitation.objects.create(from_team=self.team1, to_team=self.team2, location='Test Stadium',
+                                       date_time='2024-12-01T15:00:00Z')
+        self.assertEqual(self.profile_counters(self.profile1), (1, 0))
+
+        self.authenticate(self.tokens[3])
+        response = self.client.delete(reverse('api:friend-request-detail', kwargs={'request_id': friend_request.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.profile_counters(self.profile1), (0, 0))
+
+        # Deleting Team 1 deletes the invitation to join it and its invitation to Team 2.
+        self.authenticate(self.tokens[0])
+        response = self.client.delete(reverse('api:team-detail', kwargs={'team_id': self.team1.pk}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.profile_counters(self.profile2), (0, 0))
+        self.assertEqual(self.team_counter(self.team2), 0)
+        logger.info('test_withdrawn_and_cascaded_invitations passed')
+
+    def test_saving_a_profile_keeps_its_counters(self):
+        logger.info('Testing saving_a_profile_keeps_its_counters')
+        profile = Profile.objects.get(pk=self.profile2.pk)
+        FriendRequest.objects.create(from_profile=self.profile4, to_profile=self.profile2)
+        profile.goals = 3
+        profile.save()
+        self.assertEqual(self.profile_counters(self.profile2), (1, 0))
+        logger.info('test_saving_a_profile_keeps_its_counters passed')
+
+    def test_badge_counts(self):
+        logger.info('Testing badge_counts')
+        FriendRequest.objects.create(from_profile=self.profile4, to_profile=self.profile1)
+        TeamInvitation.objects.create(from_profile=self.profile2, to_profile=self.profile1, team=self.team2)
+        MatchInvitation.objects.create(from_team=self.team2, to_team=self.team1, location='Test Stadium',
+                                       date_time='2024-12-01T15:00:00Z')
+        self.authenticate(self.tokens[0])
+        url = reverse('api:inbox-counts')
+
+        TokenCache.default().clear()
+        self.client.get(url)
+        # The throttle's counter, then the counts; the token comes from the cache.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'friend_requests': 1, 'team_invitations': 1, 'match_invitations': 1, 'total': 3,
+            'teams': [{'id': self.team1.pk, 'match_invitations': 1}],
+        })
+
+        self.client.credentials()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        logger.info('test_badge_counts passed')
+
+    def test_reconcile_repairs_drifted_counters(self):
+        logger.info('Testing reconcile_repairs_drifted_counters')
+        FriendRequest.objects.create(from_profile=self.profile4, to_profile=self.profile1)
+        # Written around the counters, as bulk loads and raw SQL do.
+        FriendRequest.objects.bulk_create([FriendRequest(from_profile=self.profile4, to_profile=self.profile2)])
+        MatchInvitation.objects.bulk_create([MatchInvitation(from_team=self.team1, to_team=self.team2,
+                                                             location='Test Stadium',
+                                                             date_time='2024-12-01T15:00:00Z')])
+        Profile.objects.filter(pk=self.profile3.pk).update(pending_team_invitations=4)
+
+        out = StringIO()
+        call_command('reconcile_pending_counts', batch_size=1, stdout=out)
+        self.assertIn('Repaired 3 pending invitation counters.', out.getvalue())
+        self.assertEqual(self.profile_counters(self.profile1), (1, 0))
+        self.assertEqual(self.profile_counters(self.profile2), (1, 0))
+        self.assertEqual(self.profile_counters(self.profile3), (0, 0))
+        self.assertEqual(self.team_counter(self.team2), 1)
+        logger.info('test_reconcile_repairs_drifted_counters passed')
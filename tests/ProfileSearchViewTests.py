@@ -0,0 +1,155 @@
+import logging
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app.models import Profile
+from sidelines_django_app.search import ProfileSearchIndex
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class ProfileSearchViewTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user1 = User.objects.create_user(username='viewer', email='viewer@example.com', password='testpassword',
+                                              first_name='John', last_name='Viewer')
+        self.user2 = User.objects.create_user(username='johnny_b', email='user2@example.com', password='testpassword',
+                                              first_name='Johnny', last_name='Goldsmith')
+        self.user3 = User.objects.create_user(username='jsmith', email='user3@example.com', password='testpassword',
+                                              first_name='Jane', last_name='Smith')
+        self.user4 = User.objects.create_user(username='johanna', email='user4@example.com', password='testpassword',
+                                              first_name='Johanna', last_name='Müller')
+
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.profile2 = Profile.objects.create(user=self.user2)
+        self.profile3 = Profile.objects.create(user=self.user3)
+        self.profile4 = Profile.objects.create(user=self.user4)
+
+        self.token1 = Token.objects.create(user=self.user1)
+
+        self.search_url = reverse('api:profile-search')
+
+        logger.info('Setup complete')
+
+    def authenticate(self, token):
+        logger.info('Authenticating user with token: %s', token)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+
+    def search(self, query, **params):
+        response = self.client.get(self.search_url, {'query': query, **params})
+        logger.debug('Response: %s', response.data)
+        return response
+
+    def test_search_by_prefix(self):
+        logger.info('Testing search_by_prefix')
+        self.authenticate(self.token1.key)
+
+        response = self.search('joh')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [result['id'] for result in response.data['results']]
+        self.assertCountEqual(ids, [self.profile2.pk, self.profile4.pk])
+        self.assertNotIn(self.profile1.pk, ids)
+        logger.info('test_search_by_prefix passed')
+
+    def test_search_normalizes_accents_and_case(self):
+        logger.info('Testing search_normalizes_accents_and_case')
+        self.authenticate(self.token1.key)
+
+        response = self.search('MULLER')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result['id'] for result in response.data['results']], [self.profile4.pk])
+        logger.info('test_search_normalizes_accents_and_case passed')
+
+    def test_search_matches_substrings(self):
+        logger.info('Testing search_matches_substrings')
+        self.authenticate(self.token1.key)
+
+        response = self.search('oldsmith')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result['id'] for result in response.data['results']], [self.profile2.pk])
+        logger.info('test_search_matches_substrings passed')
+
+    def test_search_ranks_friends_first(self):
+        logger.info('Testing search_ranks_friends_first')
+        self.authenticate(self.token1.key)
+
+        self.profile1.friends.add(self.profile4)
+
+        response = self.search('joh')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['id'], self.profile4.pk)
+        logger.info('test_search_ranks_friends_first passed')
+
+    def test_search_follows_renames(self):
+        logger.info('Testing search_follows_renames')
+        self.authenticate(self.token1.key)
+
+        self.user3.first_name = 'Beatrice'
+        self.user3.save()
+
+        self.assertEqual(len(self.search('jane').data['results']), 0)
+        self.assertEqual([result['id'] for result in self.search('beatrice').data['results']], [self.profile3.pk])
+        logger.info('test_search_follows_renames passed')
+
+    def test_search_cursor_paging(self):
+        logger.info('Testing search_cursor_paging')
+        self.authenticate(self.token1.key)
+
+        first_page = self.search('joh', page_size=1)
+        self.assertEqual(len(first_page.data['results']), 1)
+        self.assertIsNotNone(first_page.data['next'])
+
+        second_page = self.client.get(first_page.data['next'])
+        logger.debug('Response: %s', second_page.data)
+        self.assertEqual(len(second_page.data['results']), 1)
+        self.assertIsNone(second_page.data['next'])
+        self.assertNotEqual(first_page.data['results'][0]['id'], second_page.data['results'][0]['id'])
+        logger.info('test_search_cursor_paging passed')
+
+    def test_search_reports_a_truncated_candidate_window(self):
+        logger.info('Testing search_reports_a_truncated_candidate_window')
+        self.authenticate(self.token1.key)
+
+        response = self.search('joh')
+        self.assertFalse(response.data['truncated'])
+
+        # 'joh' prefixes three profiles; with room for two, one of them is never ranked.
+        with mock.patch.object(ProfileSearchIndex, 'MAX_CANDIDATES', 2):
+            first_page = self.search('joh', page_size=1)
+            self.assertIsNotNone(first_page.data['next'])
+            self.assertTrue(first_page.data['truncated'])
+            last_page = self.client.get(first_page.data['next'])
+        logger.debug('Response: %s', last_page.data)
+        self.assertIsNone(last_page.data['next'])
+        self.assertTrue(last_page.data['truncated'])
+        logger.info('test_search_reports_a_truncated_candidate_window passed')
+
+    def test_search_without_query(self):
+        logger.info('Testing search_without_query')
+        self.authenticate(self.token1.key)
+
+        response = self.client.get(self.search_url)
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        logger.info('test_search_without_query passed')
+
+    def test_search_with_invalid_cursor(self):
+        logger.info('Testing search_with_invalid_cursor')
+        self.authenticate(self.token1.key)
+
+        response = self.search('joh', cursor='not-a-cursor')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        logger.info('test_search_with_invalid_cursor passed')
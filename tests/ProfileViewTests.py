@@ -0,0 +1,79 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app.models import Profile, FriendRequest
+from sidelines_django_app.relationships import RelationshipResolver
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class ProfileViewTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpassword')
+        self.user3 = User.objects.create_user(username='user3', email='user3@example.com', password='testpassword')
+
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.profile2 = Profile.objects.create(user=self.user2)
+        self.profile3 = Profile.objects.create(user=self.user3)
+
+        self.token1 = Token.objects.create(user=self.user1)
+
+        logger.info('Setup complete')
+
+    def authenticate(self, token):
+        logger.info('Authenticating user with token: %s', token)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+
+    def get_is_friends(self, profile):
+        response = self.client.get(reverse('api:profile', kwargs={'pk': profile.pk}))
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['is_friends']
+
+    def test_get_own_profile(self):
+        logger.info('Testing get_own_profile')
+        self.authenticate(self.token1.key)
+
+        response = self.client.get(reverse('api:profile'))
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['username'], 'user1')
+        logger.info('test_get_own_profile passed')
+
+    def test_get_profile_relationship_states(self):
+        logger.info('Testing get_profile_relationship_states')
+        self.authenticate(self.token1.key)
+
+        self.assertEqual(self.get_is_friends(self.profile2), 'not connected')
+
+        FriendRequest.objects.create(from_profile=self.profile1, to_profile=self.profile2)
+        self.assertEqual(self.get_is_friends(self.profile2), 'pending')
+
+        self.profile1.friends.add(self.profile3)
+        self.assertEqual(self.get_is_friends(self.profile3), 'connected')
+        logger.info('test_get_profile_relationship_states passed')
+
+    def test_resolver_answers_many_targets_in_one_query(self):
+        logger.info('Testing resolver_answers_many_targets_in_one_query')
+
+        self.profile1.friends.add(self.profile2)
+        FriendRequest.objects.create(from_profile=self.profile3, to_profile=self.profile1)
+
+        resolver = RelationshipResolver(self.profile1)
+        with self.assertNumQueries(1):
+            resolver.prime([self.profile2, self.profile3])
+        with self.assertNumQueries(0):
+            self.assertTrue(resolver.state(self.profile2).is_friend)
+            self.assertTrue(resolver.state(self.profile3).pending_incoming)
+            self.assertFalse(resolver.state(self.profile3).pending_outgoing)
+        logger.info('test_resolver_answers_many_targets_in_one_query passed')
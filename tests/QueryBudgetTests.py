@@ -0,0 +1,368 @@
+import logging
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app import urls
+from sidelines_django_app.authentication import TokenCache
+from sidelines_django_app.caching import VersionedResponseCache
+from sidelines_django_app.models import (FriendRequest, Match, MatchDetails, MatchInvitation, MatchVote, Profile,
+                                         Team, TeamInvitation)
+from sidelines_django_app.search import ProfileSearchIndex
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetFixture:
+    """
+    A viewer with `size` friends, pending requests and invitations in both directions, a team they administer with a
+    co-admin and `size` other members, `size` other teams, match invitations both ways and `size` matches with details
+    and votes.
+    """
+
+    def __init__(self, size, password_hash):
+        self.size = size
+        now = timezone.now()
+
+        self.viewer_user = User.objects.create(username='viewer', email='viewer@example.com', password=password_hash)
+        self.viewer = Profile.objects.create(user=self.viewer_user)
+        self.token = Token.objects.create(user=self.viewer_user)
+
+        self.friends = self.profiles('friend', size)
+        self.invitees = self.profiles('invitee', size)
+        self.senders = self.profiles('sender', size)
+        self.recipients = self.profiles('recipient', size)
+        self.stranger = self.profiles('stranger', 1)[0]
+        self.co_admin = self.profiles('coadmin', 1)[0]
+        friendships = Profile.friends.through
+        friendships.objects.bulk_create([
+            friendships(from_profile_id=from_id, to_profile_id=to_id)
+            for friend in self.friends + self.invitees
+            for from_id, to_id in ((self.viewer.pk, friend.pk), (friend.pk, self.viewer.pk))
+        ])
+
+        self.received_requests = FriendRequest.objects.bulk_create([
+            FriendRequest(from_profile=sender, to_profile=self.viewer) for sender in self.senders])
+        self.sent_requests = FriendRequest.objects.bulk_create([
+            FriendRequest(from_profile=self.viewer, to_profile=recipient) for recipient in self.recipients])
+
+        self.home = Team.objects.create(team_name='Home')
+        self.joined = Team.objects.create(team_name='Joined')
+        self.others = Team.objects.bulk_create([Team(team_name=f'Other {i}') for i in range(size)])
+        members, admins = Team.members.through, Team.admins.through
+        members.objects.bulk_create(
+            [members(team_id=self.home.pk, profile_id=profile.pk)
+             for profile in [self.viewer, self.co_admin, *self.friends]]
+            + [members(team_id=self.joined.pk, profile_id=profile.pk) for profile in (self.viewer, self.friends[0])]
+            + [members(team_id=team.pk, profile_id=sender.pk) for team, sender in zip(self.others, self.senders)]
+        )
+        admins.objects.bulk_create(
+            [admins(team_id=self.home.pk, profile_id=profile.pk) for profile in (self.viewer, self.co_admin)]
+            + [admins(team_id=self.joined.pk, profile_id=self.friends[0].pk)]
+            + [admins(team_id=team.pk, profile_id=sender.pk) for team, sender in zip(self.others, self.senders)]
+        )
+        Team.refresh_rosters([self.home.pk, self.joined.pk, *(team.pk for team in self.others)])
+
+        self.received_team_invitations = TeamInvitation.objects.bulk_create([
+            TeamInvitation(from_profile=sender, to_profile=self.viewer, team=team)
+            for sender, team in zip(self.senders, self.others)])
+        self.sent_team_invitations = TeamInvitation.objects.bulk_create([
+            TeamInvitation(from_profile=self.viewer, to_profile=recipient, team=self.home)
+            for recipient in self.recipients])
+
+        self.received_match_invitations = MatchInvitation.objects.bulk_create([
+            MatchInvitation(from_team=team, to_team=self.home, location='Away Ground',
+                            date_time=now + timedelta(days=1))
+            for team in self.others])
+        self.sent_match_invitations = MatchInvitation.objects.bulk_create([
+            MatchInvitation(from_team=self.home, to_team=team, location='Home Ground',
+                            date_time=now + timedelta(days=2))
+            for team in self.others])
+
+        self.matches = Match.objects.bulk_create([
+            Match(home_team=self.home, away_team=team, location='Home Ground', date_time=now - timedelta(days=i))
+            for i, team in enumerate(self.others)])
+        MatchDetails.objects.bulk_create([
+            MatchDetails(match=match, team_id=team_id, score=1)
+            for match in self.matches for team_id in (match.home_team_id, match.away_team_id)])
+        MatchVote.objects.bulk_create([
+            MatchVote(match=self.matches[0], profile=friend, response='accepted') for friend in self.friends])
+        Match.refresh_vote_counts([self.matches[0].pk])
+
+        ProfileSearchIndex.rebuild()
+
+    @staticmethod
+    def profiles(prefix, count):
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}{i}', email=f'{prefix}{i}@example.com', first_name=prefix.capitalize(),
+                 last_name=str(i)) for i in range(count)])
+        return Profile.objects.bulk_create([Profile(user=user) for user in users])
+
+
+class QueryBudgetTests(APITestCase):
+    """
+    Runs every endpoint in sidelines_django_app/urls.py against fixtures seeded at 1x, 10x and 100x and records its
+    query count and database time. An endpoint fails when its query count changes with the data size or exceeds its
+    declared budget. Each request runs against cold caches and is rolled back, so all of them see the same data.
+
+    Django splits bulk writes into fixed-size chunks: the deletion collector issues one DELETE per 100 rows of a
+    model and bulk_create one INSERT per batch that fits the backend's parameter limit. That is bounded work per row
+    rather than a query per row, so consecutive chunks of the same INSERT or DELETE count as one query.
+    """
+    BASE_SIZE = 1
+    SCALES = (1, 10, 100)
+
+    # Queries per request, including the token lookup, the caller's profile, throttle upserts and savepoints.
+    BUDGETS = {
+        'POST sign-up': 14,
+        'POST sign-in': 3,
+        'POST username-unique-check': 3,
+        'GET verify-token': 3,
+        'GET profile': 5,
+        'GET profile (other)': 6,
+        'PATCH profile': 13,
+        'GET profile-friends': 5,
+        'GET profile-search': 7,
+        'POST create-friend-request': 9,
+        'PUT friend-request-batch': 12,
+        'GET friend-request-detail': 3,
+        'DELETE friend-request-detail': 8,
+        'GET friend-request-list (sent)': 4,
+        'GET friend-request-list (received)': 4,
+        'PUT friend-request-action': 11,
+        'DELETE unfriend': 10,
+        'POST create-team-invitation': 10,
+        'POST bulk-create-team-invitation': 12,
+        'PUT team-invitation-batch': 13,
+        'GET team-invitation-detail': 3,
+        'DELETE team-invitation-detail': 7,
+        'GET team-invitation-list (sent)': 4,
+        'GET team-invitation-list (received)': 4,
+        'PUT team-invitation-action': 12,
+        'GET team-list': 5,
+        'POST team-list': 12,
+        'GET team-detail': 6,
+        'PUT team-detail': 8,
+        'DELETE team-detail': 25,
+        'DELETE leave-team': 11,
+        'DELETE remove-member': 13,
+        'PUT promote-demote-member (promote)': 14,
+        'PUT promote-demote-member (demote)': 13,
+        'POST create-match-invitation': 10,
+        'PUT match-invitation-batch': 11,
+        'GET match-invitation-detail': 3,
+        'DELETE match-invitation-detail': 7,
+        'GET match-invitation-list (sent)': 4,
+        'GET match-invitation-list (received)': 4,
+        'PUT match-invitation-action': 10,
+        'GET inbox': 5,
+        'GET inbox-counts': 3,
+        'GET match-list': 4,
+        'GET match-list (filtered)': 4,
+        'GET my-matches': 6,
+        'GET match-detail': 5,
+        'POST vote': 7,
+        'GET async-profile': 4,
+        'GET async-profile (other)': 5,
+        'GET async-profile-friends': 5,
+        'GET async-friend-request-list': 4,
+        'GET async-team-invitation-list': 4,
+        'GET async-match-invitation-list': 4,
+        'GET async-team-list': 5,
+        'GET async-team-detail': 5,
+        'GET async-match-list': 4,
+        'GET async-match-detail': 4,
+        'GET async-match-events': 3,
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.password_hash = make_password('testpassword')
+
+    def setUp(self):
+        self.client = APIClient()
+        logger.info('Setup complete')
+
+    def cases(self, f):
+        """(label, URL name, method, path, data, expected status) for every endpoint, against fixture `f`."""
+        def url(name, **kwargs):
+            return reverse(f'api:{name}', kwargs=kwargs)
+
+        later = (timezone.now() + timedelta(days=30)).isoformat()
+        home, friend = f.home.pk, f.friends[0].pk
+        return [
+            ('POST sign-up', 'sign-up', 'post', url('sign-up'),
+             {'email': 'new@example.com', 'password': 'strongpassword123'}, 201),
+            ('POST sign-in', 'sign-in', 'post', url('sign-in'),
+             {'username': 'viewer', 'password': 'testpassword'}, 206),
+            ('POST username-unique-check', 'username-unique-check', 'post', url('username-unique-check'),
+             {'username': 'available'}, 200),
+            ('GET verify-token', 'verify-token', 'get', url('verify-token'), None, 200),
+
+            ('GET profile', 'profile', 'get', url('profile'), None, 200),
+            ('GET profile (other)', 'profile', 'get', url('profile', pk=friend), None, 200),
+            ('PATCH profile', 'profile', 'patch', url('profile'), {'first_name': 'Viewer', 'kit_number': 9}, 200),
+            ('GET profile-friends', 'profile-friends', 'get', url('profile-friends'), None, 200),
+            ('GET profile-search', 'profile-search', 'get', url('profile-search') + '?query=friend', None, 200),
+
+            ('POST create-friend-request', 'create-friend-request', 'post', url('create-friend-request'),
+             {'to_profile': f.stranger.pk}, 201),
+            ('PUT friend-request-batch', 'friend-request-batch', 'put', url('friend-request-batch'),
+             {'action': 'accept', 'ids': [r.pk for r in f.received_requests]}, 200),
+            ('GET friend-request-detail', 'friend-request-detail', 'get',
+             url('friend-request-detail', request_id=f.received_requests[0].pk), None, 200),
+            ('DELETE friend-request-detail', 'friend-request-detail', 'delete',
+             url('friend-request-detail', request_id=f.sent_requests[0].pk), None, 200),
+            ('GET friend-request-list (sent)', 'friend-request-list', 'get',
+             url('friend-request-list', request_type='sent'), None, 200),
+            ('GET friend-request-list (received)', 'friend-request-list', 'get',
+             url('friend-request-list', request_type='received'), None, 200),
+            ('PUT friend-request-action', 'friend-request-action', 'put',
+             url('friend-request-action', request_id=f.received_requests[0].pk, action='accept'), None, 200),
+            ('DELETE unfriend', 'unfriend', 'delete', url('unfriend', profile_id=friend), None, 200),
+
+            ('POST create-team-invitation', 'create-team-invitation', 'post', url('create-team-invitation'),
+             {'to_profile': f.invitees[0].pk, 'team': home}, 201),
+            ('POST bulk-create-team-invitation', 'bulk-create-team-invitation', 'post',
+             url('bulk-create-team-invitation'), {'team': home, 'to_profiles': [p.pk for p in f.invitees[:50]]}, 201),
+            ('PUT team-invitation-batch', 'team-invitation-batch', 'put', url('team-invitation-batch'),
+             {'action': 'accept', 'ids': [i.pk for i in f.received_team_invitations]}, 200),
+            ('GET team-invitation-detail', 'team-invitation-detail', 'get',
+             url('team-invitation-detail', request_id=f.received_team_invitations[0].pk), None, 200),
+            ('DELETE team-invitation-detail', 'team-invitation-detail', 'delete',
+             url('team-invitation-detail', request_id=f.sent_team_invitations[0].pk), None, 200),
+            ('GET team-invitation-list (sent)', 'team-invitation-list', 'get',
+             url('team-invitation-list', request_type='sent'), None, 200),
+            ('GET team-invitation-list (received)', 'team-invitation-list', 'get',
+             url('team-invitation-list', request_type='received'), None, 200),
+            ('PUT team-invitation-action', 'team-invitation-action', 'put',
+             url('team-invitation-action', request_id=f.received_team_invitations[0].pk, action='accept'), None, 200),
+
+            ('GET team-list', 'team-list', 'get', url('team-list'), None, 200),
+            ('POST team-list', 'team-list', 'post', url('team-list'), {'team_name': 'New Team'}, 201),
+            ('GET team-detail', 'team-detail', 'get', url('team-detail', team_id=home), None, 200),
+            ('PUT team-detail', 'team-detail', 'put', url('team-detail', team_id=home), {'team_name': 'Renamed'}, 200),
+            ('DELETE team-detail', 'team-detail', 'delete', url('team-detail', team_id=home), None, 204),
+            ('DELETE leave-team', 'leave-team', 'delete', url('leave-team', team_id=f.joined.pk), None, 200),
+            ('DELETE remove-member', 'remove-member', 'delete', url('remove-member', team_id=home, member_id=friend),
+             None, 200),
+            ('PUT promote-demote-member (promote)', 'promote-demote-member', 'put',
+             url('promote-demote-member', team_id=home, member_id=friend, action='promote'), None, 200),
+            ('PUT promote-demote-member (demote)', 'promote-demote-member', 'put',
+             url('promote-demote-member', team_id=home, member_id=f.co_admin.pk, action='demote'), None, 200),
+
+            ('POST create-match-invitation', 'create-match-invitation', 'post', url('create-match-invitation'),
+             {'from_team': home, 'to_team': f.others[0].pk, 'team_size': 7, 'location': 'Home Ground',
+              'date_time': later}, 201),
+            ('PUT match-invitation-batch', 'match-invitation-batch', 'put', url('match-invitation-batch'),
+             {'action': 'accept', 'ids': [i.pk for i in f.received_match_invitations]}, 200),
+            ('GET match-invitation-detail', 'match-invitation-detail', 'get',
+             url('match-invitation-detail', request_id=f.received_match_invitations[0].pk), None, 200),
+            ('DELETE match-invitation-detail', 'match-invitation-detail', 'delete',
+             url('match-invitation-detail', request_id=f.sent_match_invitations[0].pk), None, 200),
+            ('GET match-invitation-list (sent)', 'match-invitation-list', 'get',
+             url('match-invitation-list', request_type='sent') + f'?team={home}', None, 200),
+            ('GET match-invitation-list (received)', 'match-invitation-list', 'get',
+             url('match-invitation-list', request_type='received') + f'?team={home}', None, 200),
+            ('PUT match-invitation-action', 'match-invitation-action', 'put',
+             url('match-invitation-action', request_id=f.received_match_invitations[0].pk, action='accept'), None,
+             200),
+
+            ('GET inbox', 'inbox', 'get', url('inbox'), None, 200),
+            ('GET inbox-counts', 'inbox-counts', 'get', url('inbox-counts'), None, 200),
+
+            ('GET match-list', 'match-list', 'get', url('match-list'), None, 200),
+            ('GET match-list (filtered)', 'match-list', 'get',
+             url('match-list') + f'?team={home}&when=past', None, 200),
+            ('GET my-matches', 'my-matches', 'get', url('my-matches'), None, 200),
+            ('GET match-detail', 'match-detail', 'get', url('match-detail', match_id=f.matches[0].pk), None, 200),
+            ('POST vote', 'vote', 'post', url('vote', match_id=f.matches[0].pk), {'vote': 'accepted'}, 200),
+
+            ('GET async-profile', 'async-profile', 'async', url('async-profile'), None, 200),
+            ('GET async-profile (other)', 'async-profile', 'async', url('async-profile', pk=friend), None, 200),
+            ('GET async-profile-friends', 'async-profile-friends', 'async', url('async-profile-friends'), None, 200),
+            ('GET async-friend-request-list', 'async-friend-request-list', 'async',
+             url('async-friend-request-list', request_type='received'), None, 200),
+            ('GET async-team-invitation-list', 'async-team-invitation-list', 'async',
+             url('async-team-invitation-list', request_type='received'), None, 200),
+            ('GET async-match-invitation-list', 'async-match-invitation-list', 'async',
+             url('async-match-invitation-list', request_type='received') + f'?team={home}', None, 200),
+            ('GET async-team-list', 'async-team-list', 'async', url('async-team-list'), None, 200),
+            ('GET async-team-detail', 'async-team-detail', 'async', url('async-team-detail', team_id=home), None, 200),
+            ('GET async-match-list', 'async-match-list', 'async', url('async-match-list'), None, 200),
+            ('GET async-match-detail', 'async-match-detail', 'async',
+             url('async-match-detail', match_id=f.matches[0].pk), None, 200),
+            ('GET async-match-events', 'async-match-events', 'async',
+             url('async-match-events') + f'?matches={f.matches[0].pk}', None, 200),
+        ]
+
+    def measure(self, f, method, path, data):
+        """Sends one request with cold caches inside a transaction that is rolled back, and returns its queries."""
+        cache.clear()
+        TokenCache.default().clear()
+        VersionedResponseCache.default().clear()
+        authorization = 'Token ' + f.token.key
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                if method == 'async':
+                    response = async_to_sync(self.async_client.get)(path, headers={'Authorization': authorization})
+                else:
+                    self.client.credentials(HTTP_AUTHORIZATION=authorization)
+                    if path in (reverse('api:sign-up'), reverse('api:sign-in')):
+                        self.client.credentials()
+                    response = getattr(self.client, method)(path, data, format='json')
+            transaction.set_rollback(True)
+        return response, queries.captured_queries
+
+    @staticmethod
+    def count(queries):
+        """Counts the queries, taking consecutive chunks of one batched INSERT or DELETE as a single query."""
+        separators = {'INSERT': ' VALUES ', 'DELETE': ' IN ('}
+        statements = [query['sql'].split(separators[query['sql'][:6]])[0] if query['sql'][:6] in separators else None
+                      for query in queries]
+        return sum(1 for i, statement in enumerate(statements)
+                   if statement is None or i == 0 or statements[i - 1] != statement)
+
+    def test_query_budgets(self):
+        logger.info('Testing query_budgets')
+        results = {}
+        for scale in self.SCALES:
+            with transaction.atomic():
+                fixture = QueryBudgetFixture(self.BASE_SIZE * scale, self.password_hash)
+                for label, _, method, path, data, expected_status in self.cases(fixture):
+                    response, queries = self.measure(fixture, method, path, data)
+                    self.assertEqual(response.status_code, expected_status, f'{label} at {scale}x')
+                    db_time = sum(float(query['time']) for query in queries)
+                    results.setdefault(label, []).append((self.count(queries), db_time))
+                transaction.set_rollback(True)
+
+        for label, measurements in results.items():
+            logger.info('%-40s %s', label, '  '.join(f'{scale}x: {count} queries, {db_time * 1000:.1f} ms'
+                                                     for scale, (count, db_time) in zip(self.SCALES, measurements)))
+        for label, measurements in results.items():
+            counts = [count for count, _ in measurements]
+            with self.subTest(endpoint=label):
+                self.assertEqual(len(set(counts)), 1, f'{label} query count grows with data size: {counts}')
+                self.assertLessEqual(max(counts), self.BUDGETS[label], f'{label} is over its query budget')
+        logger.info('test_query_budgets passed')
+
+    def test_every_endpoint_has_a_budget(self):
+        logger.info('Testing every_endpoint_has_a_budget')
+        with transaction.atomic():
+            cases = self.cases(QueryBudgetFixture(self.BASE_SIZE, self.password_hash))
+            transaction.set_rollback(True)
+
+        self.assertEqual({pattern.name for pattern in urls.urlpatterns} - {name for _, name, *_ in cases}, set())
+        self.assertEqual({label for label, *_ in cases}, set(self.BUDGETS))
+        logger.info('test_every_endpoint_has_a_budget passed')
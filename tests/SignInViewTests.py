@@ -1,8 +1,16 @@
 import logging
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.hashers import get_hasher
 from django.contrib.auth.models import User
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app.authentication import PasswordHasherPool
 from sidelines_django_app.models import Profile
 
 logging.basicConfig(level=logging.DEBUG)
@@ -28,7 +36,7 @@ class SignInViewTests(APITestCase):
         """
         Test sign-in with a valid username and password, expecting a 200 OK response and a token.
         """
-        url = '/api/signin/'
+        url = reverse('api:sign-in')
         data = {'username': 'user1', 'password': 'testpassword'}
         logger.info('Testing sign-in with username: %s', data['username'])
 
@@ -44,7 +52,7 @@ class SignInViewTests(APITestCase):
         """
         Test sign-in with a valid email and password, expecting a 200 OK response and a token.
         """
-        url = '/api/signin/'
+        url = reverse('api:sign-in')
         data = {'username': 'user1@example.com', 'password': 'testpassword'}
         logger.info('Testing sign-in with email: %s', data['username'])
 
@@ -60,7 +68,7 @@ class SignInViewTests(APITestCase):
         """
         Test sign-in with a user whose profile setup is incomplete, expecting a 206 Partial Content response.
         """
-        url = '/api/signin/'
+        url = reverse('api:sign-in')
         data = {'username': 'user2', 'password': 'testpassword'}
         logger.info('Testing sign-in with partial profile for user: %s', data['username'])
 
@@ -77,7 +85,7 @@ class SignInViewTests(APITestCase):
         """
         Test sign-in with invalid credentials, expecting a 400 Bad Request response.
         """
-        url = '/api/signin/'
+        url = reverse('api:sign-in')
         data = {'username': 'user1', 'password': 'wrongpassword'}
         logger.info('Testing sign-in with invalid credentials for user: %s', data['username'])
 
@@ -93,7 +101,7 @@ class SignInViewTests(APITestCase):
         """
         Test sign-in with a non-existent username, expecting a 400 Bad Request response.
         """
-        url = '/api/signin/'
+        url = reverse('api:sign-in')
         data = {'username': 'nonexistentuser', 'password': 'testpassword'}
         logger.info('Testing sign-in with nonexistent user: %s', data['username'])
 
@@ -104,3 +112,69 @@ class SignInViewTests(APITestCase):
         self.assertIn('error', response.data)
         self.assertEqual(response.data['error'], 'Invalid credentials')
         logger.info('test_sign_in_nonexistent_user passed')
+
+    def test_sign_in_with_email_is_case_insensitive(self):
+        """
+        Test sign-in with the email in a different case, expecting a 200 OK response and a token.
+        """
+        url = reverse('api:sign-in')
+        data = {'username': 'User1@Example.COM', 'password': 'testpassword'}
+        logger.info('Testing sign-in with mixed-case email: %s', data['username'])
+
+        response = self.client.post(url, data)
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['token'], self.token1.key)
+        logger.info('test_sign_in_with_email_is_case_insensitive passed')
+
+    def test_sign_in_hashes_once_per_attempt(self):
+        """
+        Test that successful, wrong-password and unknown-user attempts each run the password hasher exactly once.
+        """
+        url = reverse('api:sign-in')
+        attempts = [
+            ({'username': 'user1', 'password': 'testpassword'}, status.HTTP_200_OK),
+            ({'username': 'user1@example.com', 'password': 'wrongpassword'}, status.HTTP_400_BAD_REQUEST),
+            ({'username': 'nonexistentuser', 'password': 'testpassword'}, status.HTTP_400_BAD_REQUEST),
+        ]
+        hasher = get_hasher()
+        for data, expected_status in attempts:
+            logger.info('Testing hash count for sign-in as: %s', data['username'])
+            with mock.patch.object(type(hasher), 'encode', autospec=True, side_effect=type(hasher).encode) as encode:
+                response = self.client.post(url, data)
+            self.assertEqual(response.status_code, expected_status)
+            self.assertEqual(encode.call_count, 1)
+        logger.info('test_sign_in_hashes_once_per_attempt passed')
+
+    def test_sign_in_rejected_while_hashing_pool_is_full(self):
+        """
+        Test that sign-in answers 503 with Retry-After instead of queueing when every hashing slot is taken.
+        """
+        url = reverse('api:sign-in')
+        data = {'username': 'user1', 'password': 'testpassword'}
+        logger.info('Testing sign-in with a saturated hashing pool')
+
+        pool = PasswordHasherPool(max_workers=1, max_queue=0, queue_timeout=0)
+        release = threading.Event()
+        worker = threading.Thread(target=pool.run, args=(release.wait,))
+        worker.start()
+        try:
+            while pool.metrics()['running'] == 0:
+                time.sleep(0.01)
+            with mock.patch.object(PasswordHasherPool, '_instance', pool):
+                response = self.client.post(url, data)
+        finally:
+            release.set()
+            worker.join()
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(pool.metrics()['rejected'], 1)
+
+        with mock.patch.object(PasswordHasherPool, '_instance', pool):
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(pool.metrics()['completed'], 2)
+        logger.info('test_sign_in_rejected_while_hashing_pool_is_full passed')
@@ -1,5 +1,6 @@
 import logging
 from django.contrib.auth.models import User
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
@@ -13,7 +14,7 @@ logger = logging.getLogger(__name__)
 class SignUpViewTests(APITestCase):
 
     def setUp(self):
-        self.signup_url = '/api/signup/'
+        self.signup_url = reverse('api:sign-up')
         self.user_data = {
             'password': 'strongpassword123',
             'email': 'test@example.com'
@@ -87,6 +88,22 @@ class SignUpViewTests(APITestCase):
         self.assertIn('username', response.data)
         logger.info('test_signup_user_already_exists passed')
 
+    def test_signup_email_taken_in_other_case(self):
+        """
+        Test case for attempting to signup with an email that only differs in case from an existing one.
+        """
+        logger.info('Testing signup with an email taken in another case')
+        User.objects.create_user(username='existinguser', password='password123', email='test@example.com')
+
+        duplicate_data = self.user_data.copy()
+        duplicate_data['email'] = 'Test@Example.com'
+        response = self.client.post(self.signup_url, duplicate_data)
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+        logger.info('test_signup_email_taken_in_other_case passed')
+
 
 class UsernameUniqueCheckTests(APITestCase):
 
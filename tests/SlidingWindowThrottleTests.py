@@ -0,0 +1,123 @@
+import logging
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+from rest_framework.views import APIView
+
+from sidelines_django_app.models import ThrottleCounter
+from sidelines_django_app.throttles import SlidingWindowUserRateThrottle
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class ThreePerMinuteThrottle(SlidingWindowUserRateThrottle):
+    rate = '3/min'
+
+
+class SlidingWindowThrottleTests(APITestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = APIView()
+        self.now = 6000.0
+
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpassword')
+
+        logger.info('Setup complete')
+
+    def check(self, user, view=None):
+        """Runs a fresh throttle instance, as a separate worker would."""
+        request = self.factory.get('/')
+        force_authenticate(request, user=user)
+        throttle = ThreePerMinuteThrottle()
+        throttle.timer = lambda: self.now
+        return throttle.allow_request(APIView().initialize_request(request), view or self.view), throttle
+
+    def test_limit_is_shared_between_instances(self):
+        logger.info('Testing limit_is_shared_between_instances')
+
+        for _ in range(3):
+            with self.assertNumQueries(1):
+                allowed, _ = self.check(self.user1)
+            self.assertTrue(allowed)
+
+        with self.assertNumQueries(2):
+            allowed, throttle = self.check(self.user1)
+        self.assertFalse(allowed)
+        self.assertGreater(throttle.wait(), 0)
+        self.assertTrue(self.check(self.user2)[0])
+        self.assertEqual(ThrottleCounter.objects.count(), 2)
+
+        logger.info('Test limit_is_shared_between_instances passed')
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        logger.info('Testing previous_window_is_weighted_by_overlap')
+
+        for _ in range(3):
+            self.check(self.user1)
+
+        self.now += 60 + 10
+        allowed, throttle = self.check(self.user1)
+        self.assertFalse(allowed)
+        self.assertEqual((throttle.current, throttle.previous), (0, 3))
+        self.assertAlmostEqual(throttle.wait(), 10.0)
+
+        self.now += 10
+        allowed, throttle = self.check(self.user1)
+        self.assertTrue(allowed)
+
+        self.now += 120
+        allowed, throttle = self.check(self.user1)
+        self.assertTrue(allowed)
+        self.assertEqual((throttle.current, throttle.previous), (1, 0))
+
+        logger.info('Test previous_window_is_weighted_by_overlap passed')
+
+    def test_throttled_requests_are_not_counted(self):
+        logger.info('Testing throttled_requests_are_not_counted')
+
+        for _ in range(3):
+            self.check(self.user1)
+        for _ in range(5):
+            self.assertFalse(self.check(self.user1)[0])
+        self.assertEqual(ThrottleCounter.objects.get().current_count, 3)
+
+        # A request that costs more than the whole rate is refused without creating a counter.
+        self.view.throttle_cost = 4
+        self.assertFalse(self.check(self.user2)[0])
+        self.assertEqual(ThrottleCounter.objects.count(), 1)
+
+        self.view.throttle_cost = 1
+        self.now += 60 + 30
+        self.assertTrue(self.check(self.user1)[0])
+
+        logger.info('Test throttled_requests_are_not_counted passed')
+
+    def test_view_cost_weights_requests(self):
+        logger.info('Testing view_cost_weights_requests')
+
+        self.view.throttle_cost = 2
+        self.assertTrue(self.check(self.user1)[0])
+        self.assertFalse(self.check(self.user1)[0])
+
+        with self.settings(THROTTLE_COSTS={'user': 3}):
+            self.assertTrue(self.check(self.user2, view=APIView())[0])
+            self.assertFalse(self.check(self.user2, view=APIView())[0])
+
+        logger.info('Test view_cost_weights_requests passed')
+
+    def test_purge_removes_expired_counters(self):
+        logger.info('Testing purge_removes_expired_counters')
+
+        self.check(self.user1)
+        self.now = 10 ** 10
+        self.check(self.user2)
+        with mock.patch('time.time', return_value=10 ** 9):
+            call_command('purge_throttle_counters', verbosity=0)
+        self.assertEqual(list(ThrottleCounter.objects.values_list('key', flat=True)),
+                         [f'throttle_user_{self.user2.pk}'])
+
+        logger.info('Test purge_removes_expired_counters passed')
@@ -1,12 +1,17 @@
 import logging
+from unittest import mock
 
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient, APITestCase
 
 from sidelines_django_app.models import Profile, Team, TeamInvitation
+from sidelines_django_app.relationships import TeamRoleResolver
+from sidelines_django_app.views import TeamInvitationView
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -67,7 +72,7 @@ class TeamInvitationViewTests(APITestCase):
         response = self.client.get(url)
         logger.debug('Response: %s', response.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), self.profile1.sent_invitations.count())
+        self.assertEqual(len(response.data['results']), self.profile1.sent_invitations.count())
         logger.info('test_get_sent_team_invitations passed')
 
     def test_get_received_team_invitations(self):
@@ -80,7 +85,7 @@ class TeamInvitationViewTests(APITestCase):
         response = self.client.get(url)
         logger.debug('Response: %s', response.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), self.profile1.sent_invitations.count())
+        self.assertEqual(len(response.data['results']), self.profile1.sent_invitations.count())
         logger.info('test_get_received_team_invitations passed')
 
     def test_send_team_invitation(self):
@@ -214,3 +219,126 @@ class TeamInvitationViewTests(APITestCase):
         self.assertFalse(TeamInvitation.objects.filter(from_profile=self.profile1, to_profile=self.profile2,
                                                        team=self.team).exists())
         logger.info('test_withdraw_team_invitation passed')
+
+    def add_friends(self, count):
+        friends = []
+        start = User.objects.count()
+        for number in range(start, start + count):
+            user = User.objects.create(username=f'friend{number}', email=f'friend{number}@example.com')
+            friend = Profile.objects.create(user=user)
+            self.profile1.friends.add(friend)
+            friends.append(friend)
+        return friends
+
+    def bulk_invite(self, to_profiles, team=None):
+        url = reverse('api:bulk-create-team-invitation')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(url, {'team': (team or self.team).pk, 'to_profiles': to_profiles},
+                                        format='json')
+        logger.debug('Response: %s', response.data)
+        return response, len(context.captured_queries)
+
+    def test_bulk_invite_reports_per_recipient_results(self):
+        logger.info('Testing bulk_invite_reports_per_recipient_results')
+        self.authenticate(self.token1.key)
+
+        member = self.add_friends(1)[0]
+        self.team.members.add(member)
+        TeamInvitation.objects.create(from_profile=self.profile1, to_profile=self.profile2, team=self.team)
+        friend = self.add_friends(1)[0]
+
+        to_profiles = [friend.pk, self.profile2.pk, self.profile3.pk, member.pk, self.profile1.pk, 999, friend.pk]
+        response, _ = self.bulk_invite(to_profiles)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([(result['to_profile'], result['status']) for result in response.data['results']], [
+            (friend.pk, 'created'), (self.profile2.pk, 'rejected'), (self.profile3.pk, 'rejected'),
+            (member.pk, 'rejected'), (self.profile1.pk, 'rejected'), (999, 'rejected'),
+        ])
+        self.assertEqual([result.get('detail') for result in response.data['results'][1:]], [
+            'Team invitation already sent.', 'Can only send team invitations to friends.',
+            'This user is already in the team.', 'Cannot send a team invitation to yourself.', 'Profile not found.',
+        ])
+        self.assertEqual(response.data['results'][0]['invitation']['team'], self.team.pk)
+        self.assertTrue(TeamInvitation.objects.filter(to_profile=friend, team=self.team).exists())
+        logger.info('test_bulk_invite_reports_per_recipient_results passed')
+
+    def test_bulk_invite_query_count_is_constant(self):
+        logger.info('Testing bulk_invite_query_count_is_constant')
+        self.authenticate(self.token1.key)
+
+        second_team = Team.objects.create(team_name='Second Team')
+        second_team.admins.add(self.profile1)
+        self.client.get(reverse('api:profile'))  # Warm the token cache so both calls authenticate the same way.
+        TeamRoleResolver.for_profile(self.profile1)  # Likewise for the admin check.
+        _, few_queries = self.bulk_invite([friend.pk for friend in self.add_friends(2)], team=second_team)
+        response, many_queries = self.bulk_invite([friend.pk for friend in self.add_friends(15)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(TeamInvitation.objects.filter(team=self.team).count(), 15)
+        self.assertEqual(many_queries, few_queries)
+        # Including the caller's profile, the recipients' pending counter update and the savepoint around it and the
+        # insert.
+        self.assertLessEqual(many_queries, 10)
+        logger.info('test_bulk_invite_query_count_is_constant passed')
+
+    def test_bulk_invite_rejects_only_conflicting_recipients(self):
+        logger.info('Testing bulk_invite_rejects_only_conflicting_recipients')
+        self.authenticate(self.token1.key)
+        friend = self.add_friends(1)[0]
+        other_team = Team.objects.create(team_name='Other Team')
+        TeamInvitation.objects.create(from_profile=self.profile2, to_profile=self.profile1, team=other_team)
+
+        # As if the invitation above and the self-invitation had been sent after the checks passed.
+        with mock.patch.object(TeamInvitationView, 'validate_recipient', return_value=None):
+            response, _ = self.bulk_invite([friend.pk, self.profile2.pk, self.profile1.pk])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([(result['to_profile'], result['status'], result.get('detail'))
+                          for result in response.data['results']], [
+            (friend.pk, 'created', None),
+            (self.profile2.pk, 'rejected', 'Team invitation already received from this user.'),
+            (self.profile1.pk, 'rejected', 'Cannot send a team invitation to yourself.'),
+        ])
+        self.assertEqual(TeamInvitation.objects.filter(team=self.team).count(), 1)
+        self.assertEqual(Profile.objects.get(pk=friend.pk).pending_team_invitations, 1)
+        logger.info('test_bulk_invite_rejects_only_conflicting_recipients passed')
+
+    def test_bulk_invite_requires_admin_and_valid_ids(self):
+        logger.info('Testing bulk_invite_requires_admin_and_valid_ids')
+        self.authenticate(self.token2.key)
+
+        # Refused with the same status and message as a single invitation from a non-admin.
+        response, _ = self.bulk_invite([self.profile1.pk])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['detail'], 'Only admins can send team invitations.')
+
+        self.authenticate(self.token1.key)
+        response, _ = self.bulk_invite(['not-an-id'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response, _ = self.bulk_invite([self.profile3.pk])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['results'][0]['status'], 'rejected')
+        logger.info('test_bulk_invite_requires_admin_and_valid_ids passed')
+
+    def test_batch_accept_team_invitations(self):
+        logger.info('Testing batch_accept_team_invitations')
+        self.authenticate(self.token2.key)
+
+        second_team = Team.objects.create(team_name='Second Team')
+        invitations = [TeamInvitation.objects.create(from_profile=from_profile, to_profile=self.profile2, team=team)
+                       for from_profile, team in ((self.profile1, self.team), (self.profile3, second_team))]
+        url = reverse('api:team-invitation-batch')
+
+        response = self.client.put(url, {'action': 'accept', 'ids': [invitation.pk for invitation in invitations]},
+                                   format='json')
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(self.profile2.teams.all(), [self.team, second_team])
+        self.assertFalse(TeamInvitation.objects.exists())
+
+        response = self.client.get(reverse('api:team-detail', kwargs={'team_id': self.team.pk}))
+        self.assertIn(self.profile2.pk, response.data['members'])
+        logger.info('test_batch_accept_team_invitations passed')
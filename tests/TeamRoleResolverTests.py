@@ -0,0 +1,116 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app.models import Profile, Team
+from sidelines_django_app.relationships import TeamRoleResolver
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class TeamRoleResolverTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpassword')
+
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.profile2 = Profile.objects.create(user=self.user2)
+
+        self.token1 = Token.objects.create(user=self.user1)
+        self.token2 = Token.objects.create(user=self.user2)
+
+        self.team = Team.objects.create(team_name='Test Team')
+        self.team.members.add(self.profile1, self.profile2)
+        self.team.admins.add(self.profile1)
+        self.other_team = Team.objects.create(team_name='Other Team')
+        self.other_team.members.add(self.profile2)
+
+        self.team_url = reverse('api:team-detail', kwargs={'team_id': self.team.pk})
+
+        logger.info('Setup complete')
+
+    def authenticate(self, token):
+        logger.info('Authenticating user with token: %s', token)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+
+    def test_role_map(self):
+        logger.info('Testing role_map')
+
+        roles = TeamRoleResolver.for_profile(self.profile1)
+        self.assertEqual(roles.roles, {self.team.pk: TeamRoleResolver.MEMBER | TeamRoleResolver.ADMIN})
+        self.assertTrue(roles.is_admin(self.team))
+        self.assertTrue(roles.is_member(self.team.pk))
+
+        roles = TeamRoleResolver.for_profile(self.profile2)
+        self.assertTrue(roles.is_member(self.team))
+        self.assertFalse(roles.is_admin(self.team))
+        self.assertTrue(roles.is_member(self.other_team))
+        logger.info('test_role_map passed')
+
+    def test_role_map_is_cached(self):
+        logger.info('Testing role_map_is_cached')
+        TeamRoleResolver.for_profile(self.profile1)
+
+        with self.assertNumQueries(0):
+            roles = TeamRoleResolver.for_profile(self.profile1)
+        self.assertTrue(roles.is_admin(self.team))
+        logger.info('test_role_map_is_cached passed')
+
+    def test_membership_change_invalidates_role_map(self):
+        logger.info('Testing membership_change_invalidates_role_map')
+        self.authenticate(self.token2.key)
+
+        response = self.client.put(self.team_url, {'team_name': 'Renamed'}, format='json')
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.team.promote_member(self.profile2)
+        response = self.client.put(self.team_url, {'team_name': 'Renamed'}, format='json')
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.profile2.admin_teams.clear()
+        self.assertFalse(TeamRoleResolver.for_profile(self.profile2).is_admin(self.team))
+        self.team.members.clear()
+        self.assertFalse(TeamRoleResolver.for_profile(self.profile2).is_member(self.team))
+        logger.info('test_membership_change_invalidates_role_map passed')
+
+    def test_team_delete_invalidates_role_map(self):
+        logger.info('Testing team_delete_invalidates_role_map')
+        self.assertTrue(TeamRoleResolver.for_profile(self.profile2).is_member(self.other_team))
+
+        self.other_team.delete()
+
+        self.assertEqual(TeamRoleResolver.for_profile(self.profile2).roles, {self.team.pk: TeamRoleResolver.MEMBER})
+        logger.info('test_team_delete_invalidates_role_map passed')
+
+    def test_permission_check_does_not_scan_roster(self):
+        logger.info('Testing permission_check_does_not_scan_roster')
+        self.authenticate(self.token1.key)
+        self.client.put(self.team_url, {'team_name': 'Warm'}, format='json')
+
+        with CaptureQueriesContext(connection) as small_team:
+            response = self.client.put(self.team_url, {'team_name': 'Small'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for i in range(50):
+            user = User.objects.create_user(username=f'member{i}', email=f'member{i}@example.com')
+            self.team.members.add(Profile.objects.create(user=user))
+        self.client.put(self.team_url, {'team_name': 'Warm'}, format='json')
+
+        with CaptureQueriesContext(connection) as large_team:
+            response = self.client.put(self.team_url, {'team_name': 'Large'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(large_team), len(small_team))
+        logger.info('test_permission_check_does_not_scan_roster passed')
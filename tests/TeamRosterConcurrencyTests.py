@@ -0,0 +1,79 @@
+import logging
+import threading
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from sidelines_django_app.models import Profile, Team
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class TeamRosterConcurrencyTests(TransactionTestCase):
+    """Has most of a team's roster leave at once, each member from its own thread, client and connection."""
+    admins = 2
+    members = 6
+
+    def setUp(self):
+        users = [User.objects.create_user(username=f'user{number}', email=f'user{number}@example.com',
+                                          password='testpassword') for number in range(self.admins + self.members)]
+        self.profiles = [Profile.objects.create(user=user) for user in users]
+        self.tokens = [Token.objects.create(user=user) for user in users]
+
+        self.team = Team.objects.create(team_name='Test Team')
+        for number, profile in enumerate(self.profiles):
+            self.team.add_member(profile, admin=number < self.admins)
+
+        self.leave_team_url = reverse('api:leave-team', kwargs={'team_id': self.team.pk})
+
+        logger.info('Setup complete')
+
+    def leave_concurrently(self, tokens):
+        """Sends a leave request for every token at once. Returns the status codes in order."""
+        barrier = threading.Barrier(len(tokens))
+        statuses = [None] * len(tokens)
+        errors = []
+
+        def leave(index):
+            try:
+                client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION='Token ' + tokens[index].key)
+                barrier.wait()
+                statuses[index] = client.delete(self.leave_team_url).status_code
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=leave, args=(index,)) for index in range(len(tokens))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        return statuses
+
+    def test_concurrent_leaves_keep_the_last_admin(self):
+        logger.info('Testing concurrent_leaves_keep_the_last_admin')
+
+        # The last plain member stays, so the team is never emptied.
+        statuses = self.leave_concurrently(self.tokens[:-1])
+
+        # The other plain members leave. Whichever admin decides second still has members behind it, so it is
+        # refused as the last admin instead of failing on the database lock.
+        self.assertEqual(statuses[self.admins:], [status.HTTP_200_OK] * (self.members - 1))
+        self.assertEqual(sorted(statuses[:self.admins]), [status.HTTP_200_OK, status.HTTP_403_FORBIDDEN])
+        admin = self.profiles[statuses.index(status.HTTP_403_FORBIDDEN)]
+
+        team = Team.objects.get(pk=self.team.pk)
+        self.assertEqual(set(team.members.all()), {admin, self.profiles[-1]})
+        self.assertEqual(list(team.admins.all()), [admin])
+        self.assertEqual((team.member_count, team.admin_count), (2, 1))
+        logger.info('test_concurrent_leaves_keep_the_last_admin passed')
@@ -1,6 +1,8 @@
 import logging
 
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.authtoken.models import Token
@@ -65,7 +67,7 @@ class TeamViewTests(APITestCase):
         logger.debug('Response: %s', response.data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(len(response.data) > 0)
+        self.assertTrue(len(response.data['results']) > 0)
         logger.info('test_get_all_teams passed')
 
     def test_create_team(self):
@@ -96,6 +98,22 @@ class TeamViewTests(APITestCase):
         self.assertEqual(response.data['team_name'], 'Updated Team')
         logger.info('test_update_team passed')
 
+    def test_update_team_cannot_change_roster(self):
+        logger.info('Testing update_team_cannot_change_roster')
+        self.authenticate(self.token1.key)
+
+        response = self.client.put(self.team_url, {'team_name': 'Updated Team', 'members': [self.profile2.pk],
+                                                   'admins': []}, format='json')
+        logger.debug('Response: %s', response.data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        team = Team.objects.get(pk=self.team.pk)
+        self.assertEqual(team.team_name, 'Updated Team')
+        self.assertEqual(list(team.members.all()), [self.profile1])
+        self.assertEqual(list(team.admins.all()), [self.profile1])
+        self.assertEqual(team.member_count, team.members.count())
+        logger.info('test_update_team_cannot_change_roster passed')
+
     def test_delete_team(self):
         logger.info('Testing delete_team')
         self.authenticate(self.token1.key)
@@ -197,3 +215,75 @@ class TeamViewTests(APITestCase):
         self.assertNotIn(self.profile1, team.admins.all())
         self.assertTrue(Team.objects.filter(pk=team.pk).exists())
         logger.info('test_leave_team_as_admin_with_other_admins passed')
+
+    def test_roster_counters_follow_membership_changes(self):
+        logger.info('Testing roster_counters_follow_membership_changes')
+        self.authenticate(self.token1.key)
+
+        response = self.client.post(reverse('api:team-list'), {'team_name': 'Counted Team'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        team = Team.objects.get(team_name='Counted Team')
+        self.assertEqual((team.member_count, team.admin_count), (1, 1))
+
+        stale = Team.objects.get(pk=team.pk)
+        team.members.add(self.profile2, self.profile3)
+        team.promote_member(self.profile2)
+        stale.team_name = 'Renamed Team'
+        stale.save()
+        team.refresh_from_db()
+        self.assertEqual((team.team_name, team.member_count, team.admin_count), ('Renamed Team', 3, 2))
+
+        self.profile2.teams.clear()
+        team.refresh_from_db()
+        self.assertEqual((team.member_count, team.admin_count), (2, 2))
+
+        self.profile3.delete()
+        team.refresh_from_db()
+        self.assertEqual((team.member_count, team.admin_count), (1, 2))
+
+        response = self.client.get(reverse('api:team-detail', kwargs={'team_id': team.pk}))
+        logger.debug('Response: %s', response.data)
+        self.assertEqual((response.data['member_count'], response.data['admin_count']), (1, 2))
+        logger.info('test_roster_counters_follow_membership_changes passed')
+
+    def test_roster_operations_keep_an_admin(self):
+        logger.info('Testing roster_operations_keep_an_admin')
+        self.team.members.add(self.profile2)
+        self.team.promote_member(self.profile2)
+
+        # Two admins demoting or removing each other at the same time: the second operation sees the first.
+        self.assertTrue(Team.objects.get(pk=self.team.pk).demote_member(self.profile2))
+        self.assertFalse(Team.objects.get(pk=self.team.pk).demote_member(self.profile1))
+        self.team.promote_member(self.profile2)
+        self.assertTrue(Team.objects.get(pk=self.team.pk).remove_member(self.profile2))
+        self.assertFalse(Team.objects.get(pk=self.team.pk).promote_member(self.profile2))
+        self.team.members.add(self.profile3)
+        self.assertFalse(Team.objects.get(pk=self.team.pk).remove_member(self.profile1))
+
+        self.assertEqual(list(self.team.admins.all()), [self.profile1])
+        logger.info('test_roster_operations_keep_an_admin passed')
+
+    def test_leave_query_count_is_constant(self):
+        logger.info('Testing leave_query_count_is_constant')
+        self.authenticate(self.token2.key)
+        self.client.get(reverse('api:profile'))  # Warm the token cache so both calls authenticate the same way.
+
+        def leave(team_size):
+            team = Team.objects.create(team_name=f'Team of {team_size}')
+            team.members.add(self.profile1, self.profile2)
+            team.admins.add(self.profile1)
+            for i in range(team_size - 2):
+                user = User.objects.create_user(username=f'member{team_size}-{i}',
+                                                email=f'member{team_size}-{i}@example.com')
+                team.members.add(Profile.objects.create(user=user))
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.delete(reverse('api:leave-team', kwargs={'team_id': team.pk}))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries)
+
+        few_queries = leave(3)
+        many_queries = leave(30)
+
+        self.assertEqual(many_queries, few_queries)
+        self.assertLessEqual(many_queries, 10)
+        logger.info('test_leave_query_count_is_constant passed')
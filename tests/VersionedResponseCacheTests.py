@@ -0,0 +1,152 @@
+import logging
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from sidelines_django_app.caching import VersionedResponseCache
+from sidelines_django_app.models import Match, MatchDetails, Profile, Team
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class VersionedResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        VersionedResponseCache.default().clear()
+
+        self.client = APIClient()
+
+        self.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpassword')
+        self.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpassword')
+        self.profile1 = Profile.objects.create(user=self.user1)
+        self.profile2 = Profile.objects.create(user=self.user2)
+
+        self.team1 = Team.objects.create(team_name='Team 1')
+        self.team1.members.add(self.profile1, self.profile2)
+        self.team1.admins.add(self.profile1)
+        self.team2 = Team.objects.create(team_name='Team 2')
+
+        self.match = Match.objects.create(home_team=self.team1, away_team=self.team2,
+                                          date_time='2024-12-01T15:00:00Z', location='Test Stadium')
+
+        self.token1 = Token.objects.create(user=self.user1)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token1.key)
+
+        self.team_url = reverse('api:team-detail', kwargs={'team_id': self.team1.pk})
+        self.team_list_url = reverse('api:team-list')
+        self.match_url = reverse('api:match-detail', kwargs={'match_id': self.match.pk})
+        self.match_list_url = reverse('api:match-list')
+
+        logger.info('Setup complete')
+
+    def get(self, url, expected_cache):
+        response = self.client.get(url)
+        logger.debug('Response: %s', response.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], expected_cache)
+        return response.data
+
+    def test_repeated_reads_are_served_from_cache(self):
+        logger.info('Testing repeated_reads_are_served_from_cache')
+
+        for url in (self.team_url, self.team_list_url, self.match_url, self.match_list_url):
+            first = self.get(url, 'MISS')
+            self.assertEqual(self.get(url, 'HIT'), first)
+
+        metrics = VersionedResponseCache.default().metrics()
+        self.assertEqual((metrics['hits'], metrics['misses']), (4, 4))
+        self.assertEqual(metrics['hit_ratio'], 0.5)
+
+        logger.info('Test repeated_reads_are_served_from_cache passed')
+
+    def test_team_writes_are_never_served_stale(self):
+        logger.info('Testing team_writes_are_never_served_stale')
+
+        self.get(self.team_url, 'MISS')
+        self.get(self.team_list_url, 'MISS')
+
+        response = self.client.put(self.team_url, {'team_name': 'Renamed'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get(self.team_url, 'MISS')['team_name'], 'Renamed')
+        self.assertEqual(self.get(self.team_list_url, 'MISS')['results'][-1]['team_name'], 'Renamed')
+
+        self.team1.promote_member(self.profile2)
+        self.assertCountEqual(self.get(self.team_url, 'MISS')['admins'], [self.profile1.pk, self.profile2.pk])
+
+        self.profile2.admin_teams.clear()
+        self.assertEqual(self.get(self.team_url, 'MISS')['admins'], [self.profile1.pk])
+
+        self.user2.delete()
+        self.assertEqual(self.get(self.team_url, 'MISS')['members'], [self.profile1.pk])
+        self.assertEqual(self.get(self.team_list_url, 'MISS')['results'][-1]['members'], [self.profile1.pk])
+
+        self.get(self.team_url, 'HIT')
+        logger.info('Test team_writes_are_never_served_stale passed')
+
+    def test_match_writes_are_never_served_stale(self):
+        logger.info('Testing match_writes_are_never_served_stale')
+
+        self.get(self.match_url, 'MISS')
+        self.get(self.match_list_url, 'MISS')
+
+        details = MatchDetails.objects.create(match=self.match, team=self.team1, score=2)
+        self.assertEqual(self.get(self.match_url, 'MISS')['details'][0]['id'], details.pk)
+        self.assertEqual(self.get(self.match_list_url, 'MISS')['results'][0]['details'][0]['id'], details.pk)
+
+        details.delete()
+        self.assertEqual(self.get(self.match_url, 'MISS')['details'], [])
+
+        self.team2.delete()
+        response = self.client.get(self.match_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.get(self.match_list_url, 'MISS')['results'], [])
+
+        logger.info('Test match_writes_are_never_served_stale passed')
+
+    def test_filtered_match_feeds_are_never_served_stale(self):
+        logger.info('Testing filtered_match_feeds_are_never_served_stale')
+        team3 = Team.objects.create(team_name='Team 3')
+        kick_off = timezone.now() + timedelta(hours=1)
+        match = Match.objects.create(home_team=team3, away_team=self.team2, date_time=kick_off,
+                                     location='Test Stadium')
+
+        # A profile's feed follows its memberships, which bump the team stamp rather than the match one.
+        profile_feed_url = f'{self.match_list_url}?profile={self.profile2.pk}'
+        self.assertEqual([item['id'] for item in self.get(profile_feed_url, 'MISS')['results']], [self.match.pk])
+        team3.members.add(self.profile2)
+        self.assertEqual([item['id'] for item in self.get(profile_feed_url, 'MISS')['results']],
+                         [match.pk, self.match.pk])
+        self.get(profile_feed_url, 'HIT')
+
+        # Whether a match is upcoming changes with the clock, which no write records, so that feed is never cached.
+        upcoming_url = f'{self.match_list_url}?when=upcoming'
+        response = self.client.get(upcoming_url)
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual([item['id'] for item in response.data['results']], [match.pk])
+        with mock.patch('django.utils.timezone.now', return_value=kick_off + timedelta(minutes=1)):
+            response = self.client.get(upcoming_url)
+        self.assertEqual(response.data['results'], [])
+
+        logger.info('Test filtered_match_feeds_are_never_served_stale passed')
+
+    def test_versions_are_bumped_again_on_commit(self):
+        logger.info('Testing versions_are_bumped_again_on_commit')
+
+        response_cache = VersionedResponseCache.default()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.team1.save()
+            written = response_cache.versions([f'team:{self.team1.pk}'])
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(response_cache.versions([f'team:{self.team1.pk}']), written)
+
+        logger.info('Test versions_are_bumped_again_on_commit passed')
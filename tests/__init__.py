@@ -7,3 +7,20 @@ from .TeamViewTests import TeamViewTests
 from .TeamInvitationViewTests import TeamInvitationViewTests
 from .MatchViewTests import MatchViewTests
 from .MatchInvitationViewTests import MatchInvitationViewTests
+from .ProfileSearchViewTests import ProfileSearchViewTests
+from .FriendsViewTests import FriendsViewTests
+from .InboxViewTests import InboxViewTests
+from .ProfileViewTests import ProfileViewTests
+from .CachedTokenAuthenticationTests import CachedTokenAuthenticationTests
+from .AsyncViewTests import AsyncViewTests
+from .SlidingWindowThrottleTests import SlidingWindowThrottleTests
+from .VersionedResponseCacheTests import VersionedResponseCacheTests
+from .ConditionalGetTests import ConditionalGetTests
+from .TeamRoleResolverTests import TeamRoleResolverTests
+from .InvitationAcceptanceTests import InvitationAcceptanceTests
+from .QueryBudgetTests import QueryBudgetTests
+from .GenerateLeagueTests import GenerateLeagueTests
+from .MatchVoteConcurrencyTests import MatchVoteConcurrencyTests
+from .MatchEventStreamTests import MatchEventStreamTests
+from .PendingCounterTests import PendingCounterTests
+from .TeamRosterConcurrencyTests import TeamRosterConcurrencyTests